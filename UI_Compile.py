@@ -1,46 +1,167 @@
+import functools
+from collections import deque
+from importlib import import_module
 from pathlib import Path
-from typing import Dict, List
-
-import pandas as pd
-import streamlit as st
+from typing import Dict, List, Optional, Tuple
 
 from codegen import BytecodeGenerator
-from lexer.lexer import Lexer
+from lexer.lexer import Lexer, tokens_a_columnas
 from parser.parser import Parser
+from pipeline import CompileBudget, CompileCache, CompileJob
+from pipeline.cache import ast_key
 from semantic.semantic import SemanticAnalyzer
 
 
+class _LazyModule:
+    # Importa la dependencia opcional al primer acceso: usar solo las funciones del
+    # compilador de este modulo no carga streamlit ni pandas
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(import_module(self._name), attr)
+
+
+st = _LazyModule("streamlit")
+pd = _LazyModule("pandas")
+
+
+def _st_cached(kind: str, **options):
+    # Aplica st.cache_data / st.cache_resource en la primera llamada en lugar de al importar
+    def decorator(func):
+        cached = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal cached
+            if cached is None:
+                cached = getattr(st, kind)(**options)(func) if options else getattr(st, kind)(func)
+            return cached(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 SAMPLES_DIR = Path(__file__).parent / "samples"
+PAGE_SIZES = [100, 500, 1000, 5000]
+COLLAPSE_MIN_CHAIN = 4
 
 
+@_st_cached("cache_data", ttl=30)
 def load_samples() -> Dict[str, Path]:
     return {path.name: path for path in sorted(SAMPLES_DIR.glob("*.js"))}
 
 
-def build_ast_graph_dot(node):
+@_st_cached("cache_data", max_entries=32)
+def _read_sample_cached(path: str, mtime: float) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+def read_sample(path: Path) -> str:
+    # La fecha de modificacion forma parte de la clave: "Guardar en disco" invalida la entrada
+    return _read_sample_cached(str(path), path.stat().st_mtime)
+
+
+@_st_cached("cache_resource")
+def get_compile_cache() -> CompileCache:
+    return CompileCache()
+
+
+def _dot_label(tipo, valor=None):
+    value = "" if valor in (None, "") else str(valor)
+    value = value.replace("\\", "\\\\").replace('"', '\\"')
+    return tipo if not value else f"{tipo}\\n{value}"
+
+
+def _chain_info(node):
+    # Cadena izquierda de nodos del mismo tipo, p. ej. ((a + b) + c) + d
+    length = 0
+    ops: List[str] = []
+    current = node
+    while current is not None and current.tipo == node.tipo and current.hijos:
+        length += 1
+        ops.append(str(current.valor))
+        current = current.hijos[0]
+    return length, ops
+
+
+def find_ast_node(root, path: str):
+    # Las rutas son indices de hijos separados por '/' desde la raiz ("" es la raiz)
+    current = root
+    if path:
+        for part in path.split("/"):
+            current = current.hijos[int(part)]
+    return current
+
+
+def split_ast_focus(focus: str) -> Tuple[str, int]:
+    # "ruta@inicio" es una ventana de hijos del nodo en la ruta a partir del indice inicio
+    path, _, start = focus.partition("@")
+    return path, int(start) if start else 0
+
+
+def build_ast_graph(
+    root,
+    max_nodes: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    collapse_chains: bool = False,
+    root_path: str = "",
+    root_start: int = 0,
+):
+    # Recorrido en anchura sin recursion: los niveles superiores se muestran primero
+    # y los subarboles que no caben en el presupuesto se resumen en un nodo expandible.
+    # Los hijos que no caben se pueden abrir despues como ventana "ruta@inicio"
+    if root is None:
+        return "", []
     nodes: List[str] = []
     edges: List[str] = []
-
-    def add_node(current):
-        if current is None:
-            return None
-        node_id = f"node{id(current)}"
-        value = "" if current.valor in (None, "") else str(current.valor)
-        value = value.replace("\\", "\\\\").replace('"', '\\"')
-        label = current.tipo if not value else f"{current.tipo}\\n{value}"
-        nodes.append(
-            f'{node_id} [label="{label}", shape=box, style="rounded,filled", '
-            'fillcolor="#1f2a44", fontcolor="#f0f3ff"];'
-        )
-        for child in current.hijos:
-            child_id = add_node(child)
-            if child_id:
+    expandable: List[Tuple[str, str]] = []
+    style = 'shape=box, style="rounded,filled", fillcolor="#1f2a44", fontcolor="#f0f3ff"'
+    summary_style = 'shape=box, style="rounded,filled,dashed", fillcolor="#3a2a5c", fontcolor="#f0f3ff"'
+    counter = 0
+    emitted = 0
+    nodes.append(f'n0 [label="{_dot_label(root.tipo, root.valor)}", {style}];')
+    emitted += 1
+    if root_start:
+        counter += 1
+        nodes.append(f'n{counter} [label="... {root_start} nodos anteriores", {summary_style}];')
+        edges.append(f"n0 -> n{counter};")
+    queue = deque([(root, "n0", 0, root_path)])
+    while queue:
+        current, node_id, depth, path = queue.popleft()
+        if not current.hijos:
+            continue
+        if max_depth is not None and depth >= max_depth:
+            counter += 1
+            nodes.append(f'n{counter} [label="... {len(current.hijos)} hijos", {summary_style}];')
+            edges.append(f"{node_id} -> n{counter};")
+            expandable.append((path, f"{current.tipo} (profundidad)"))
+            continue
+        first = root_start if current is root else 0
+        for index in range(first, len(current.hijos)):
+            child = current.hijos[index]
+            child_path = f"{path}/{index}" if path else str(index)
+            counter += 1
+            child_id = f"n{counter}"
+            if max_nodes is not None and emitted >= max_nodes:
+                remaining = len(current.hijos) - index
+                nodes.append(f'{child_id} [label="... {remaining} nodos mas", {summary_style}];')
                 edges.append(f"{node_id} -> {child_id};")
-        return node_id
-
-    add_node(node)
-    if not nodes:
-        return ""
+                window = f"{path}@{index}" if index else path
+                expandable.append((window, f"{current.tipo} (hijos {index + 1}-{len(current.hijos)})"))
+                break
+            emitted += 1
+            edges.append(f"{node_id} -> {child_id};")
+            if collapse_chains and child.tipo == "BinaryExpression":
+                length, ops = _chain_info(child)
+                if length >= COLLAPSE_MIN_CHAIN:
+                    label = _dot_label(f"{child.tipo} x{length}", " ".join(sorted(set(ops))))
+                    nodes.append(f'{child_id} [label="{label}", {summary_style}];')
+                    expandable.append((child_path, f"{child.tipo} x{length}"))
+                    continue
+            nodes.append(f'{child_id} [label="{_dot_label(child.tipo, child.valor)}", {style}];')
+            queue.append((child, child_id, depth + 1, child_path))
     dot = [
         "digraph AST {",
         "rankdir=TB;",
@@ -49,16 +170,74 @@ def build_ast_graph_dot(node):
         *edges,
         "}",
     ]
-    return "\n".join(dot)
+    return "\n".join(dot), expandable
 
 
-def run_compiler(source: str):
+def build_ast_graph_dot(node, **options):
+    return build_ast_graph(node, **options)[0]
+
+
+def _result_from_compiled(compiled):
+    return {
+        "tokens": compiled["token_columns"],
+        "syntax_errors": compiled["syntax_errors"],
+        "semantic_errors": compiled["semantic_errors"],
+        "symbols": compiled["symbols"],
+        "ast": compiled["ast"],
+        "ast_key": compiled["ast_key"],
+        "bytecode": compiled["bytecode"],
+    }
+
+
+def _result_from_partial(partial):
+    # Resultado parcial de una compilacion interrumpida por el presupuesto
+    ast = partial["ast"]
+    return {
+        "tokens": tokens_a_columnas(partial["tokens"]),
+        "syntax_errors": [],
+        "semantic_errors": partial["semantic_errors"],
+        "symbols": {header: [] for header in SemanticAnalyzer.SYMBOL_HEADERS},
+        "ast": ast,
+        "ast_key": ast_key(ast) if ast is not None else "",
+        "bytecode": [f"{op} {'' if arg is None else arg}".rstrip() for op, arg in partial["instructions"]],
+        "partial": partial["reason"],
+    }
+
+
+def _format_progress(progress: Dict[str, object]) -> str:
+    labels = {
+        "lexer": "tokens",
+        "parser": "sentencias analizadas",
+        "semantic": "sentencias verificadas",
+        "codegen": "sentencias generadas",
+    }
+    parts = [f"{progress[phase]} {label}" for phase, label in labels.items() if phase in progress]
+    return f"Fase actual: {progress.get('phase') or 'inicio'} | " + " | ".join(parts)
+
+
+def _await_compile_job(job: CompileJob):
+    # Sondea el trabajo en segundo plano; pulsar "Cancelar" provoca un rerun que lo detiene
+    if st.button("Cancelar compilacion"):
+        job.cancel()
+    placeholder = st.empty()
+    with st.spinner("Analizando el programa..."):
+        while not job.wait(0.1):
+            placeholder.caption(_format_progress(job.progress()))
+    placeholder.empty()
+    if job.status == "error":
+        raise job.error
+    if job.status == "cancelled":
+        return _result_from_partial(job.result)
+    return _result_from_compiled(job.result)
+
+
+def run_compiler(source: str, cache: Optional[CompileCache] = None):
+    if cache is not None:
+        return _result_from_compiled(cache.compile(source))
+
     lexer = Lexer(source)
     tokens = lexer.analizar()
-    token_rows = [
-        {"Tipo": t.tipo, "Valor": t.valor, "Linea": t.linea, "Columna": t.columna}
-        for t in tokens
-    ]
+    token_columns = lexer.exportar_columnas()
 
     parser = Parser(tokens)
     ast = parser.parsear()
@@ -66,23 +245,128 @@ def run_compiler(source: str):
 
     semantic = SemanticAnalyzer()
     semantic_errors = semantic.analyze(ast)
-    symbol_rows = semantic.get_symbol_rows()
+    symbol_columns = semantic.get_symbol_columns()
 
     codegen = BytecodeGenerator()
     bytecode = codegen.generate(ast)
 
-    graph_dot = build_ast_graph_dot(parser.arbol) if parser.arbol else ""
-
     return {
-        "token_rows": token_rows,
+        "tokens": token_columns,
         "syntax_errors": syntax_errors,
         "semantic_errors": semantic_errors,
-        "symbols": symbol_rows,
-        "graph_dot": graph_dot,
+        "symbols": symbol_columns,
+        "ast": ast,
+        "ast_key": ast_key(ast),
         "bytecode": bytecode,
     }
 
 
+def _column_length(columns: Dict[str, list]) -> int:
+    return len(next(iter(columns.values()), []))
+
+
+def _render_paged_table(columns: Dict[str, list], key: str):
+    # Solo se construye el DataFrame de la ventana visible, no de la tabla completa
+    total = _column_length(columns)
+    if total <= PAGE_SIZES[0]:
+        st.dataframe(pd.DataFrame(columns), use_container_width=True)
+        return
+    size_col, page_col = st.columns(2)
+    with size_col:
+        page_size = st.selectbox("Filas por pagina", PAGE_SIZES, key=f"{key}_page_size")
+    pages = (total + page_size - 1) // page_size
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        # Al crecer el tamaño de pagina la pagina guardada puede quedar fuera de rango
+        st.session_state[page_key] = pages
+    with page_col:
+        page = st.number_input("Pagina", min_value=1, max_value=pages, value=1, step=1, key=page_key)
+    start = (int(page) - 1) * page_size
+    end = min(start + page_size, total)
+    window = {name: values[start:end] for name, values in columns.items()}
+    frame = pd.DataFrame(window, index=range(start, end))
+    st.dataframe(frame, use_container_width=True)
+    st.caption(f"Filas {start + 1}-{end} de {total}")
+
+
+def _render_ast(ast, structure_key: str):
+    session = st.session_state
+    opts_col, depth_col, collapse_col = st.columns(3)
+    with opts_col:
+        max_nodes = st.number_input("Presupuesto de nodos", min_value=10, value=500, step=50)
+    with depth_col:
+        max_depth = st.number_input("Profundidad maxima", min_value=1, value=12, step=1)
+    with collapse_col:
+        collapse = st.checkbox("Colapsar cadenas repetitivas", value=True)
+
+    if session.get("ast_graph_key") != structure_key:
+        # Un AST distinto invalida la ruta expandida del anterior
+        session.ast_graph_key = structure_key
+        session.ast_focus = ""
+    focus = session.get("ast_focus", "")
+    try:
+        focus_path, focus_start = split_ast_focus(focus)
+        focus_node = find_ast_node(ast, focus_path)
+    except (IndexError, ValueError):
+        focus, focus_path, focus_start, focus_node = "", "", 0, ast
+
+    options = (int(max_nodes), int(max_depth), collapse, focus)
+
+    def compute():
+        return build_ast_graph(
+            focus_node,
+            max_nodes=options[0],
+            max_depth=options[1],
+            collapse_chains=collapse,
+            root_path=focus_path,
+            root_start=focus_start,
+        )
+
+    dot, expandable = get_compile_cache().store.get_or_compute("graph", (structure_key, options), compute)
+    labels = {"": "(raiz del programa)"}
+    for path, desc in expandable:
+        labels.setdefault(path, f"{path} - {desc}")
+    choices = list(labels)
+    if focus not in labels:
+        choices.insert(1, focus)
+        labels[focus] = f"{focus} - {focus_node.tipo}"
+    selected = st.selectbox(
+        "Expandir subarbol",
+        choices,
+        index=choices.index(focus),
+        format_func=lambda path: labels[path],
+    )
+    if selected != focus:
+        session.ast_focus = selected
+        st.rerun()
+    if focus_start:
+        st.caption(f"Mostrando los hijos de la ruta {focus_path or '(raiz)'} desde el {focus_start + 1}")
+    elif focus:
+        st.caption(f"Mostrando el subarbol en la ruta {focus}")
+    st.graphviz_chart(dot)
+
+
+def _render_cache_stats(cache: CompileCache):
+    stats = cache.stats()
+    with st.expander("Cache de compilacion"):
+        phases = stats["phases"]
+        if phases:
+            st.dataframe(
+                pd.DataFrame(
+                    {
+                        "Fase": list(phases),
+                        "Aciertos": [p["hits"] for p in phases.values()],
+                        "Fallos": [p["misses"] for p in phases.values()],
+                    }
+                ),
+                use_container_width=True,
+            )
+        st.caption(
+            f"Entradas: {stats['entries']} | Memoria estimada: {stats['bytes'] / 1024:.1f} KiB"
+            f" de {stats['max_bytes'] / (1024 * 1024):.0f} MiB | Expulsiones: {stats['evictions']}"
+        )
+
+
 def _inject_styles():
     st.markdown(
         """
@@ -152,7 +436,7 @@ def main():
     sample_names = list(samples.keys())
     session = st.session_state
     session.setdefault("selected_sample", sample_names[0])
-    session.setdefault("code_editor", samples[session.selected_sample].read_text(encoding="utf-8"))
+    session.setdefault("code_editor", read_sample(samples[session.selected_sample]))
     session.setdefault("last_result", None)
 
     selector_col, actions_col = st.columns([3, 1])
@@ -165,7 +449,7 @@ def main():
         )
     if selected != session.selected_sample:
         session.selected_sample = selected
-        session.code_editor = samples[selected].read_text(encoding="utf-8")
+        session.code_editor = read_sample(samples[selected])
 
     with actions_col:
         save_toggle = st.checkbox(
@@ -180,33 +464,53 @@ def main():
         help="Puedes editar libremente este codigo antes de compilar.",
     )
 
+    with st.sidebar:
+        st.markdown("#### Presupuesto de compilacion")
+        time_limit = st.number_input("Tiempo maximo (s)", min_value=0.5, value=10.0, step=0.5)
+        memory_limit = st.number_input("Memoria maxima (MiB)", min_value=16, value=512, step=16)
+
     compile_clicked = st.button("Compilar", use_container_width=True)
 
     if compile_clicked:
         code = session.code_editor
         if save_toggle:
             samples[session.selected_sample].write_text(code, encoding="utf-8")
-        with st.spinner("Analizando el programa..."):
-            try:
-                session.last_result = run_compiler(code)
-            except Exception as exc:  # noqa: BLE001
-                st.error(f"Ocurrió un error inesperado: {exc}")
-                return
+        budget = CompileBudget(time_limit=float(time_limit), memory_limit_mb=int(memory_limit))
+        session.compile_job = CompileJob(code, budget, cache=get_compile_cache()).start()
+
+    job = session.get("compile_job")
+    if job is not None:
+        # Un rerun (p. ej. al pulsar "Cancelar") interrumpe la espera con una excepcion de
+        # streamlit: el trabajo se conserva en la sesion para que el siguiente rerun lo
+        # encuentre y lo cancele. Solo se olvida cuando termino
+        try:
+            session.last_result = _await_compile_job(job)
+        except Exception as exc:  # noqa: BLE001
+            if job.wait(0):
+                session.compile_job = None
+            st.error(f"Ocurrió un error inesperado: {exc}")
+            return
+        session.compile_job = None
 
     result = session.last_result
     if not result:
         st.info("Compila un ejemplo para ver los resultados.")
         return
 
-    token_rows = result["token_rows"]
+    if result.get("partial"):
+        st.warning(f"Compilacion interrumpida: {result['partial']}. Se muestran resultados parciales.")
+
+    _render_cache_stats(get_compile_cache())
+
+    token_columns = result["tokens"]
+    token_count = _column_length(token_columns)
     syntax_errors: List[str] = result["syntax_errors"]
     semantic_errors: List[str] = result["semantic_errors"]
     symbols = result["symbols"]
-    graph_dot = result["graph_dot"]
     bytecode = result["bytecode"]
 
     col_metrics = st.columns(3)
-    col_metrics[0].metric("Tokens", len(token_rows))
+    col_metrics[0].metric("Tokens", token_count)
     col_metrics[1].metric("Errores sintacticos", len(syntax_errors))
     col_metrics[2].metric("Errores semanticos", len(semantic_errors))
 
@@ -215,19 +519,19 @@ def main():
         tok_col, sym_col = st.columns(2)
         with tok_col:
             st.markdown("#### Tokens")
-            if token_rows:
-                st.dataframe(pd.DataFrame(token_rows), use_container_width=True)
+            if token_count:
+                _render_paged_table(token_columns, "tokens")
             else:
                 st.write("No se generaron tokens.")
         with sym_col:
             st.markdown("#### Tabla de simbolos")
-            if symbols:
-                st.dataframe(pd.DataFrame(symbols), use_container_width=True)
+            if _column_length(symbols):
+                _render_paged_table(symbols, "symbols")
             else:
                 st.write("Tabla de simbolos vacia.")
     with tabs[1]:
-        if graph_dot:
-            st.graphviz_chart(graph_dot)
+        if result["ast"] is not None:
+            _render_ast(result["ast"], result["ast_key"])
         else:
             st.write("No se pudo construir el AST.")
     with tabs[2]:
@@ -0,0 +1,57 @@
+# Compara la ejecucion del code object generado por PythonCodeGenerator con la
+# interpretacion del bytecode de pila en StackVM.
+#
+#   python -m benchmarks.backends [declaraciones] [repeticiones]
+import io
+import sys
+import time
+
+from codegen import BytecodeGenerator
+from codegen.python_backend import PythonCodeGenerator, run_code
+from codegen.stack_vm import StackVM
+
+from .corpus import generate_program, parse_program
+
+
+def _best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(declarations=20000, repeat=5):
+    arbol = parse_program(generate_program(declarations))
+
+    start = time.perf_counter()
+    generator = BytecodeGenerator()
+    instructions = generator.generate(arbol, binary=False)
+    table = generator.function_table
+    stack_compile = time.perf_counter() - start
+    start = time.perf_counter()
+    code = PythonCodeGenerator().generate(arbol)
+    python_compile = time.perf_counter() - start
+
+    vm_out, py_out = io.StringIO(), io.StringIO()
+    vm_globals = StackVM(vm_out).run(instructions, table)
+    py_globals = run_code(code, py_out)
+    same = vm_out.getvalue() == py_out.getvalue() and all(
+        py_globals.get(name) == value or value != value for name, value in vm_globals.items()
+    )
+
+    stack_run = _best_of(repeat, lambda: StackVM(io.StringIO()).run(instructions, table))
+    python_run = _best_of(repeat, lambda: run_code(code, io.StringIO()))
+
+    print(f"Declaraciones: {declarations}, instrucciones de pila: {len(instructions)}")
+    print(f"Resultados identicos: {same}")
+    print(f"{'Backend':<22}{'generar (s)':>14}{'ejecutar (s)':>14}")
+    print(f"{'StackVM (bytecode)':<22}{stack_compile:>14.4f}{stack_run:>14.4f}")
+    print(f"{'CPython (code object)':<22}{python_compile:>14.4f}{python_run:>14.4f}")
+    print(f"Aceleracion en ejecucion: {stack_run / python_run:.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,92 @@
+# Compara el formato fijo de BytecodeGenerator (opcode de 8 bits + operando de 24 bits,
+# en texto y empaquetado en 4 bytes) con CompactCodec (operandos LEB128 y
+# superinstrucciones). Las superinstrucciones se eligen por frecuencia de n-gramas sobre
+# un corpus de entrenamiento y se miden sobre un programa distinto.
+#
+#   python -m benchmarks.compact [declaraciones] [repeticiones]
+import glob
+import struct
+import sys
+import time
+
+from codegen import BytecodeGenerator
+from codegen.compact import SUPERINSTRUCTIONS, CompactCodec, choose_superinstructions, count_ngrams
+
+from .corpus import generate_program, parse_program
+
+MNEMONICS = {int(bits, 2): name for name, bits in BytecodeGenerator.OPCODES.items()}
+OPERAND_MASK = (1 << BytecodeGenerator.OPERAND_BITS) - 1
+
+
+def decode_text(lines):
+    return [(MNEMONICS[int(opcode, 2)], int(operand, 2)) for opcode, operand in map(str.split, lines)]
+
+
+def pack_fixed(lines):
+    return b"".join(struct.pack(">I", int(opcode + operand, 2)) for opcode, operand in map(str.split, lines))
+
+
+def decode_packed(data):
+    return [(MNEMONICS[word >> 24], word & OPERAND_MASK) for (word,) in struct.iter_unpack(">I", data)]
+
+
+def _instructions(source):
+    return BytecodeGenerator().generate(parse_program(source), binary=False)
+
+
+def _best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(declarations=20000, repeat=5):
+    training = [_instructions(generate_program(2000, seed=seed)) for seed in range(4)]
+    for path in sorted(glob.glob("samples/*.js")):
+        with open(path, "r", encoding="utf-8") as f:
+            training.append(_instructions(f.read()))
+
+    print("n-gramas mas frecuentes en el corpus de entrenamiento:")
+    for gram, count in count_ngrams(training).most_common(8):
+        print(f"  {count:>7}  {' '.join(gram)}")
+    chosen = choose_superinstructions(training)
+    print("Superinstrucciones elegidas:")
+    for gram in chosen:
+        print(f"  {'+'.join(gram)}")
+    if chosen != SUPERINSTRUCTIONS:
+        print("  (difieren de codegen.compact.SUPERINSTRUCTIONS)")
+
+    generator = BytecodeGenerator()
+    arbol = parse_program(generate_program(declarations, seed=99))
+    lines = generator.generate(arbol)
+    instructions = generator.instructions
+    packed = pack_fixed(lines)
+    plain = CompactCodec(()).encode(instructions, generator)
+    compact = CompactCodec(chosen).encode(instructions, generator)
+
+    reference = decode_text(lines)
+    same = decode_packed(packed) == reference and all(
+        CompactCodec.decode(data) == reference for data in (plain, compact)
+    )
+    dispatches = sum(1 for _ in CompactCodec(chosen).segments(instructions))
+
+    rows = [
+        ("fijo, texto", sum(len(line) + 1 for line in lines), len(lines), lambda: decode_text(lines)),
+        ("fijo, 4 bytes", len(packed), len(lines), lambda: decode_packed(packed)),
+        ("compacto", len(plain), len(lines), lambda: CompactCodec.decode(plain)),
+        ("compacto + super", len(compact), dispatches, lambda: CompactCodec.decode(compact)),
+    ]
+    print(f"\nDeclaraciones: {declarations}, instrucciones: {len(instructions)}")
+    print(f"Decodificaciones identicas: {same}")
+    print(f"{'Formato':<18}{'bytes':>10}{'B/instr':>9}{'opcodes':>9}{'decodificar (ms)':>18}")
+    for name, size, opcodes, decode in rows:
+        elapsed = _best_of(repeat, decode)
+        print(f"{name:<18}{size:>10}{size / len(instructions):>9.2f}{opcodes:>9}{elapsed * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
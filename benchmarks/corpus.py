@@ -0,0 +1,35 @@
+import random
+
+
+def generate_program(declarations=1000, functions=10, seed=0):
+    # Programa sintetico del subconjunto soportado: declaraciones aritmeticas que
+    # leen variables anteriores, concatenaciones, funciones y llamadas a console.log
+    rnd = random.Random(seed)
+    lines = ["var v0 = 1;", "var v1 = 2;"]
+    for f in range(functions):
+        lines.append(f"function f{f}() {{")
+        lines.append(f'    console.log("f{f}", v0 + v1);')
+        lines.append("}")
+    for i in range(2, declarations):
+        a, b, c = (rnd.randrange(i) for _ in range(3))
+        shape = rnd.random()
+        if shape < 0.6:
+            lines.append(f"var v{i} = v{a} + v{b} * {rnd.randint(1, 9)} - v{c} / {rnd.randint(1, 9)};")
+        elif shape < 0.8:
+            lines.append(f"var v{i} = (v{a} + v{b} + v{c}) % {rnd.randint(2, 97)};")
+        elif shape < 0.9:
+            lines.append(f'var v{i} = "valor " + v{a};')
+        elif functions and shape < 0.95:
+            lines.append(f"var v{i} = v{a};")
+            lines.append(f"f{rnd.randrange(functions)}();")
+        else:
+            lines.append(f"var v{i} = v{a};")
+            lines.append(f"console.log(v{b}, v{c});")
+    return "\n".join(lines) + "\n"
+
+
+def parse_program(source):
+    from lexer.lexer import Lexer
+    from parser.parser import Parser
+
+    return Parser(Lexer(source).analizar()).parsear()
@@ -0,0 +1,80 @@
+# Muestra que el costo de IncrementalSemanticAnalyzer es proporcional al cambio:
+# se edita una sola sentencia de un archivo grande y se cuenta cuantas sentencias
+# vuelven a analizarse frente a un analisis completo. Las sentencias cortas (menos de
+# min_tokens tokens) se analizan siempre: reproducirlas no es mas barato, asi que en el
+# programa de declaraciones el incremental cuesta lo mismo que el completo y la
+# ganancia aparece con sentencias grandes (funciones con cuerpo).
+#
+#   python -m benchmarks.incremental [declaraciones]
+import gc
+import sys
+import time
+
+from semantic.incremental import IncrementalSemanticAnalyzer
+from semantic.semantic import SemanticAnalyzer
+
+from .corpus import generate_program, parse_program
+
+
+def _best_of(repeat, func, before=None):
+    best = None
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def generate_functions(functions, body=8):
+    # Funciones de nivel superior con cuerpos de `body` declaraciones sobre un global
+    lines = ["var g = 1;"]
+    for f in range(functions):
+        inner = " ".join(f"var a{j} = g + {j} * a{max(j - 1, 0)};" for j in range(1, body))
+        lines.append(f"function f{f}() {{ var a0 = g; {inner} console.log(a{body - 1}); }}")
+    return lines
+
+
+def _compare(title, lines, edits, repeat=3):
+    analyzer = IncrementalSemanticAnalyzer()
+    original = parse_program("\n".join(lines))
+    start = time.perf_counter()
+    analyzer.analyze(original)
+    initial = time.perf_counter() - start
+    print(f"\n{title}: {analyzer.reanalyzed} sentencias, analisis inicial: {initial:.4f} s")
+    print(f"{'Edicion':<28}{'reanalizadas':>14}{'reutilizadas':>14}{'incremental (s)':>17}{'completo (s)':>14}")
+    for label, edit in edits.items():
+        arbol = parse_program("\n".join(edit(lines)))
+        # Cada edicion parte del archivo original
+        incremental = _best_of(repeat, lambda: analyzer.analyze(arbol), lambda: analyzer.analyze(original))
+        full = _best_of(repeat, lambda: SemanticAnalyzer().analyze(arbol))
+        print(f"{label:<28}{analyzer.reanalyzed:>14}{analyzer.reused:>14}{incremental:>17.4f}{full:>14.4f}")
+
+
+def main(declarations=20000):
+    lines = generate_program(declarations).splitlines()
+    _compare(
+        "Declaraciones",
+        lines,
+        {
+            "linea en blanco al inicio": lambda ls: [""] + ls,
+            "cambio de un literal": lambda ls: ls[:-1] + [ls[-1].replace(";", " + 1;", 1)],
+            "cambio de tipo de v1": lambda ls: [ls[0], 'var v1 = "dos";'] + ls[2:],
+        },
+    )
+    _compare(
+        "Funciones",
+        generate_functions(declarations // 10),
+        {
+            "linea en blanco al inicio": lambda ls: [""] + ls,
+            "cambio de un literal": lambda ls: ls[:-1] + [ls[-1].replace("* a", "- a", 1)],
+            "cambio de tipo de g": lambda ls: ['var g = "uno";'] + ls[1:],
+        },
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
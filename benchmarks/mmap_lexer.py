@@ -0,0 +1,72 @@
+# Compara la memoria de lexear un archivo grande leyendolo con open().read() frente a
+# MmapLexer sobre un mmap de solo lectura. Cada modo corre en un proceso nuevo y
+# consume los tokens sin guardarlos (Lexer.iterar), para que la medicion refleje el
+# costo de la fuente y no el de la lista de tokens. Se informan el pico de RSS
+# (VmHWM) y la memoria anonima (RssAnon): las paginas del mmap son del page cache,
+# se cuentan en RssFile y el sistema puede descartarlas.
+#
+#   python -m benchmarks.mmap_lexer [megabytes] [archivo]
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from .corpus import generate_program
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+if sys.argv[2] == "read":
+    from lexer.lexer import Lexer
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        lexer = Lexer(f.read())
+    tokens = sum(1 for _ in lexer.iterar())
+else:
+    from lexer.mmap_lexer import MmapLexer
+    with MmapLexer.abrir(sys.argv[1]) as lexer:
+        tokens = sum(1 for _ in lexer.iterar())
+        status = open("/proc/self/status").read()
+elapsed = time.perf_counter() - start
+if sys.argv[2] == "read":
+    status = open("/proc/self/status").read()
+fields = dict(line.split(":", 1) for line in status.splitlines() if ":" in line)
+print(tokens, elapsed, *(int(fields[k].split()[0]) for k in ("VmHWM", "RssAnon", "RssFile")))
+"""
+
+
+def write_corpus(path, megabytes):
+    chunk = generate_program(5000, functions=5) + "// comentario con acentos: cañón, pingüino\n"
+    target = megabytes * 1024 * 1024
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            f.write(chunk)
+            written += len(chunk.encode("utf-8"))
+    return written
+
+
+def main(megabytes=200, path=None):
+    path = path or os.path.join(tempfile.gettempdir(), f"corpus_{megabytes}mb.js")
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        size = write_corpus(path, megabytes)
+        print(f"Corpus de {size / 2**20:.0f} MiB generado en {time.perf_counter() - start:.1f} s: {path}")
+    size = os.path.getsize(path)
+    print(f"Archivo: {size / 2**20:.0f} MiB")
+    print(f"{'Modo':<8}{'tokens':>12}{'tiempo (s)':>12}{'pico RSS':>12}{'RssAnon':>12}{'RssFile':>12}")
+    for mode in ("read", "mmap"):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE, path, mode], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        tokens, elapsed, hwm, anon, rss_file = int(output[0]), float(output[1]), *map(int, output[2:])
+        print(
+            f"{mode:<8}{tokens:>12,}{elapsed:>12.1f}"
+            f"{hwm / 1024:>9.0f} MiB{anon / 1024:>8.0f} MiB{rss_file / 1024:>8.0f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, sys.argv[2] if len(sys.argv) > 2 else None)
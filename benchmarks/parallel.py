@@ -0,0 +1,107 @@
+# Compara el analisis semantico y la generacion de bytecode secuenciales con los modos
+# paralelos por funcion (ParallelSemanticAnalyzer, ParallelBytecodeGenerator) sobre un
+# programa con muchas funciones, y comprueba que la salida sea identica. Como en
+# benchmarks/parser.py se mide tambien sin recolector de basura: los analizadores por
+# funcion aumentan las colecciones sobre un heap grande.
+#
+#   python -m benchmarks.parallel [funciones] [repeticiones]
+import gc
+import os
+import random
+import sys
+import time
+
+from codegen import BytecodeGenerator
+from codegen.parallel import ParallelBytecodeGenerator
+from semantic.parallel import ParallelSemanticAnalyzer
+from semantic.semantic import SemanticAnalyzer
+
+from .corpus import parse_program
+
+WORKERS = (1, 2, 4)
+
+
+def generate_functions(functions=2000, statements=10, seed=0):
+    # Globales intercalados con funciones cuyos cuerpos leen globales anteriores y
+    # posteriores (estos ultimos producen diagnosticos), llaman a otras funciones y
+    # declaran variables locales. Una de cada cinco declara y llama a una funcion
+    # anidada "helper", con el mismo nombre en todas
+    rnd = random.Random(seed)
+    lines = []
+    for f in range(functions):
+        lines.append(f"var g{f} = {rnd.randint(1, 9)};")
+        body = []
+        for s in range(statements):
+            a, b = rnd.randrange(f + 2), rnd.randrange(f + 1)
+            shape = rnd.random()
+            if shape < 0.6:
+                body.append(f"    var l{s} = g{a} * {rnd.randint(1, 9)} + g{b} - l{max(s - 1, 0)} / 2;")
+            elif shape < 0.8:
+                body.append(f'    var l{s} = "f{f}: " + g{b};')
+            elif shape < 0.9:
+                body.append(f"    f{rnd.randrange(functions)}();")
+            else:
+                body.append(f"    console.log(g{b}, l{max(s - 1, 0)});")
+        if f % 5 == 0:
+            body.append(f'    function helper() {{ console.log("f{f}"); }}')
+            body.append("    helper();")
+        lines.append(f"function f{f}() {{")
+        lines.extend(body)
+        lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _analyze(factory, arbol):
+    semantic = factory()
+    errors = semantic.analyze(arbol)
+    return errors, semantic.format_symbol_table()
+
+
+def _generate(factory, arbol):
+    generator = factory()
+    return generator.generate(arbol), generator.function_table, generator.positions
+
+
+def _compare(arbol, repeat):
+    print(f"{'Modo':<24}{'semantico (s)':>15}{'bytecode (s)':>14}{'identico':>10}")
+    semantic_time, semantic_result = _best_of(repeat, lambda: _analyze(SemanticAnalyzer, arbol))
+    codegen_time, codegen_result = _best_of(repeat, lambda: _generate(BytecodeGenerator, arbol))
+    print(f"{'secuencial':<24}{semantic_time:>15.3f}{codegen_time:>14.3f}{'-':>10}")
+    for workers in WORKERS:
+        parallel_semantic, semantic_output = _best_of(
+            repeat, lambda: _analyze(lambda: ParallelSemanticAnalyzer(workers=workers), arbol)
+        )
+        parallel_codegen, codegen_output = _best_of(
+            repeat, lambda: _generate(lambda: ParallelBytecodeGenerator(workers=workers), arbol)
+        )
+        same = semantic_output == semantic_result and codegen_output == codegen_result
+        print(f"{f'paralelo, {workers} hilos':<24}{parallel_semantic:>15.3f}{parallel_codegen:>14.3f}{str(same):>10}")
+    return semantic_result, codegen_result
+
+
+def main(functions=2000, repeat=3):
+    arbol = parse_program(generate_functions(functions))
+    print(f"Funciones: {functions}, CPUs: {os.cpu_count()}")
+    print("\nCon recolector de basura:")
+    semantic_result, codegen_result = _compare(arbol, repeat)
+    gc.disable()
+    try:
+        print("\nSin recolector de basura:")
+        _compare(arbol, repeat)
+    finally:
+        gc.enable()
+    print(f"\nDiagnosticos: {len(semantic_result[0])}, instrucciones: {len(codegen_result[0])}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,122 @@
+# Compara Parser con ParallelParser (pre-escaneo de llaves y parentesis + pool de
+# procesos) sobre programas de cientos de miles de declaraciones de nivel superior, y
+# comprueba que el AST, los errores y el numero de sentencias sean identicos. Se
+# incluye una variante con errores sintacticos repartidos por el archivo.
+#
+# Ademas se separa el trabajo en serie del proceso principal (pre-escaneo, tokens a
+# columnas, reconstruccion de nodos) del trabajo de los procesos (parseo y aplanado),
+# que da la cota T(P) ~ serie + procesos / P cuando hay P CPUs libres.
+#
+#   python -m benchmarks.parallel_parser [declaraciones,...] [repeticiones]
+import gc
+import os
+import sys
+import time
+
+from lexer.lexer import Lexer
+from parser.parallel import (
+    ParallelParser,
+    _columnas,
+    _parsear_fragmento_columnas,
+    _reconstruir,
+    limites_sentencias,
+)
+from parser.parser import Parser
+
+from .corpus import generate_program
+
+PROCESSES = (1, 2, 4)
+SIZES = (50000, 100000, 200000)
+
+
+def _with_errors(source, every=5000):
+    # Quita el ';' de una de cada `every` lineas para forzar la recuperacion de errores
+    lines = source.split("\n")
+    for i in range(every // 2, len(lines), every):
+        lines[i] = lines[i].rstrip(";")
+    return "\n".join(lines)
+
+
+def _dump(arbol):
+    return [(nivel, nodo.tipo, nodo.valor, nodo.linea, nodo.columna) for nivel, nodo in arbol.recorrer()]
+
+
+def _timed(repeat, factory):
+    # El GC se desactiva durante la medida: con millones de nodos vivos las colecciones
+    # completas dominarian el tiempo de ambos parsers (ver benchmarks/parser.py)
+    best = None
+    for _ in range(repeat):
+        parser = factory()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            parser.parsear()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, parser
+
+
+def _breakdown(tokens, kinds):
+    # Tiempos de cada parte de ParallelParser ejecutadas en este proceso
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        limites = limites_sentencias(kinds, 20000)
+        fragmentos = list(zip(limites, limites[1:]))
+        trozos = [_columnas(tokens[inicio:fin]) for inicio, fin in fragmentos]
+        serial = time.perf_counter() - start
+        start = time.perf_counter()
+        resultados = [_parsear_fragmento_columnas(trozo) for trozo in trozos]
+        workers = time.perf_counter() - start
+        del trozos
+        start = time.perf_counter()
+        for arbol, _ in resultados:
+            if arbol is not None:
+                _reconstruir(*arbol)
+        serial += time.perf_counter() - start
+    finally:
+        gc.enable()
+    return serial, workers
+
+
+def run(declarations, repeat, errors=False):
+    source = generate_program(declarations)
+    if errors:
+        source = _with_errors(source)
+    tokens = Lexer(source).analizar()
+    del source
+    kinds = [t.kind for t in tokens]
+    start = time.perf_counter()
+    chunks = len(limites_sentencias(kinds, 20000)) - 1
+    prescan = time.perf_counter() - start
+    label = f"{declarations} decl.{' con errores' if errors else ''}"
+    print(f"\n{label}: {len(tokens)} tokens, {chunks} fragmentos, pre-escaneo {prescan * 1000:.0f} ms")
+
+    sequential, reference = _timed(repeat, lambda: Parser(tokens))
+    expected = (_dump(reference.arbol), reference.errores, reference.sentencias)
+    print(f"  {'secuencial':<18}{sequential:>9.2f} s")
+    del reference
+    serial, workers = _breakdown(tokens, kinds)
+    bounds = ", ".join(f"P={p}: {serial + workers / p:.2f} s" for p in (2, 4, 8, 16))
+    print(f"  proceso principal {serial:.2f} s, procesos {workers:.2f} s -> cota {bounds}")
+    for processes in PROCESSES:
+        elapsed, parser = _timed(repeat, lambda: ParallelParser(tokens, procesos=processes))
+        same = (_dump(parser.arbol), parser.errores, parser.sentencias) == expected
+        print(f"  {f'{processes} procesos':<18}{elapsed:>9.2f} s  x{sequential / elapsed:.2f}  identico: {same}")
+        del parser
+
+
+def main(sizes=SIZES, repeat=1):
+    print(f"CPUs: {os.cpu_count()}")
+    for declarations in sizes:
+        run(declarations, repeat)
+    run(sizes[0], repeat, errors=True)
+
+
+if __name__ == "__main__":
+    sizes = tuple(int(size) for size in sys.argv[1].split(",")) if len(sys.argv) > 1 else SIZES
+    main(sizes, *(int(arg) for arg in sys.argv[2:3]))
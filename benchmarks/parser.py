@@ -0,0 +1,37 @@
+# Mide el rendimiento del parser (tokens por segundo) sobre el corpus sintetico.
+# Los tokens se generan una vez; solo se cronometra Parser(tokens).parsear(). Se mide
+# tambien con el recolector de basura desactivado, porque en entradas grandes las
+# colecciones completas sobre tokens y nodos dominan el tiempo y ocultan el del parser.
+#
+#   python -m benchmarks.parser [declaraciones] [repeticiones]
+import gc
+import sys
+import time
+
+from lexer.lexer import Lexer
+from parser.parser import Parser
+
+from .corpus import generate_program
+
+
+def main(declarations=20000, repeats=5):
+    source = generate_program(declarations)
+    start = time.perf_counter()
+    tokens = Lexer(source).analizar()
+    lexing = time.perf_counter() - start
+    print(f"Tokens: {len(tokens)}, lexer: {lexing:.4f} s ({len(tokens) / lexing:,.0f} tokens/s)")
+    for label in ("gc activo", "gc desactivado"):
+        if label == "gc desactivado":
+            gc.disable()
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            Parser(tokens).parsear()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"Parser, {label} (mejor de {repeats}): {best:.4f} s ({len(tokens) / best:,.0f} tokens/s)")
+    gc.enable()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,62 @@
+# Compara compilar muchos fragmentos pequenos con un Pipeline nuevo por fragmento
+# frente a reutilizar pipelines de un PipelinePool, con varios hilos. Ambos caminos
+# hacen el mismo trabajo (Pipeline.compile). Construir o reiniciar las fases cuesta
+# unos pocos microsegundos frente a cientos de la compilacion, asi que el pool no es
+# mas rapido: las dos filas solo difieren en el ruido de los hilos.
+#
+#   python -m benchmarks.pool [fragmentos] [hilos] [repeticiones]
+import gc
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline.pool import Pipeline, PipelinePool
+
+from .corpus import generate_program
+
+
+def compile_fresh(source):
+    return Pipeline().compile(source)
+
+
+def _outputs(result):
+    return result["syntax_errors"], result["semantic_errors"], result["symbols"], result["bytecode"]
+
+
+def _per_call(func, number=2000):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main(snippets=20000, threads=4, repeat=3):
+    sources = [generate_program(3, functions=0, seed=seed) for seed in range(64)]
+    work = [sources[i % len(sources)] for i in range(snippets)]
+    pool = PipelinePool(max_size=threads)
+
+    pipeline = Pipeline()
+    print(
+        f"Por fragmento: Pipeline() {_per_call(Pipeline):.1f} us, reset() {_per_call(pipeline.reset):.1f} us,"
+        f" compile() {_per_call(lambda: pipeline.compile(sources[0]), 200):.1f} us"
+    )
+    # Los modos se alternan en cada repeticion y cada corrida empieza tras una coleccion:
+    # el que corre despues no paga el heap que dejo el anterior
+    modes = {"Pipeline nuevo": compile_fresh, "PipelinePool": pool.compile}
+    best = dict.fromkeys(modes)
+    expected = [_outputs(compile_fresh(source)) for source in sources]
+    for _ in range(repeat):
+        for label, compile_one in modes.items():
+            gc.collect()
+            with ThreadPoolExecutor(threads) as executor:
+                start = time.perf_counter()
+                results = list(executor.map(compile_one, work))
+                elapsed = time.perf_counter() - start
+            best[label] = elapsed if best[label] is None else min(best[label], elapsed)
+            assert [_outputs(result) for result in results] == [expected[i % len(sources)] for i in range(snippets)]
+            del results
+    for label, elapsed in best.items():
+        print(f"{label:<20}{elapsed:>8.3f} s {snippets / elapsed:>10,.0f} fragmentos/s")
+    print(f"Pool: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:4]))
@@ -0,0 +1,76 @@
+# Compara el numero de instrucciones del bytecode de pila con el del codigo de tres
+# direcciones de RegisterIRGenerator sobre el corpus sintetico y samples/, con varios
+# tamanos de banco de registros, y comprueba que ambos interpretes den el mismo resultado.
+#
+#   python -m benchmarks.register_ir [declaraciones] [repeticiones]
+import glob
+import io
+import sys
+import time
+
+from codegen import BytecodeGenerator
+from codegen.register_ir import RegisterIRGenerator, RegisterVM
+from codegen.stack_vm import StackVM
+
+from .corpus import generate_program, parse_program
+
+REGISTER_FILES = (2, 4, 8)
+
+
+def _best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _same_results(arbol, registers):
+    stack = BytecodeGenerator()
+    instructions = stack.generate(arbol, binary=False)
+    stack_out = io.StringIO()
+    stack_globals = StackVM(stack_out).run(instructions, stack.function_table)
+    generator = RegisterIRGenerator(registers)
+    generator.generate(arbol)
+    ir_out = io.StringIO()
+    ir_globals = RegisterVM(ir_out).run(generator.instructions, generator.function_table, registers)
+    return stack_out.getvalue() == ir_out.getvalue() and all(
+        ir_globals.get(name) == value or value != value for name, value in stack_globals.items()
+    )
+
+
+def main(declarations=20000, repeat=3):
+    programs = [(f"corpus ({declarations} decl.)", parse_program(generate_program(declarations)))]
+    for path in sorted(glob.glob("samples/*.js")):
+        with open(path, "r", encoding="utf-8") as f:
+            programs.append((path, parse_program(f.read())))
+
+    header = f"{'Programa':<28}{'pila':>9}" + "".join(f"{f'tres dir. k={k}':>16}{'desb.':>7}" for k in REGISTER_FILES)
+    print(header)
+    for name, arbol in programs:
+        stack = len(BytecodeGenerator().generate(arbol, binary=False))
+        row = f"{name:<28}{stack:>9}"
+        for registers in REGISTER_FILES:
+            generator = RegisterIRGenerator(registers)
+            count = len(generator.generate(arbol))
+            row += f"{count:>9} ({count / stack:.0%}){generator.spills:>7}"
+        print(row)
+
+    arbol = programs[0][1]
+    print("\nResultados identicos:", all(_same_results(arbol, k) for k in REGISTER_FILES))
+    stack = BytecodeGenerator()
+    instructions = stack.generate(arbol, binary=False)
+    generator = RegisterIRGenerator()
+    generator.generate(arbol)
+    stack_run = _best_of(repeat, lambda: StackVM(io.StringIO()).run(instructions, stack.function_table))
+    ir_run = _best_of(
+        repeat,
+        lambda: RegisterVM(io.StringIO()).run(generator.instructions, generator.function_table, generator.registers),
+    )
+    print(f"Ejecucion StackVM: {stack_run:.3f} s, RegisterVM (k={generator.registers}): {ir_run:.3f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,78 @@
+# Verifica el presupuesto de arranque en frio del CLI: tiempo de importacion de los
+# modulos del compilador, latencia de la primera compilacion y que las dependencias
+# pesadas u opcionales no se carguen. Cada medicion usa un proceso nuevo y se toma
+# el minimo de varias repeticiones. Termina con codigo 1 si se excede el presupuesto.
+#
+#   python -m benchmarks.startup [--import-ms 60] [--compile-ms 50] [--runs 5]
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modulos que el camino del CLI (main.Compilador) no debe importar
+FORBIDDEN = ("asyncio", "streamlit", "pandas", "numpy")
+
+PROBE = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+import main
+import pipeline
+from codegen import BytecodeGenerator
+from lexer.lexer import Lexer
+from parser.parser import Parser
+from semantic.semantic import SemanticAnalyzer
+imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    main.Compilador(sys.argv[1]).ejecutar()
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "compile_ms": (done - imported) * 1000,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (FORBIDDEN,)
+
+
+def measure(sample, runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE, sample], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output))
+    return {
+        "import_ms": min(s["import_ms"] for s in samples),
+        "compile_ms": min(s["compile_ms"] for s in samples),
+        "loaded": sorted({name for s in samples for name in s["loaded"]}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Presupuesto de arranque en frio del compilador.")
+    parser.add_argument("--sample", default=os.path.join("samples", "ejemplo.js"))
+    parser.add_argument("--import-ms", type=float, default=60.0, help="Limite para importar el compilador")
+    parser.add_argument("--compile-ms", type=float, default=50.0, help="Limite para la primera compilacion")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = measure(args.sample, args.runs)
+    failures = []
+    if result["import_ms"] > args.import_ms:
+        failures.append(f"importacion {result['import_ms']:.1f} ms > {args.import_ms:.1f} ms")
+    if result["compile_ms"] > args.compile_ms:
+        failures.append(f"primera compilacion {result['compile_ms']:.1f} ms > {args.compile_ms:.1f} ms")
+    if result["loaded"]:
+        failures.append(f"modulos pesados cargados: {', '.join(result['loaded'])}")
+
+    print(f"Importacion: {result['import_ms']:.1f} ms (limite {args.import_ms:.1f} ms)")
+    print(f"Primera compilacion: {result['compile_ms']:.1f} ms (limite {args.compile_ms:.1f} ms)")
+    for failure in failures:
+        print(f"FALLO: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,39 @@
-from .bytecode_generator import BytecodeGenerator
+from importlib import import_module
 
-__all__ = ["BytecodeGenerator"]
+# Los submodulos se importan al primer acceso (PEP 562) para que el arranque del CLI
+# no pague por backends que no usa
+_EXPORTS = {
+    "BytecodeGenerator": ".bytecode_generator",
+    "BytecodeVerifier": ".verifier",
+    "CompactCodec": ".compact",
+    "ParallelBytecodeGenerator": ".parallel",
+    "PythonCodeGenerator": ".python_backend",
+    "RegisterIRGenerator": ".register_ir",
+    "RegisterVM": ".register_ir",
+    "StackVM": ".stack_vm",
+    "VerificationError": ".verifier",
+}
+
+__all__ = [
+    "BytecodeGenerator",
+    "BytecodeVerifier",
+    "CompactCodec",
+    "ParallelBytecodeGenerator",
+    "PythonCodeGenerator",
+    "RegisterIRGenerator",
+    "RegisterVM",
+    "StackVM",
+    "VerificationError",
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,3 +1,36 @@
+class FunctionIndex:
+    """Indices de las unidades de funcion, resueltos por ambito lexico.
+
+    Las funciones se numeran en preorden del AST. Cada funcion declara su nombre en el
+    ambito de la funcion que la contiene (None es el programa principal); una llamada
+    busca primero entre las funciones anidadas en la funcion que llama y despues en los
+    ambitos que la encierran. Con nombres repetidos en un mismo ambito gana la ultima
+    declaracion (hoisting).
+    """
+
+    def __init__(self, ast_root=None):
+        self.nodes = []
+        self.scopes = {None: {}}
+        self.parents = {}
+        pendientes = [(ast_root, None)] if ast_root else []
+        while pendientes:
+            node, owner = pendientes.pop()
+            if node.tipo == "FunctionDeclaration":
+                name = node.hijos[0].valor if node.hijos else "anon"
+                self.scopes.setdefault(owner, {})[name] = len(self.nodes)
+                self.parents[node] = owner
+                self.nodes.append((name, node))
+                owner = node
+            pendientes.extend((child, owner) for child in reversed(node.hijos))
+
+    def resolve(self, name, owner=None):
+        while True:
+            index = self.scopes.get(owner, {}).get(name)
+            if index is not None or owner is None:
+                return index
+            owner = self.parents[owner]
+
+
 class BytecodeGenerator:
     """Generador de bytecode binario tipo stack."""
 
@@ -20,35 +53,166 @@ class BytecodeGenerator:
         "MOD": "00001000",
         "CALL": "00001001",
         "POP": "00001010",
+        "CALL_FUNC": "00001011",
+        "CALL_BUILTIN": "00001100",
+        "RETURN": "00001101",
+        "HALT": "00001110",
         "COMMENT": "11111111",
     }
 
     OPERAND_BITS = 24
+    # CALL_FUNC y CALL_BUILTIN codifican (indice << 8) | cantidad de argumentos
+    ARGC_BITS = 8
 
-    def __init__(self):
+    BUILTINS = ["console.log", "console.warn", "console.error"]
+    BUILTIN_CALLS = set(BUILTINS)
+    CSE_TEMP_PREFIX = "%cse"
+
+    def __init__(self, cse=False):
+        # cse: guarda en un temporal las subexpresiones puras repetidas y las recarga
+        self.cse = cse
+        # Punto de control cooperativo opcional: checkpoint(fase, procesados, parcial)
+        self.checkpoint = None
+        # En modo streaming (stream/write_to) cada instruccion va codificada a _sink
+        self._sink = None
+        self.reset()
+
+    def reset(self):
+        # Descarta el programa anterior; la configuracion (cse, checkpoint) se conserva
+        self.interner = None
+        self._cse_candidates = set()
+        self._cse_available = {}
+        self._cse_temps = {}
         self.instructions = []
         self.symbol_ids = {}
         self.next_symbol_id = 1
+        self._count = 0
+        # Tabla de funciones: (nombre, desplazamiento, longitud) de cada unidad de codigo
+        self.function_table = []
+        self.function_index = FunctionIndex()
+        self._function_nodes = []
+        # Funcion cuya unidad se esta generando (None en el programa principal)
+        self._function = None
+        # Posicion de fuente (linea, columna) de cada instruccion emitida
+        self.positions = []
+        self._position = None
+        self.statements = 0
 
     def generate(self, ast_root, binary=True):
-        self.instructions = []
-        self.symbol_ids = {}
-        self.next_symbol_id = 1
-        if ast_root:
-            self._visit(ast_root)
+        for _ in self._generate_steps(ast_root):
+            pass
         if binary:
             return self._to_binary()
         return self.instructions
 
-    def _emit(self, opcode, operand=None):
-        self.instructions.append((opcode, operand))
+    def stream(self, ast_root):
+        # Produce cada instruccion ya codificada a medida que se genera (tras cada sentencia
+        # de nivel superior y cada unidad de funcion) sin acumular self.instructions
+        pending = []
+        self._sink = pending.append
+        try:
+            for _ in self._generate_steps(ast_root):
+                yield from pending
+                pending.clear()
+        finally:
+            self._sink = None
+
+    def write_to(self, ast_root, sink):
+        # Escribe el bytecode binario, una instruccion por linea, en un objeto tipo archivo
+        count = 0
+        for line in self.stream(ast_root):
+            sink.write(line + "\n")
+            count += 1
+        return count
 
-    def _emit_comment(self, text):
-        self.instructions.append(("COMMENT", text))
+    def _generate_steps(self, ast_root):
+        self.reset()
+        if self.cse and ast_root:
+            from parser.hashcons import ExpressionInterner
+
+            self.interner = ExpressionInterner()
+            self.interner.intern_tree(ast_root)
+            self._cse_candidates = self.interner.repeated()
+        self._collect_functions(ast_root)
+        if ast_root and ast_root.tipo == "Program":
+            # Igual que _visit_Program, pero cediendo el control tras cada sentencia
+            self._position = (ast_root.linea, ast_root.columna) if ast_root.linea is not None else None
+            for child in ast_root.hijos:
+                self._checkpoint()
+                self._visit(child)
+                yield
+            self._position = None
+        elif ast_root:
+            self._visit(ast_root)
+        self._emit("HALT")
+        yield
+        yield from self._function_units()
+
+    def _function_units(self):
+        for name, node in self._function_nodes:
+            self._emit_function_unit(name, node)
+            yield
+
+    def _collect_functions(self, ast_root):
+        # Indices de funcion resueltos antes de generar, para admitir llamadas previas a
+        # la declaracion (hoisting)
+        self.function_table = []
+        self.function_index = FunctionIndex(ast_root)
+        self._function_nodes = self.function_index.nodes
+
+    def _emit_function_unit(self, name, node):
+        # Cada funcion es una unidad independiente a continuacion del programa principal
+        offset = self._count
+        self._cse_available = {}
+        self._function = node
+        self._position = (node.linea, node.columna) if node.linea is not None else None
+        if len(node.hijos) > 1:
+            self._visit(node.hijos[1])
+        self._emit("RETURN")
+        self._function = None
+        self.function_table.append((name, offset, self._count - offset))
+
+    def _emit(self, opcode, operand=None):
+        if self._sink is None:
+            self.instructions.append((opcode, operand))
+        else:
+            self._sink(self._encode(opcode, operand))
+        self._count += 1
+        self.positions.append(self._position)
+        if self._cse_available:
+            if opcode == "STORE_VAR" and not str(operand).startswith(self.CSE_TEMP_PREFIX):
+                # Una asignacion invalida los temporales que leen esa variable
+                self._cse_available = {
+                    hc: entry for hc, entry in self._cse_available.items() if operand not in entry[1]
+                }
+            elif opcode == "CALL_FUNC" or (
+                opcode == "CALL" and str(operand).rsplit(":", 1)[0] not in self.BUILTIN_CALLS
+            ):
+                # Una funcion de usuario puede modificar cualquier variable
+                self._cse_available = {}
 
     def _visit(self, node):
         method = getattr(self, f"_visit_{node.tipo}", self._visit_generic)
-        return method(node)
+        if node.linea is None:
+            # Los nodos sin posicion (p. ej. BinaryExpression) heredan la de su ancestro
+            return method(node)
+        outer = self._position
+        self._position = (node.linea, node.columna)
+        try:
+            return method(node)
+        finally:
+            self._position = outer
+
+    def compact(self, codec=None):
+        # Codificacion compacta de las instrucciones generadas (generate debe haberse llamado)
+        from .compact import CompactCodec
+
+        return (codec or CompactCodec()).encode(self.instructions, self)
+
+    def position_table(self):
+        from .position_table import PositionTable
+
+        return PositionTable.encode(self.positions)
 
     def _visit_generic(self, node):
         for child in node.hijos:
@@ -56,18 +220,22 @@ class BytecodeGenerator:
 
     def _visit_Program(self, node):
         for child in node.hijos:
+            self._checkpoint()
             self._visit(child)
 
     def _visit_Block(self, node):
         for child in node.hijos:
+            self._checkpoint()
             self._visit(child)
 
+    def _checkpoint(self):
+        if self.checkpoint is not None:
+            self.checkpoint("codegen", self.statements, self.instructions)
+        self.statements += 1
+
     def _visit_FunctionDeclaration(self, node):
-        name = node.hijos[0].valor if node.hijos else "anon"
-        self._emit_comment(f"Function {name}")
-        if len(node.hijos) > 1:
-            self._visit(node.hijos[1])
-        self._emit_comment(f"EndFunction {name}")
+        # El cuerpo se genera como unidad propia en _emit_function_unit
+        return None
 
     def _visit_VariableDeclaration(self, node):
         identifier = node.hijos[0].valor if node.hijos else "tmp"
@@ -94,6 +262,25 @@ class BytecodeGenerator:
     def _visit_BinaryExpression(self, node):
         if len(node.hijos) < 2:
             return
+        if self._cse_candidates:
+            hc = self.interner.id_of(node)
+            if hc in self._cse_candidates:
+                self._visit_shared_expression(node, hc)
+                return
+        self._emit_binary(node)
+
+    def _visit_shared_expression(self, node, hc):
+        entry = self._cse_available.get(hc)
+        if entry is not None:
+            self._emit("LOAD_VAR", entry[0])
+            return
+        temp = self._cse_temps.setdefault(hc, f"{self.CSE_TEMP_PREFIX}{len(self._cse_temps)}")
+        self._emit_binary(node)
+        self._emit("STORE_VAR", temp)
+        self._emit("LOAD_VAR", temp)
+        self._cse_available[hc] = (temp, self.interner.reads[hc])
+
+    def _emit_binary(self, node):
         self._visit(node.hijos[0])
         self._visit(node.hijos[1])
         instr = self.BIN_OP_MAP.get(node.valor)
@@ -110,8 +297,14 @@ class BytecodeGenerator:
                 self._visit(arg)
                 arg_count += 1
         target = self._format_call_target(node.hijos[0])
-        operand = f"{target}:{arg_count}"
-        self._emit("CALL", operand)
+        index = self.function_index.resolve(target, self._function) if node.hijos[0].tipo == "Identifier" else None
+        if target in self.BUILTIN_CALLS:
+            self._emit("CALL_BUILTIN", (self.BUILTINS.index(target), arg_count))
+        elif index is not None:
+            self._emit("CALL_FUNC", (index, arg_count))
+        else:
+            # Destino desconocido en compilacion: se resuelve por nombre al ejecutar
+            self._emit("CALL", f"{target}:{arg_count}")
 
     def _format_call_target(self, node):
         if node.tipo == "Identifier":
@@ -131,22 +324,34 @@ class BytecodeGenerator:
             parts.insert(0, current.valor)
         return parts
 
+    def encode(self, instructions):
+        # Codifica una lista de instrucciones ajena al generador (p. ej. la salida del enlazador)
+        self.reset()
+        self.instructions = list(instructions)
+        return self._to_binary()
+
     def _to_binary(self):
-        lines = []
-        for opcode, operand in self.instructions:
-            opcode_bits = self.OPCODES.get(opcode, self.OPCODES["COMMENT"])
-            operand_bits = self._operand_bits(operand)
-            lines.append(f"{opcode_bits} {operand_bits}")
-        return lines
+        return [self._encode(opcode, operand) for opcode, operand in self.instructions]
+
+    def _encode(self, opcode, operand):
+        return f"{self.OPCODES.get(opcode, self.OPCODES['COMMENT'])} {self._operand_bits(operand)}"
 
     def _operand_bits(self, operand):
+        return format(self._operand_value(operand), f"0{self.OPERAND_BITS}b")
+
+    def _operand_value(self, operand):
+        # Valor entero del operando; los nombres y cadenas se numeran en symbol_ids
         if operand is None:
-            return "0" * self.OPERAND_BITS
+            return 0
+        if isinstance(operand, tuple):
+            index, argc = operand
+            if argc >= 1 << self.ARGC_BITS or index >= 1 << (self.OPERAND_BITS - self.ARGC_BITS):
+                raise ValueError(f"Operando de llamada fuera de rango: indice {index}, argumentos {argc}")
+            return index << self.ARGC_BITS | argc
         if isinstance(operand, (int, float)):
-            value = int(float(operand))
-            return format(value & ((1 << self.OPERAND_BITS) - 1), f"0{self.OPERAND_BITS}b")
+            return int(float(operand)) & ((1 << self.OPERAND_BITS) - 1)
         key = str(operand)
         symbol_id = self.symbol_ids.setdefault(key, self.next_symbol_id)
         if symbol_id == self.next_symbol_id:
             self.next_symbol_id += 1
-        return format(symbol_id, f"0{self.OPERAND_BITS}b")
+        return symbol_id
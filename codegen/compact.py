@@ -0,0 +1,221 @@
+from collections import Counter
+
+from .bytecode_generator import BytecodeGenerator
+from .varint import write_varint
+
+FORMAT_VERSION = 1
+# Opcodes sin operando: ocupan un solo byte
+NO_OPERAND = frozenset({"ADD", "SUB", "MUL", "DIV", "MOD", "POP", "RETURN", "HALT"})
+# Los fines de unidad y los comentarios nunca forman parte de una superinstruccion, asi
+# los desplazamientos de la tabla de funciones siguen contando instrucciones basicas
+FUSIBLE = frozenset(BytecodeGenerator.OPCODES) - {"RETURN", "HALT", "COMMENT"}
+SUPER_BASE = 0x80
+MAX_SUPERINSTRUCTIONS = 0xFF - SUPER_BASE
+
+# Elegidas con benchmarks/compact.py (frecuencia de n-gramas en el corpus sintetico y samples/)
+SUPERINSTRUCTIONS = (
+    ("STORE_VAR", "LOAD_VAR", "LOAD_VAR"),
+    ("PUSH_CONST", "MUL", "ADD"),
+    ("PUSH_CONST", "DIV", "SUB"),
+    ("LOAD_VAR", "ADD", "PUSH_CONST"),
+    ("PUSH_CONST", "LOAD_VAR", "ADD"),
+    ("POP", "LOAD_VAR", "LOAD_VAR"),
+    ("LOAD_VAR", "STORE_VAR", "CALL_FUNC"),
+    ("STORE_VAR", "LOAD_VAR"),
+)
+
+
+def count_ngrams(programs, sizes=(2, 3)):
+    # Frecuencia de cada secuencia de opcodes fusionables en listas de (opcode, operando)
+    counts = Counter()
+    for instructions in programs:
+        opcodes = [opcode for opcode, _ in instructions]
+        for size in sizes:
+            for start in range(len(opcodes) - size + 1):
+                gram = tuple(opcodes[start:start + size])
+                if FUSIBLE.issuperset(gram):
+                    counts[gram] += 1
+    return counts
+
+
+def choose_superinstructions(programs, limit=8, sizes=(2, 3), min_count=2):
+    # Seleccion voraz: en cada ronda se fusiona el n-grama que mas bytes de opcode ahorra
+    # sobre el corpus ya codificado con las superinstrucciones elegidas antes
+    chosen = []
+    for _ in range(min(limit, MAX_SUPERINSTRUCTIONS)):
+        codec = CompactCodec(chosen)
+        counts = Counter()
+        for instructions in programs:
+            for gram in _uncovered_runs(codec, instructions, sizes):
+                counts[gram] += 1
+        best = max(
+            (gram for gram, count in counts.items() if count >= min_count),
+            key=lambda gram: (counts[gram] * (len(gram) - 1), gram),
+            default=None,
+        )
+        if best is None:
+            break
+        chosen.append(best)
+    return tuple(chosen)
+
+
+def _uncovered_runs(codec, instructions, sizes):
+    # n-gramas que aun se emitirian como instrucciones basicas consecutivas
+    run = []
+    for sequence in codec.segments(instructions):
+        if len(sequence) == 1 and sequence[0] in FUSIBLE:
+            run.append(sequence[0])
+            continue
+        yield from _ngrams(run, sizes)
+        run = []
+    yield from _ngrams(run, sizes)
+
+
+def _ngrams(opcodes, sizes):
+    for size in sizes:
+        for start in range(len(opcodes) - size + 1):
+            yield tuple(opcodes[start:start + size])
+
+
+class CompactCodec:
+    """Codificacion de longitud variable para las instrucciones de BytecodeGenerator.
+
+    Cada instruccion es un byte de opcode seguido, solo si lo necesita, de su operando
+    como entero LEB128 sin signo (el mismo valor de 24 bits del formato fijo). Los
+    opcodes desde 0x80 son superinstrucciones: una secuencia frecuente de opcodes
+    seguida de los operandos de sus componentes. La cabecera lleva la version y la
+    tabla de superinstrucciones, de modo que decode no depende del codec que codifico.
+    """
+
+    BASE_CODES = {name: int(bits, 2) for name, bits in BytecodeGenerator.OPCODES.items()}
+
+    def __init__(self, superinstructions=SUPERINSTRUCTIONS):
+        superinstructions = [tuple(sequence) for sequence in superinstructions]
+        if len(superinstructions) > MAX_SUPERINSTRUCTIONS:
+            raise ValueError(f"Como maximo {MAX_SUPERINSTRUCTIONS} superinstrucciones")
+        for sequence in superinstructions:
+            if len(sequence) < 2 or not FUSIBLE.issuperset(sequence):
+                raise ValueError(f"Superinstruccion invalida: {sequence}")
+        self.superinstructions = superinstructions
+        self._codes = {sequence: code for code, sequence in enumerate(superinstructions, SUPER_BASE)}
+        # Candidatas por opcode inicial, de la mas larga a la mas corta
+        self._by_first = {}
+        for sequence in superinstructions:
+            self._by_first.setdefault(sequence[0], []).append(sequence)
+        for candidates in self._by_first.values():
+            candidates.sort(key=len, reverse=True)
+        self._header = self._encode_header()
+
+    def _encode_header(self):
+        header = bytearray((FORMAT_VERSION, len(self.superinstructions)))
+        for sequence in self.superinstructions:
+            header.append(len(sequence))
+            header.extend(self.BASE_CODES[opcode] for opcode in sequence)
+        return bytes(header)
+
+    def segments(self, instructions):
+        # Agrupa los opcodes tal como se codificarian: coincidencia mas larga primero
+        index = 0
+        total = len(instructions)
+        while index < total:
+            sequence = self._match(instructions, index, total)
+            if sequence is None:
+                sequence = (instructions[index][0],)
+            yield sequence
+            index += len(sequence)
+
+    def _match(self, instructions, index, total):
+        for sequence in self._by_first.get(instructions[index][0], ()):
+            end = index + len(sequence)
+            if end <= total and all(instructions[index + k][0] == opcode for k, opcode in enumerate(sequence)):
+                return sequence
+        return None
+
+    def encode(self, instructions, generator=None):
+        # Los operandos se numeran con generator.symbol_ids, igual que en el formato fijo
+        generator = generator or BytecodeGenerator()
+        operand_value = generator._operand_value
+        out = bytearray(self._header)
+        codes = self._codes
+        index = 0
+        total = len(instructions)
+        while index < total:
+            sequence = self._match(instructions, index, total)
+            if sequence is None:
+                opcode = instructions[index][0]
+                out.append(self.BASE_CODES.get(opcode, self.BASE_CODES["COMMENT"]))
+                length = 1
+            else:
+                out.append(codes[sequence])
+                length = len(sequence)
+            for opcode, operand in instructions[index:index + length]:
+                if opcode not in NO_OPERAND:
+                    write_varint(out, operand_value(operand))
+            index += length
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        # Devuelve tuplas (mnemonico, operando entero) con las superinstrucciones expandidas;
+        # el operando es 0 en los opcodes que no lo llevan, como en el formato fijo
+        table, index = cls._decode_table(data)
+        decoded = []
+        append = decoded.append
+        total = len(data)
+        try:
+            while index < total:
+                entry = table[data[index]]
+                index += 1
+                if entry is None:
+                    raise ValueError(f"Opcode desconocido {data[index - 1]:#04x} en el byte {index - 1}")
+                for mnemonic, has_operand in entry:
+                    if not has_operand:
+                        append((mnemonic, 0))
+                        continue
+                    value = data[index]
+                    index += 1
+                    if value & 0x80:
+                        value &= 0x7F
+                        shift = 7
+                        while True:
+                            byte = data[index]
+                            index += 1
+                            value |= (byte & 0x7F) << shift
+                            if not byte & 0x80:
+                                break
+                            shift += 7
+                    append((mnemonic, value))
+        except IndexError:
+            raise ValueError("Bytecode compacto truncado") from None
+        return decoded
+
+    _tables = {}
+
+    @classmethod
+    def _decode_table(cls, data):
+        # Tabla de 256 entradas: opcode -> ((mnemonico, lleva_operando), ...)
+        if len(data) < 2 or data[0] != FORMAT_VERSION:
+            raise ValueError("Cabecera de bytecode compacto invalida")
+        end = 2
+        for _ in range(data[1]):
+            if end >= len(data):
+                raise ValueError("Cabecera de bytecode compacto truncada")
+            end += 1 + data[end]
+        header = bytes(data[:end])
+        table = cls._tables.get(header)
+        if table is None:
+            names = {code: name for name, code in cls.BASE_CODES.items()}
+            table = [None] * 256
+            for name, code in cls.BASE_CODES.items():
+                table[code] = ((name, name not in NO_OPERAND),)
+            position = 2
+            for code in range(SUPER_BASE, SUPER_BASE + data[1]):
+                length = header[position]
+                try:
+                    sequence = [names[byte] for byte in header[position + 1:position + 1 + length]]
+                except KeyError:
+                    raise ValueError("Superinstruccion con opcode desconocido en la cabecera") from None
+                table[code] = tuple((name, name not in NO_OPERAND) for name in sequence)
+                position += 1 + length
+            cls._tables[header] = table
+        return table, end
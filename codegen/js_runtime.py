@@ -0,0 +1,131 @@
+# Semantica del subconjunto de JavaScript compartida por los backends ejecutables:
+# numeros como float de doble precision, '+' que concatena si algun operando es
+# string, division y modulo al estilo JS, y 'undefined' representado como None.
+import ast
+import math
+import sys
+
+
+def js_constant(literal):
+    # Convierte el operando de PUSH_CONST o el valor de un literal del AST
+    if literal is None or literal == "undefined":
+        return None
+    if literal[:1] in ("'", '"'):
+        try:
+            return ast.literal_eval(literal)
+        except (ValueError, SyntaxError):
+            return literal[1:-1]
+    return float(literal)
+
+
+def js_to_string(value):
+    if value is None:
+        return "undefined"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        if value.is_integer() and abs(value) < 1e21:
+            return str(int(value))
+        return repr(value)
+    if callable(value):
+        return "function"
+    return str(value)
+
+
+def js_to_number(value):
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, float):
+        return value
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0.0
+        try:
+            return float(text)
+        except ValueError:
+            return math.nan
+    return math.nan
+
+
+def js_add(left, right):
+    if isinstance(left, str) or isinstance(right, str):
+        return js_to_string(left) + js_to_string(right)
+    return js_to_number(left) + js_to_number(right)
+
+
+def js_sub(left, right):
+    return js_to_number(left) - js_to_number(right)
+
+
+def js_mul(left, right):
+    return js_to_number(left) * js_to_number(right)
+
+
+def js_div(left, right):
+    left, right = js_to_number(left), js_to_number(right)
+    if right == 0:
+        if left == 0 or math.isnan(left):
+            return math.nan
+        return math.copysign(math.inf, left) * math.copysign(1.0, right)
+    return left / right
+
+
+def js_mod(left, right):
+    left, right = js_to_number(left), js_to_number(right)
+    if right == 0 or math.isinf(left):
+        return math.nan
+    # El resto de JS toma el signo del dividendo, como math.fmod
+    return math.fmod(left, right)
+
+
+def js_neg(value):
+    return -js_to_number(value)
+
+
+def js_pos(value):
+    return js_to_number(value)
+
+
+def js_not(value):
+    if isinstance(value, float):
+        return value == 0 or math.isnan(value)
+    return not value
+
+
+BINARY_OPS = {
+    "ADD": js_add,
+    "SUB": js_sub,
+    "MUL": js_mul,
+    "DIV": js_div,
+    "MOD": js_mod,
+}
+
+
+class Console:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def log(self, *args):
+        self.stream.write(" ".join(js_to_string(a) for a in args) + "\n")
+
+    warn = log
+    error = log
+
+
+def builtins_for(stream=None):
+    console = Console(stream)
+    return {
+        "console": console,
+        "console.log": console.log,
+        "console.warn": console.warn,
+        "console.error": console.error,
+    }
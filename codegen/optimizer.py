@@ -0,0 +1,178 @@
+from collections import Counter
+
+from parser.hashcons import PURE_KINDS
+from parser.parser import NodoAST
+
+
+class DeadCodeEliminator:
+    """Elimina declaraciones sin usos y funciones nunca invocadas.
+
+    Se apoya en los contadores de uso que SemanticAnalyzer calcula durante su
+    recorrido: al quitar una declaracion se descuentan las lecturas que hacia, de
+    modo que las cadenas de declaraciones muertas se eliminan en un solo pase.
+    """
+
+    def __init__(self, semantic, keep_globals=False):
+        self.semantic = semantic
+        self.keep_globals = keep_globals
+        self.removed = []
+
+    def prune(self, ast_root):
+        dead = self._find_dead(ast_root)
+        outermost = []
+        pruned = self._copy_without(ast_root, dead, outermost)
+        self.removed = [
+            (self._kind(node), self.semantic.declared_symbols[node].name, node.linea) for node in outermost
+        ]
+        return pruned
+
+    def optimize(self, ast_root, generator_factory=None):
+        # Genera el bytecode original y el optimizado y devuelve un reporte comparativo
+        from .bytecode_generator import BytecodeGenerator
+
+        factory = generator_factory or BytecodeGenerator
+        before = factory().generate(ast_root, binary=False)
+        optimized_ast = self.prune(ast_root)
+        generator = factory()
+        after_instructions = generator.generate(optimized_ast, binary=False)
+        bytes_per_instruction = (8 + BytecodeGenerator.OPERAND_BITS) // 8
+        report = {
+            "removed": list(self.removed),
+            "instructions_before": len(before),
+            "instructions_after": len(after_instructions),
+            "bytes_before": len(before) * bytes_per_instruction,
+            "bytes_after": len(after_instructions) * bytes_per_instruction,
+        }
+        return optimized_ast, generator._to_binary(), report
+
+    def _find_dead(self, ast_root):
+        semantic = self.semantic
+        uses = {}
+        for node, symbol in semantic.declared_symbols.items():
+            if symbol is not None:
+                uses[symbol] = symbol.uses
+        owners_by_symbol = {}
+        for node, symbol in semantic.declared_symbols.items():
+            if symbol is not None:
+                owners_by_symbol.setdefault(symbol, []).append(node)
+        parents = self._owner_parents(ast_root)
+
+        # owner_reads de una declaracion incluye las lecturas de las declaraciones anidadas:
+        # cada lectura se descuenta una sola vez, desde la declaracion muerta mas externa
+        dead = set()
+        counted = set()
+        worklist = [s for s, count in uses.items() if count == 0]
+        while worklist:
+            symbol = worklist.pop()
+            if uses[symbol] != 0 or not self._removable_symbol(symbol, owners_by_symbol[symbol]):
+                continue
+            for node in owners_by_symbol[symbol]:
+                if node in dead:
+                    continue
+                dead.add(node)
+                if self._has_dead_ancestor(node, parents, dead):
+                    continue
+                reads = Counter(semantic.owner_reads.get(node, []))
+                for inner in [other for other in counted if self._has_ancestor(other, node, parents)]:
+                    reads.subtract(semantic.owner_reads.get(inner, []))
+                    counted.discard(inner)
+                counted.add(node)
+                for read, count in reads.items():
+                    if count > 0 and read in uses:
+                        uses[read] -= count
+                        if uses[read] == 0:
+                            worklist.append(read)
+        return dead
+
+    def _owner_parents(self, ast_root):
+        # Declaracion (con simbolo) mas cercana que contiene a cada declaracion
+        declared = self.semantic.declared_symbols
+        parents = {}
+        pendientes = [(ast_root, None)] if ast_root is not None else []
+        while pendientes:
+            node, owner = pendientes.pop()
+            if node in declared:
+                parents[node] = owner
+                owner = node
+            pendientes.extend((child, owner) for child in node.hijos)
+        return parents
+
+    @staticmethod
+    def _has_ancestor(node, ancestor, parents):
+        parent = parents.get(node)
+        while parent is not None:
+            if parent is ancestor:
+                return True
+            parent = parents.get(parent)
+        return False
+
+    @staticmethod
+    def _has_dead_ancestor(node, parents, dead):
+        parent = parents.get(node)
+        while parent is not None:
+            if parent in dead:
+                return True
+            parent = parents.get(parent)
+        return False
+
+    def _removable_symbol(self, symbol, nodes):
+        if self.keep_globals and symbol.scope is self.semantic.global_scope:
+            return False
+        if symbol.name in self.semantic.unresolved_names:
+            # Podria usarse antes de su declaracion (hoisting); se conserva por seguridad
+            return False
+        return all(self._removable_node(node) for node in nodes)
+
+    def _removable_node(self, node):
+        if node in self.semantic.unresolved_owners:
+            # Leer un identificador no declarado lanza ReferenceError en tiempo de ejecucion
+            return False
+        if node.tipo == "FunctionDeclaration":
+            return True
+        init = node.hijos[1] if len(node.hijos) > 1 else None
+        return init is None or all(self._is_pure(child) for child in init.hijos)
+
+    def _is_pure(self, node):
+        pendientes = [node]
+        while pendientes:
+            current = pendientes.pop()
+            if current.tipo not in PURE_KINDS:
+                return False
+            pendientes.extend(current.hijos)
+        return True
+
+    def _kind(self, node):
+        return "funcion" if node.tipo == "FunctionDeclaration" else "variable"
+
+    def _copy_without(self, root, removed, outermost):
+        # Copia superficial del arbol sin los nodos eliminados; el AST original no cambia.
+        # En outermost quedan, en orden de aparicion, las declaraciones eliminadas mas externas.
+        if root is None:
+            return None
+        copy_root = self._shallow_copy(root)
+        pendientes = [(root, copy_root)]
+        while pendientes:
+            original, copia = pendientes.pop()
+            for hijo in original.hijos:
+                if hijo in removed:
+                    outermost.append(hijo)
+                    continue
+                hijo_copia = self._shallow_copy(hijo)
+                copia.agregar_hijo(hijo_copia)
+                pendientes.append((hijo, hijo_copia))
+        outermost.sort(key=lambda n: (n.linea or 0, n.columna or 0))
+        return copy_root
+
+    def _shallow_copy(self, node):
+        return NodoAST(node.tipo, node.valor, linea=node.linea, columna=node.columna)
+
+    @staticmethod
+    def format_report(report):
+        lines = []
+        for kind, name, linea in report["removed"]:
+            lines.append(f"Eliminada {kind} '{name}' (linea {linea})")
+        lines.append(
+            f"Instrucciones: {report['instructions_before']} -> {report['instructions_after']} | "
+            f"Bytes: {report['bytes_before']} -> {report['bytes_after']}"
+        )
+        return "\n".join(lines)
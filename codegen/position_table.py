@@ -0,0 +1,96 @@
+from bisect import bisect_right
+
+from .varint import read_varint, write_varint
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+class PositionTable:
+    """Tabla compacta instruccion -> (linea, columna), al estilo de co_linetable de CPython.
+
+    Las instrucciones consecutivas con la misma posicion forman una racha; cada racha
+    se guarda como tres varints: longitud, delta de linea y delta de columna (zigzag).
+    La posicion (0, 0) representa "sin posicion conocida".
+    """
+
+    def __init__(self, data=b""):
+        self.data = bytes(data)
+        self._starts = None
+        self._positions = None
+        self._last_run = 0
+
+    @classmethod
+    def encode(cls, positions):
+        out = bytearray()
+        prev_line = prev_col = 0
+        run_position = None
+        run_length = 0
+        for position in positions:
+            position = position or (0, 0)
+            if position == run_position:
+                run_length += 1
+                continue
+            if run_length:
+                write_varint(out, run_length)
+                write_varint(out, _zigzag(run_position[0] - prev_line))
+                write_varint(out, _zigzag(run_position[1] - prev_col))
+                prev_line, prev_col = run_position
+            run_position = position
+            run_length = 1
+        if run_length:
+            write_varint(out, run_length)
+            write_varint(out, _zigzag(run_position[0] - prev_line))
+            write_varint(out, _zigzag(run_position[1] - prev_col))
+        return cls(out)
+
+    def _decode(self):
+        starts = []
+        positions = []
+        pos = 0
+        index = 0
+        line = col = 0
+        data = self.data
+        while pos < len(data):
+            length, pos = read_varint(data, pos)
+            delta_line, pos = read_varint(data, pos)
+            delta_col, pos = read_varint(data, pos)
+            line += _unzigzag(delta_line)
+            col += _unzigzag(delta_col)
+            starts.append(index)
+            positions.append((line, col))
+            index += length
+        starts.append(index)
+        self._starts = starts
+        self._positions = positions
+
+    def __len__(self):
+        if self._starts is None:
+            self._decode()
+        return self._starts[-1]
+
+    def lookup(self, index):
+        # O(1) amortizado en accesos secuenciales (se recuerda la ultima racha), O(log n) en otro caso
+        if self._starts is None:
+            self._decode()
+        starts = self._starts
+        if not 0 <= index < starts[-1]:
+            raise IndexError(f"Instruccion {index} fuera de la tabla de posiciones")
+        run = self._last_run
+        if not starts[run] <= index < starts[run + 1]:
+            if starts[run + 1] <= index < starts[min(run + 2, len(starts) - 1)]:
+                run += 1
+            else:
+                run = bisect_right(starts, index) - 1
+            self._last_run = run
+        position = self._positions[run]
+        return None if position == (0, 0) else position
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.lookup(index)
@@ -0,0 +1,147 @@
+import ast
+
+from .js_runtime import Console, js_add, js_constant, js_div, js_mod, js_mul, js_neg, js_not, js_pos, js_sub
+
+
+class PythonCodeGenerator:
+    """Backend que traduce el AST a nodos `ast` de Python y los compila a un code object.
+
+    Los operadores con semantica distinta a la de Python (concatenacion con '+',
+    division entre cero, modulo con signo del dividendo) se delegan a funciones de
+    js_runtime; cuando ambos operandos son numericos conocidos se emite la operacion
+    nativa de CPython.
+    """
+
+    HELPERS = {
+        "+": "%add",
+        "-": "%sub",
+        "*": "%mul",
+        "/": "%div",
+        "%": "%mod",
+    }
+    UNARY_HELPERS = {"-": "%neg", "+": "%pos", "!": "%not"}
+    NATIVE_OPS = {"+": ast.Add, "-": ast.Sub, "*": ast.Mult}
+    # Identificadores validos en JS que Python no admite como nombre
+    RESERVED_NAMES = {"None", "True", "False"}
+
+    def __init__(self, filename="<js>"):
+        self.filename = filename
+
+    def generate(self, ast_root):
+        return compile(self.to_module(ast_root), self.filename, "exec")
+
+    def to_module(self, ast_root):
+        body = self._statements(ast_root.hijos if ast_root else [])
+        module = ast.Module(body=body, type_ignores=[])
+        return ast.fix_missing_locations(module)
+
+    def _statements(self, nodes):
+        # Las declaraciones de funcion se elevan (hoisting) al inicio del bloque como en JS
+        functions = [n for n in nodes if n.tipo == "FunctionDeclaration"]
+        others = [n for n in nodes if n.tipo != "FunctionDeclaration"]
+        statements = []
+        for node in functions + others:
+            stmt = self._statement(node)
+            if stmt is not None:
+                statements.append(stmt)
+        return statements
+
+    def _statement(self, node):
+        if node.tipo == "VariableDeclaration":
+            identifier = node.hijos[0].valor if node.hijos else None
+            if not identifier or node.hijos[0].tipo != "Identifier":
+                raise ValueError(f"Declaracion invalida en linea {node.linea}")
+            if len(node.hijos) > 1 and node.hijos[1].hijos:
+                value = self._expression(node.hijos[1].hijos[0])
+            else:
+                value = ast.Constant(None)
+            stmt = ast.Assign(targets=[ast.Name(id=self._name(identifier), ctx=ast.Store())], value=value)
+        elif node.tipo == "ExpressionStatement":
+            stmt = ast.Expr(value=self._expression(node.hijos[0]))
+        elif node.tipo == "FunctionDeclaration":
+            name = node.hijos[0].valor if node.hijos else "anon"
+            block = node.hijos[1].hijos if len(node.hijos) > 1 else []
+            stmt = ast.FunctionDef(
+                name=self._name(name),
+                args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+                body=self._statements(block) or [ast.Pass()],
+                decorator_list=[],
+            )
+        else:
+            raise ValueError(f"Nodo no soportado por el backend Python: {node.tipo}")
+        return self._locate(stmt, node)
+
+    def _expression(self, node):
+        kind = node.tipo
+        if kind == "NumberLiteral":
+            expr = ast.Constant(float(node.valor))
+        elif kind == "StringLiteral":
+            expr = ast.Constant(js_constant(node.valor))
+        elif kind == "Identifier":
+            expr = ast.Name(id=self._name(node.valor), ctx=ast.Load())
+        elif kind == "BinaryExpression" and len(node.hijos) == 2:
+            left, right = node.hijos
+            native = self.NATIVE_OPS.get(node.valor)
+            if native and self._is_number(left) and self._is_number(right):
+                expr = ast.BinOp(left=self._expression(left), op=native(), right=self._expression(right))
+            else:
+                expr = self._helper_call(self.HELPERS[node.valor], [left, right])
+        elif kind == "UnaryExpression" and node.hijos:
+            expr = self._helper_call(self.UNARY_HELPERS[node.valor], node.hijos[:1])
+        elif kind == "MemberExpression" and len(node.hijos) == 2:
+            expr = ast.Attribute(value=self._expression(node.hijos[0]), attr=node.hijos[1].valor, ctx=ast.Load())
+        elif kind == "CallExpression" and node.hijos:
+            args = node.hijos[1].hijos if len(node.hijos) > 1 else []
+            expr = ast.Call(func=self._expression(node.hijos[0]), args=[self._expression(a) for a in args], keywords=[])
+        else:
+            raise ValueError(f"Expresion no soportada por el backend Python: {kind}")
+        return self._locate(expr, node)
+
+    def _helper_call(self, helper, operands):
+        return ast.Call(
+            func=ast.Name(id=helper, ctx=ast.Load()),
+            args=[self._expression(o) for o in operands],
+            keywords=[],
+        )
+
+    def _is_number(self, node):
+        # Inferencia estatica minima: solo literales y operaciones que siempre producen numeros
+        if node.tipo == "NumberLiteral":
+            return True
+        if node.tipo == "UnaryExpression":
+            return node.valor in {"-", "+"}
+        if node.tipo == "BinaryExpression" and len(node.hijos) == 2:
+            if node.valor in {"-", "*", "/", "%"}:
+                return True
+            return self._is_number(node.hijos[0]) and self._is_number(node.hijos[1])
+        return False
+
+    def _name(self, name):
+        return f"%{name}" if name in self.RESERVED_NAMES else name
+
+    def _locate(self, py_node, node):
+        if getattr(node, "linea", None) is not None:
+            py_node.lineno = py_node.end_lineno = node.linea
+            py_node.col_offset = py_node.end_col_offset = max((node.columna or 1) - 1, 0)
+        return py_node
+
+
+def runtime_namespace(stream=None):
+    return {
+        "__builtins__": {},
+        "console": Console(stream),
+        "%add": js_add,
+        "%sub": js_sub,
+        "%mul": js_mul,
+        "%div": js_div,
+        "%mod": js_mod,
+        "%neg": js_neg,
+        "%pos": js_pos,
+        "%not": js_not,
+    }
+
+
+def run_code(code, stream=None):
+    namespace = runtime_namespace(stream)
+    exec(code, namespace)
+    return namespace
@@ -0,0 +1,350 @@
+from .bytecode_generator import BytecodeGenerator, FunctionIndex
+from .js_runtime import BINARY_OPS, builtins_for, js_constant, js_neg, js_not, js_pos
+
+# Operandos: ("t", n) registro virtual, ("r", n) registro fisico, ("s", n) ranura de
+# desbordamiento, ("v", nombre) variable y ("k", literal) constante
+TEMP, REGISTER, SLOT, VARIABLE, CONSTANT = "t", "r", "s", "v", "k"
+UNARY_OPS = {"-": "NEG", "+": "POS", "!": "NOT"}
+CALLS = frozenset({"CALL", "CALL_FUNC", "CALL_BUILTIN"})
+UNDEFINED = (CONSTANT, "undefined")
+
+
+class RegisterIRGenerator:
+    """Segunda bajada del AST: codigo de tres direcciones sobre registros.
+
+    Cada instruccion es una tupla (opcode, destino, operandos, destino_de_llamada): el
+    destino es un registro o una variable y los operandos pueden ser registros,
+    variables o constantes, de modo que `var c = a + b` es una sola instruccion. Los
+    temporales se emiten como registros virtuales y, por unidad de codigo, se asignan
+    con linear scan a un banco de `registers` registros; los que no caben van a
+    ranuras de desbordamiento. Las unidades y la tabla de funciones siguen el mismo
+    esquema que BytecodeGenerator: el programa principal termina en HALT y cada
+    funcion en RETURN.
+    """
+
+    def __init__(self, registers=8, allocate=True):
+        if registers < 1:
+            raise ValueError("El banco necesita al menos un registro")
+        self.registers = registers
+        self.allocate = allocate
+        self.reset()
+
+    def reset(self):
+        self.instructions = []
+        self.function_table = []
+        self.function_index = FunctionIndex()
+        # Funcion cuya unidad se esta bajando (None en el programa principal)
+        self._function = None
+        self.spills = 0
+        self.slots = 0
+        self.registers_used = 0
+        self._unit = []
+        self._temps = 0
+
+    def generate(self, ast_root):
+        self.reset()
+        # Mismo orden, indices y resolucion por ambito que BytecodeGenerator
+        self.function_index = FunctionIndex(ast_root)
+        if ast_root and ast_root.tipo == "Program":
+            for child in ast_root.hijos:
+                self._statement(child)
+        elif ast_root:
+            self._statement(ast_root)
+        self._emit("HALT")
+        self._finish_unit()
+        for name, node in self.function_index.nodes:
+            offset = len(self.instructions)
+            self._function = node
+            if len(node.hijos) > 1:
+                self._statement(node.hijos[1])
+            self._emit("RETURN")
+            self._function = None
+            self._finish_unit()
+            self.function_table.append((name, offset, len(self.instructions) - offset))
+        return self.instructions
+
+    def _emit(self, opcode, dest=None, operands=(), target=None):
+        self._unit.append((opcode, dest, operands, target))
+
+    def _temp(self):
+        self._temps += 1
+        return (TEMP, self._temps - 1)
+
+    def _statement(self, node):
+        kind = node.tipo
+        if kind in ("Program", "Block"):
+            for child in node.hijos:
+                self._statement(child)
+        elif kind == "FunctionDeclaration":
+            # El cuerpo se baja como unidad propia en generate
+            return
+        elif kind == "VariableDeclaration":
+            identifier = node.hijos[0].valor if node.hijos else None
+            if not identifier or node.hijos[0].tipo != "Identifier":
+                raise ValueError(f"Declaracion invalida en linea {node.linea}")
+            dest = (VARIABLE, identifier)
+            if len(node.hijos) > 1 and node.hijos[1].hijos:
+                self._expression(node.hijos[1].hijos[0], dest)
+            else:
+                self._emit("MOV", dest, (UNDEFINED,))
+        elif kind == "ExpressionStatement" and node.hijos:
+            expression = node.hijos[0]
+            if expression.tipo == "CallExpression":
+                # El resultado descartado no ocupa registro (equivale al POP de la pila)
+                self._call(expression, None)
+            else:
+                self._expression(expression)
+        else:
+            raise ValueError(f"Nodo no soportado por el backend de registros: {kind}")
+
+    def _expression(self, node, dest=None):
+        # Devuelve el operando con el valor; si se pasa dest, el valor queda escrito alli
+        kind = node.tipo
+        if kind == "NumberLiteral" or kind == "StringLiteral":
+            value = (CONSTANT, node.valor)
+        elif kind == "Identifier":
+            value = (VARIABLE, node.valor)
+        elif kind == "BinaryExpression" and len(node.hijos) == 2 and node.valor in BytecodeGenerator.BIN_OP_MAP:
+            # Las funciones solo escriben variables locales, asi que leer una variable
+            # despues de evaluar el otro operando no cambia el resultado
+            left = self._expression(node.hijos[0])
+            right = self._expression(node.hijos[1])
+            dest = dest or self._temp()
+            self._emit(BytecodeGenerator.BIN_OP_MAP[node.valor], dest, (left, right))
+            return dest
+        elif kind == "UnaryExpression" and node.hijos and node.valor in UNARY_OPS:
+            operand = self._expression(node.hijos[0])
+            dest = dest or self._temp()
+            self._emit(UNARY_OPS[node.valor], dest, (operand,))
+            return dest
+        elif kind == "CallExpression" and node.hijos:
+            return self._call(node, dest or self._temp())
+        else:
+            raise ValueError(f"Expresion no soportada por el backend de registros: {kind}")
+        if dest is not None:
+            self._emit("MOV", dest, (value,))
+            return dest
+        return value
+
+    def _call(self, node, dest):
+        args_node = node.hijos[1] if len(node.hijos) > 1 else None
+        args = tuple(self._expression(arg) for arg in args_node.hijos) if args_node else ()
+        callee = node.hijos[0]
+        target = self._call_target(callee)
+        index = self.function_index.resolve(target, self._function) if callee.tipo == "Identifier" else None
+        if target in BytecodeGenerator.BUILTIN_CALLS:
+            self._emit("CALL_BUILTIN", dest, args, BytecodeGenerator.BUILTINS.index(target))
+        elif index is not None:
+            self._emit("CALL_FUNC", dest, args, index)
+        else:
+            self._emit("CALL", dest, args, target)
+        return dest
+
+    def _call_target(self, node):
+        parts = []
+        while node is not None and node.tipo == "MemberExpression":
+            parts.append(node.hijos[1].valor if len(node.hijos) > 1 else "")
+            node = node.hijos[0] if node.hijos else None
+        if node is None or node.tipo != "Identifier":
+            return "anon"
+        parts.append(node.valor)
+        return ".".join(reversed(parts))
+
+    def _finish_unit(self):
+        unit = self._unit
+        if self.allocate:
+            unit = self._linear_scan(unit)
+        self.instructions.extend(unit)
+        self._unit = []
+        self._temps = 0
+
+    def _linear_scan(self, unit):
+        # Intervalos [definicion, ultimo uso] de cada registro virtual
+        start, end = {}, {}
+        for index, (_, dest, operands, _) in enumerate(unit):
+            for operand in operands:
+                if operand[0] == TEMP:
+                    end[operand] = index
+            if dest is not None and dest[0] == TEMP:
+                start.setdefault(dest, index)
+                end.setdefault(dest, index)
+        assignment = {}
+        free = list(range(self.registers - 1, -1, -1))
+        active = []
+        slots = 0
+        for temp in sorted(start, key=start.get):
+            position = start[temp]
+            # Un registro cuyo ultimo uso es esta misma instruccion se puede reutilizar como
+            # destino: los operandos se leen antes de escribir el resultado
+            still_active = []
+            for other in active:
+                if end[other] <= position:
+                    free.append(assignment[other][1])
+                else:
+                    still_active.append(other)
+            active = still_active
+            if free:
+                assignment[temp] = (REGISTER, free.pop())
+                self.registers_used = max(self.registers_used, self.registers - len(free))
+            else:
+                # Sin registros libres se desborda el intervalo que termina mas tarde
+                victim = max(active, key=end.get)
+                if end[victim] > end[temp]:
+                    assignment[temp] = assignment[victim]
+                    assignment[victim] = (SLOT, slots)
+                    active.remove(victim)
+                else:
+                    assignment[temp] = (SLOT, slots)
+                slots += 1
+                self.spills += 1
+                if assignment[temp][0] == SLOT:
+                    continue
+            active.append(temp)
+        self.slots = max(self.slots, slots)
+        rewrite = assignment.get
+        return [
+            (
+                opcode,
+                rewrite(dest, dest),
+                tuple(rewrite(operand, operand) for operand in operands),
+                target,
+            )
+            for opcode, dest, operands, target in unit
+        ]
+
+    def dump(self):
+        # Listado textual: una instruccion por linea, con la tabla de funciones como comentario
+        entries = {offset: name for name, offset, _ in self.function_table}
+        functions = [name for name, _, _ in self.function_table]
+        width = len(str(max(len(self.instructions) - 1, 0)))
+        lines = ["; <main>"]
+        for index, (opcode, dest, operands, target) in enumerate(self.instructions):
+            if index in entries:
+                lines.append(f"; funcion {entries[index]}")
+            text = opcode
+            if opcode in CALLS:
+                if opcode == "CALL_BUILTIN":
+                    name = BytecodeGenerator.BUILTINS[target]
+                elif opcode == "CALL_FUNC":
+                    name = f"#{target} {functions[target]}" if target < len(functions) else f"#{target}"
+                else:
+                    name = target
+                text = f"{opcode} {name}({', '.join(map(format_operand, operands))})"
+            elif operands:
+                text = f"{opcode} {', '.join(map(format_operand, operands))}"
+            if dest is not None:
+                text = f"{format_operand(dest)} = {text}"
+            lines.append(f"{index:>{width}}  {text}")
+        return "\n".join(lines)
+
+
+def format_operand(operand):
+    kind, value = operand
+    if kind == TEMP:
+        return f"%t{value}"
+    if kind == REGISTER:
+        return f"%r{value}"
+    if kind == SLOT:
+        return f"[s{value}]"
+    return str(value)
+
+
+class RegisterVM:
+    """Interprete de referencia para el codigo de RegisterIRGenerator (con registros asignados)."""
+
+    UNARY = {"NEG": js_neg, "POS": js_pos, "NOT": js_not}
+
+    def __init__(self, stream=None):
+        self.builtins = builtins_for(stream)
+        self.builtin_table = [self.builtins[name] for name in BytecodeGenerator.BUILTINS]
+        self.globals = {}
+        self.units = []
+        self.functions = {}
+
+    def run(self, instructions, function_table=(), registers=8):
+        self.globals = {}
+        # Las constantes se convierten una sola vez, como hace StackVM.load
+        code = [
+            (opcode, dest, tuple((kind, js_constant(value)) if kind == CONSTANT else (kind, value)
+                                 for kind, value in operands), target)
+            for opcode, dest, operands, target in instructions
+        ]
+        self.registers = registers
+        self.units = [code[offset:offset + length] for _, offset, length in function_table]
+        self.functions = {name: self.units[i] for i, (name, _, _) in enumerate(function_table)}
+        main_end = next((i for i, entry in enumerate(code) if entry[0] == "HALT"), len(code))
+        self._execute(code[:main_end], None)
+        return self.globals
+
+    def _execute(self, code, local_vars):
+        registers = [None] * self.registers
+        slots = {}
+        global_vars = self.globals
+
+        def read(operand):
+            kind, value = operand
+            if kind == REGISTER:
+                return registers[value]
+            if kind == CONSTANT:
+                return value
+            if kind == SLOT:
+                return slots[value]
+            if kind == VARIABLE:
+                if local_vars is not None and value in local_vars:
+                    return local_vars[value]
+                if value in global_vars:
+                    return global_vars[value]
+                raise NameError(f"{value} is not defined")
+            raise ValueError(f"Registro virtual sin asignar: {format_operand(operand)}")
+
+        for opcode, dest, operands, target in code:
+            if opcode == "RETURN" or opcode == "HALT":
+                break
+            if opcode == "MOV":
+                result = read(operands[0])
+            elif opcode in CALLS:
+                result = self._call(opcode, target, [read(operand) for operand in operands])
+            elif opcode in self.UNARY:
+                result = self.UNARY[opcode](read(operands[0]))
+            else:
+                result = BINARY_OPS[opcode](read(operands[0]), read(operands[1]))
+            if dest is None:
+                continue
+            kind, value = dest
+            if kind == REGISTER:
+                registers[value] = result
+            elif kind == SLOT:
+                slots[value] = result
+            elif local_vars is not None:
+                local_vars[value] = result
+            else:
+                global_vars[value] = result
+
+    def _call(self, opcode, target, args):
+        if opcode == "CALL_BUILTIN":
+            return self.builtin_table[target](*args)
+        if opcode == "CALL_FUNC":
+            self._execute(self.units[target], {})
+            return None
+        builtin = self.builtins.get(target)
+        if builtin is not None:
+            return builtin(*args)
+        body = self.functions.get(target)
+        if body is None:
+            raise NameError(f"{target} is not defined")
+        self._execute(body, {})
+        return None
+
+
+if __name__ == "__main__":
+    import sys
+
+    from lexer.lexer import Lexer
+    from parser.parser import Parser
+
+    with open(sys.argv[1] if len(sys.argv) > 1 else "samples/ejemplo.js", "r", encoding="utf-8") as f:
+        arbol = Parser(Lexer(f.read()).analizar()).parsear()
+    generator = RegisterIRGenerator()
+    generator.generate(arbol)
+    print(generator.dump())
+    print(f"\nRegistros usados: {generator.registers_used} de {generator.registers}, desbordamientos: {generator.spills}")
@@ -0,0 +1,90 @@
+from .bytecode_generator import BytecodeGenerator
+from .js_runtime import BINARY_OPS, builtins_for, js_constant
+
+
+class StackVM:
+    """Interprete de referencia para las instrucciones de BytecodeGenerator (binary=False)."""
+
+    def __init__(self, stream=None):
+        self.builtins = builtins_for(stream)
+        self.builtin_table = [self.builtins[name] for name in BytecodeGenerator.BUILTINS]
+        self.globals = {}
+        self.units = []
+        self.functions = {}
+
+    def load(self, instructions, function_table=()):
+        # Pre-decodifica constantes y operandos de CALL y separa las unidades de codigo:
+        # el programa principal termina en HALT y cada funcion ocupa su rango de la tabla
+        code = []
+        for opcode, operand in instructions:
+            if opcode == "COMMENT":
+                operand = None
+            elif opcode == "PUSH_CONST":
+                operand = js_constant(operand)
+            elif opcode == "CALL":
+                target, _, argc = str(operand).rpartition(":")
+                operand = (target, int(argc))
+            code.append((opcode, operand))
+        self.units = [code[offset:offset + length] for _, offset, length in function_table]
+        self.functions = {name: self.units[i] for i, (name, _, _) in enumerate(function_table)}
+        main_end = next((i for i, (opcode, _) in enumerate(code) if opcode == "HALT"), len(code))
+        return code[:main_end]
+
+    def run(self, instructions, function_table=()):
+        self.globals = {}
+        main = self.load(instructions, function_table)
+        self._execute(main, None)
+        return self.globals
+
+    def _execute(self, code, local_vars):
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        global_vars = self.globals
+        for opcode, operand in code:
+            if opcode == "LOAD_VAR":
+                if local_vars is not None and operand in local_vars:
+                    push(local_vars[operand])
+                elif operand in global_vars:
+                    push(global_vars[operand])
+                else:
+                    raise NameError(f"{operand} is not defined")
+            elif opcode == "PUSH_CONST":
+                push(operand)
+            elif opcode == "STORE_VAR":
+                if local_vars is not None:
+                    local_vars[operand] = pop()
+                else:
+                    global_vars[operand] = pop()
+            elif opcode == "POP":
+                pop()
+            elif opcode == "CALL_BUILTIN" or opcode == "CALL_FUNC" or opcode == "CALL":
+                target, argc = operand
+                args = stack[len(stack) - argc:] if argc else []
+                del stack[len(stack) - argc:]
+                push(self._call(opcode, target, args))
+            elif opcode == "RETURN" or opcode == "HALT":
+                break
+            elif opcode == "COMMENT":
+                continue
+            else:
+                right = pop()
+                left = pop()
+                push(BINARY_OPS[opcode](left, right))
+        return stack
+
+    def _call(self, opcode, target, args):
+        if opcode == "CALL_BUILTIN":
+            return self.builtin_table[target](*args)
+        if opcode == "CALL_FUNC":
+            self._execute(self.units[target], {})
+            return None
+        # CALL por nombre: destino que no se pudo resolver en compilacion
+        builtin = self.builtins.get(target)
+        if builtin is not None:
+            return builtin(*args)
+        body = self.functions.get(target)
+        if body is None:
+            raise NameError(f"{target} is not defined")
+        self._execute(body, {})
+        return None
@@ -0,0 +1,21 @@
+# Enteros sin signo LEB128: 7 bits por byte, el bit alto indica que sigue otro byte.
+# Los comparten la tabla de posiciones y la codificacion compacta
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
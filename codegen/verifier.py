@@ -0,0 +1,197 @@
+from .bytecode_generator import BytecodeGenerator
+
+
+class VerificationError(ValueError):
+    """El flujo de bytecode no es valido (opcode desconocido, pila insuficiente, etc.)."""
+
+    def __init__(self, errors):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+class BytecodeVerifier:
+    """Verificador de una sola pasada para la salida binaria de BytecodeGenerator.
+
+    Decodifica cada instruccion, simula la profundidad de la pila y calcula la
+    profundidad maxima por unidad de codigo: el programa principal ("<main>", que
+    termina en HALT) y cada funcion de la tabla de funciones (terminada en RETURN).
+    """
+
+    MAIN_REGION = "<main>"
+    FIXED_EFFECTS = {
+        "PUSH_CONST": (0, 1),
+        "LOAD_VAR": (0, 1),
+        "STORE_VAR": (1, 0),
+        "ADD": (2, 1),
+        "SUB": (2, 1),
+        "MUL": (2, 1),
+        "DIV": (2, 1),
+        "MOD": (2, 1),
+        "POP": (1, 0),
+        "COMMENT": (0, 0),
+        "RETURN": (0, 0),
+        "HALT": (0, 0),
+    }
+    OPERAND_REQUIRED = {"PUSH_CONST", "LOAD_VAR", "STORE_VAR", "CALL", "CALL_FUNC", "CALL_BUILTIN", "COMMENT"}
+    INDEXED_CALLS = {"CALL_FUNC", "CALL_BUILTIN"}
+    REGION_END = {"HALT", "RETURN"}
+
+    def __init__(self, opcodes=None, builtins=None):
+        opcodes = opcodes or BytecodeGenerator.OPCODES
+        self.mnemonics = {bits: name for name, bits in opcodes.items()}
+        self.builtins = builtins or BytecodeGenerator.BUILTINS
+
+    def decode(self, lines, symbol_ids):
+        # Convierte las lineas "opcode operando" en tuplas (mnemonico, operando resuelto)
+        names = {value: key for key, value in symbol_ids.items()}
+        argc_mask = (1 << BytecodeGenerator.ARGC_BITS) - 1
+        decoded = []
+        errors = []
+        for index, line in enumerate(lines):
+            parts = line.split()
+            if len(parts) != 2 or len(parts[0]) != 8 or len(parts[1]) != BytecodeGenerator.OPERAND_BITS:
+                errors.append(f"Instruccion {index}: formato invalido '{line}'")
+                decoded.append((None, None))
+                continue
+            mnemonic = self.mnemonics.get(parts[0])
+            if mnemonic is None:
+                errors.append(f"Instruccion {index}: opcode desconocido {parts[0]}")
+            try:
+                operand_id = int(parts[1], 2)
+            except ValueError:
+                errors.append(f"Instruccion {index}: operando no binario '{parts[1]}'")
+                decoded.append((mnemonic, None))
+                continue
+            operand = None
+            if mnemonic in self.INDEXED_CALLS:
+                operand = (operand_id >> BytecodeGenerator.ARGC_BITS, operand_id & argc_mask)
+            elif operand_id:
+                operand = names.get(operand_id)
+                if operand is None:
+                    errors.append(f"Instruccion {index}: operando {operand_id} sin simbolo asociado")
+            decoded.append((mnemonic, operand))
+        return decoded, errors
+
+    def verify(self, lines, symbol_ids, function_table=None):
+        decoded, errors = self.decode(lines, symbol_ids)
+        max_depth, region_errors = self.analyze(decoded, function_table)
+        return {"ok": not errors and not region_errors, "max_depth": max_depth, "errors": errors + region_errors}
+
+    def verify_or_raise(self, lines, symbol_ids, function_table=None):
+        result = self.verify(lines, symbol_ids, function_table)
+        if not result["ok"]:
+            raise VerificationError(result["errors"])
+        return result["max_depth"]
+
+    def analyze(self, instructions, function_table=None):
+        # Simulacion lineal de la profundidad de pila sobre tuplas (mnemonico, operando)
+        errors = []
+        entries = {offset: name for name, offset, _ in function_table or []}
+        function_count = len(function_table) if function_table is not None else None
+        max_depth = {}
+        region = None
+        depth = 0
+        for index, (opcode, operand) in enumerate(instructions):
+            if region is None:
+                if index == 0:
+                    region = self.MAIN_REGION
+                else:
+                    region = entries.pop(index, None) or f"<funcion@{index}>"
+                    if function_table is not None and region.startswith("<funcion@"):
+                        errors.append(f"Instruccion {index}: codigo fuera de cualquier unidad de la tabla de funciones")
+                max_depth[region] = 0
+                depth = 0
+            if opcode is None:
+                continue
+            if opcode in self.OPERAND_REQUIRED and operand is None:
+                errors.append(f"Instruccion {index}: {opcode} requiere operando")
+                continue
+            if opcode in self.INDEXED_CALLS:
+                target, pops = operand
+                limit = len(self.builtins) if opcode == "CALL_BUILTIN" else function_count
+                if limit is not None and target >= limit:
+                    errors.append(f"Instruccion {index}: {opcode} con indice {target} fuera de la tabla")
+                pushes = 1
+            elif opcode == "CALL":
+                target, _, argc = str(operand).rpartition(":")
+                if not target or not argc.isdigit():
+                    errors.append(f"Instruccion {index}: operando de CALL invalido '{operand}'")
+                    continue
+                pops, pushes = int(argc), 1
+            else:
+                effect = self.FIXED_EFFECTS.get(opcode)
+                if effect is None:
+                    errors.append(f"Instruccion {index}: opcode no soportado {opcode}")
+                    continue
+                pops, pushes = effect
+            if depth < pops:
+                errors.append(
+                    f"Instruccion {index}: {opcode} necesita {pops} valores y la pila tiene {depth} "
+                    f"(region '{region}')"
+                )
+                depth = 0
+            else:
+                depth -= pops
+            depth += pushes
+            if depth > max_depth[region]:
+                max_depth[region] = depth
+            if opcode in self.REGION_END:
+                if depth:
+                    errors.append(f"Instruccion {index}: la region '{region}' termina con {depth} valores en la pila")
+                if (opcode == "HALT") != (region == self.MAIN_REGION):
+                    errors.append(f"Instruccion {index}: {opcode} no corresponde a la region '{region}'")
+                region = None
+        if region is not None:
+            errors.append(f"La region '{region}' no termina en HALT/RETURN")
+        for offset, name in entries.items():
+            errors.append(f"La funcion '{name}' (desplazamiento {offset}) no inicia una unidad de codigo")
+        return max_depth, errors
+
+    def disassemble(self, lines, symbol_ids, function_table=None, positions=None):
+        decoded, errors = self.decode(lines, symbol_ids)
+        if errors:
+            raise VerificationError(errors)
+        functions = [name for name, _, _ in function_table or []]
+        entries = {offset: name for name, offset, _ in function_table or []}
+        width = len(str(max(len(decoded) - 1, 0)))
+        listing = []
+        for index, (opcode, operand) in enumerate(decoded):
+            if index in entries:
+                listing.append(f"; funcion {entries[index]}")
+            if positions is not None:
+                position = positions.lookup(index)
+                if position is not None and (index == 0 or position != positions.lookup(index - 1)):
+                    listing.append(f"; linea {position[0]}, columna {position[1]}")
+            if opcode in self.INDEXED_CALLS:
+                target, argc = operand
+                names = self.builtins if opcode == "CALL_BUILTIN" else functions
+                name = names[target] if target < len(names) else "?"
+                listing.append(f"{index:>{width}}  {opcode:<13}#{target} {name}:{argc}")
+            elif opcode == "COMMENT":
+                listing.append(f"{index:>{width}}  ; {operand}")
+            elif operand is None:
+                listing.append(f"{index:>{width}}  {opcode}")
+            else:
+                listing.append(f"{index:>{width}}  {opcode:<13}{operand}")
+        return listing
+
+
+if __name__ == "__main__":
+    import sys
+
+    from lexer.lexer import Lexer
+    from parser.parser import Parser
+
+    with open(sys.argv[1] if len(sys.argv) > 1 else "samples/ejemplo.js", "r", encoding="utf-8") as f:
+        arbol = Parser(Lexer(f.read()).analizar()).parsear()
+    generator = BytecodeGenerator()
+    binary = generator.generate(arbol)
+    verifier = BytecodeVerifier()
+    table = generator.position_table()
+    for line in verifier.disassemble(binary, generator.symbol_ids, generator.function_table, table):
+        print(line)
+    result = verifier.verify(binary, generator.symbol_ids, generator.function_table)
+    print("\nProfundidad maxima de pila:", result["max_depth"])
+    print(f"Tabla de posiciones: {len(table.data)} bytes para {len(binary)} instrucciones")
+    for error in result["errors"]:
+        print(error)
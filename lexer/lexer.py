@@ -1,10 +1,58 @@
+import re
+import sys
+
+# Nota: lenguaje objetivo JavaScript (subconjunto): palabras clave, identificadores,
+# números, strings, operadores y signos de puntuación comunes.
+PATRONES = {
+    "WHITESPACE": re.compile(r"\s+"),
+    "LINE_COMMENT": re.compile(r"//.*"),
+    "BLOCK_COMMENT_START": re.compile(r"/\*"),
+    "BLOCK_COMMENT_END": re.compile(r"\*/"),
+    "STRING": re.compile(r"'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\""),
+    "NUMBER": re.compile(r"(?:0|[1-9][0-9]*)(?:\.[0-9]+)?"),
+    "IDENT": re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*"),
+    # Operadores multi-caracter primero para hacer backtracking mínimo en analizar()
+    "OP": re.compile(r"===|!==|==|!=|<=|>=|&&|\|\||\+\+|--"),
+    "PUNCT": re.compile(r"[=;:,(){}\[\].+\-*/%<>!]")
+}
+
+# Palabras clave soportadas
+PALABRAS_CLAVE = frozenset({
+    "var", "let", "const", "function", "return", "if", "else", "while", "for",
+    "true", "false", "null"
+})
+
+OPERADORES = ("===", "!==", "==", "!=", "<=", ">=", "&&", "||", "++", "--")
+PUNTUADORES = tuple("=;:,(){}[].+-*/%<>!")
+
+# Codigos enteros de token: las categorias sin lexema fijo tienen un codigo propio y
+# cada palabra clave, operador y puntuador tiene el suyo, de modo que el parser
+# compara enteros en lugar de pares (tipo, valor)
+T_EOF, T_IDENT, T_NUMBER, T_STRING, T_ERROR = range(5)
+CODIGOS = {"EOF": T_EOF, "IDENT": T_IDENT, "NUMBER": T_NUMBER, "STRING": T_STRING, "ERROR": T_ERROR}
+CATEGORIAS = ["EOF", "IDENT", "NUMBER", "STRING", "ERROR"]
+for _categoria, _lexemas in (("KEYWORD", sorted(PALABRAS_CLAVE)), ("OP", OPERADORES), ("PUNCT", PUNTUADORES)):
+    for _lexema in _lexemas:
+        CODIGOS[_lexema] = len(CATEGORIAS)
+        CATEGORIAS.append(_categoria)
+CATEGORIAS = tuple(CATEGORIAS)
+
+
+def codigo_token(tipo, valor):
+    if tipo in ("KEYWORD", "OP", "PUNCT"):
+        return CODIGOS[valor]
+    return CODIGOS.get(tipo, T_ERROR)
+
+
 class Token:
-    def __init__(self, tipo, valor, linea, columna):
+    def __init__(self, tipo, valor, linea, columna, kind=None):
         # Inicializa el tipo de token, su valor, y posición en el código fuente
         self.tipo = tipo
         self.valor = valor
         self.linea = linea
         self.columna = columna
+        # Codigo entero del token (ver CODIGOS)
+        self.kind = codigo_token(tipo, valor) if kind is None else kind
 
     def __str__(self):
         # Retorna una representación legible del token
@@ -14,47 +62,47 @@ class Token:
 class Lexer:
     def __init__(self, codigo_fuente):
         # Recibe el código fuente como cadena
+        self.patrones = self.definir_patrones()
+        # Punto de control cooperativo opcional: checkpoint(fase, procesados, parcial)
+        self.checkpoint = None
+        self.reset(codigo_fuente)
+
+    def reset(self, codigo_fuente):
+        # Prepara la instancia para analizar otra fuente; la lista de tokens anterior
+        # no se reutiliza porque ya pertenece a quien la recibio
         self.codigo_fuente = codigo_fuente
         self.longitud = len(codigo_fuente)
         self.indice = 0
         self.linea = 1
         self.columna = 1
         self.tokens = []
-        self.patrones = self.definir_patrones()
 
     def definir_patrones(self):
-        # Define los patrones regex para cada tipo de token
-        import re
-        # Nota: lenguaje objetivo JavaScript (subconjunto): palabras clave, identificadores,
-        # números, strings, operadores y signos de puntuación comunes.
-        patrones = {
-            "WHITESPACE": re.compile(r"\s+"),
-            "LINE_COMMENT": re.compile(r"//.*"),
-            "BLOCK_COMMENT_START": re.compile(r"/\*"),
-            "BLOCK_COMMENT_END": re.compile(r"\*/"),
-            "STRING": re.compile(r"'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\""),
-            "NUMBER": re.compile(r"(?:0|[1-9][0-9]*)(?:\.[0-9]+)?"),
-            "IDENT": re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*"),
-            # Operadores multi-caracter primero para hacer backtracking mínimo en analizar()
-            "OP": re.compile(r"===|!==|==|!=|<=|>=|&&|\|\||\+\+|--"),
-            "PUNCT": re.compile(r"[=;:,(){}\[\].+\-*/%<>!]")
-        }
-        # Palabras clave soportadas
-        self.palabras_clave = {
-            "var", "let", "const", "function", "return", "if", "else", "while", "for",
-            "true", "false", "null"
-        }
-        return patrones
+        # Los patrones y palabras clave se compilan una sola vez por proceso y se comparten
+        self.palabras_clave = PALABRAS_CLAVE
+        return PATRONES
 
     def analizar(self):
         # Aplica los patrones regex al código fuente para generar la lista de tokens
-        import re
+        tokens = self.tokens
+        for token in self.iterar():
+            tokens.append(token)
+        return tokens
+
+    def iterar(self):
+        # Produce los tokens uno a uno sin acumularlos (analizar() los guarda en self.tokens)
+        codigo = self.codigo_fuente
+        patrones = self.patrones
+        pasos = 0
         while self.indice < self.longitud:
+            pasos += 1
+            if self.checkpoint is not None and not pasos & 0xFF:
+                self.checkpoint("lexer", len(self.tokens), self.tokens)
             inicio_linea = self.linea
             inicio_columna = self.columna
 
             # Espacios en blanco
-            m = self.patrones["WHITESPACE"].match(self.codigo_fuente, self.indice)
+            m = patrones["WHITESPACE"].match(codigo, self.indice)
             if m:
                 texto = m.group(0)
                 saltos = texto.count("\n")
@@ -67,7 +115,7 @@ class Lexer:
                 continue
 
             # Detección de string no cerrado: si el caracter actual es comilla pero no matchea STRING
-            c_actual = self.codigo_fuente[self.indice]
+            c_actual = codigo[self.indice]
             if c_actual in ("'", '"'):
                 # Intentamos encontrar el cierre respetando escapes simples
                 comilla = c_actual
@@ -75,7 +123,7 @@ class Lexer:
                 escapado = False
                 cerrado = False
                 while i < self.longitud:
-                    ch = self.codigo_fuente[i]
+                    ch = codigo[i]
                     if ch == "\n" and not escapado:
                         break
                     if escapado:
@@ -88,15 +136,15 @@ class Lexer:
                     i += 1
                 if not cerrado:
                     # String no cerrado: emitimos error y avanzamos hasta fin de línea o EOF
-                    self.tokens.append(Token("ERROR", "STRING_NO_CERRADA", inicio_linea, inicio_columna))
+                    yield Token("ERROR", "STRING_NO_CERRADA", inicio_linea, inicio_columna, T_ERROR)
                     # Avanzamos hasta fin de línea o EOF actualizando líneas/columnas
-                    while self.indice < self.longitud and self.codigo_fuente[self.indice] != "\n":
+                    while self.indice < self.longitud and codigo[self.indice] != "\n":
                         self.indice += 1
                         self.columna += 1
                     continue
 
             # Comentario de línea
-            m = self.patrones["LINE_COMMENT"].match(self.codigo_fuente, self.indice)
+            m = patrones["LINE_COMMENT"].match(codigo, self.indice)
             if m:
                 texto = m.group(0)
                 self.indice = m.end()
@@ -104,14 +152,14 @@ class Lexer:
                 continue
 
             # Comentario de bloque
-            m = self.patrones["BLOCK_COMMENT_START"].match(self.codigo_fuente, self.indice)
+            m = patrones["BLOCK_COMMENT_START"].match(codigo, self.indice)
             if m:
                 self.indice = m.end()
                 self.columna += 2
-                fin = self.patrones["BLOCK_COMMENT_END"].search(self.codigo_fuente, self.indice)
+                fin = patrones["BLOCK_COMMENT_END"].search(codigo, self.indice)
                 if not fin:
                     # Comentario de bloque no cerrado: consumimos hasta el final
-                    resto = self.codigo_fuente[self.indice:]
+                    resto = codigo[self.indice:]
                     self.linea += resto.count("\n")
                     if "\n" in resto:
                         self.columna = 1 + len(resto.rsplit("\n", 1)[-1])
@@ -119,7 +167,7 @@ class Lexer:
                         self.columna += len(resto)
                     self.indice = self.longitud
                     continue
-                bloque = self.codigo_fuente[self.indice:fin.end()]
+                bloque = codigo[self.indice:fin.end()]
                 saltos = bloque.count("\n")
                 self.linea += saltos
                 if saltos:
@@ -130,62 +178,78 @@ class Lexer:
                 continue
 
             # Cadenas
-            m = self.patrones["STRING"].match(self.codigo_fuente, self.indice)
+            m = patrones["STRING"].match(codigo, self.indice)
             if m:
                 valor = m.group(0)
-                self.tokens.append(Token("STRING", valor, inicio_linea, inicio_columna))
+                yield Token("STRING", valor, inicio_linea, inicio_columna, T_STRING)
                 self.indice = m.end()
                 avance = len(valor)
                 self.columna += avance
                 continue
 
             # Números
-            m = self.patrones["NUMBER"].match(self.codigo_fuente, self.indice)
+            m = patrones["NUMBER"].match(codigo, self.indice)
             if m:
                 valor = m.group(0)
-                self.tokens.append(Token("NUMBER", valor, inicio_linea, inicio_columna))
+                yield Token("NUMBER", valor, inicio_linea, inicio_columna, T_NUMBER)
                 self.indice = m.end()
                 self.columna += len(valor)
                 continue
 
             # Identificadores y palabras clave
-            m = self.patrones["IDENT"].match(self.codigo_fuente, self.indice)
+            m = patrones["IDENT"].match(codigo, self.indice)
             if m:
-                lexema = m.group(0)
-                tipo = "KEYWORD" if lexema in self.palabras_clave else "IDENT"
-                self.tokens.append(Token(tipo, lexema, inicio_linea, inicio_columna))
+                # Los identificadores se internan: lexemas repetidos comparten un unico str
+                lexema = sys.intern(m.group(0))
+                if lexema in self.palabras_clave:
+                    yield Token("KEYWORD", lexema, inicio_linea, inicio_columna, CODIGOS[lexema])
+                else:
+                    yield Token("IDENT", lexema, inicio_linea, inicio_columna, T_IDENT)
                 self.indice = m.end()
                 self.columna += len(lexema)
                 continue
 
             # Operadores multi-caracter
-            m = self.patrones["OP"].match(self.codigo_fuente, self.indice)
+            m = patrones["OP"].match(codigo, self.indice)
             if m:
                 op = m.group(0)
-                self.tokens.append(Token("OP", op, inicio_linea, inicio_columna))
+                yield Token("OP", op, inicio_linea, inicio_columna, CODIGOS[op])
                 self.indice = m.end()
                 self.columna += len(op)
                 continue
 
             # Puntuación y operadores de un solo caracter
-            m = self.patrones["PUNCT"].match(self.codigo_fuente, self.indice)
+            m = patrones["PUNCT"].match(codigo, self.indice)
             if m:
                 simbolo = m.group(0)
-                self.tokens.append(Token("PUNCT", simbolo, inicio_linea, inicio_columna))
+                yield Token("PUNCT", simbolo, inicio_linea, inicio_columna, CODIGOS[simbolo])
                 self.indice = m.end()
                 self.columna += len(simbolo)
                 continue
 
             # Caracter inesperado
-            caracter = self.codigo_fuente[self.indice]
-            self.tokens.append(Token("ERROR", caracter, inicio_linea, inicio_columna))
+            caracter = codigo[self.indice]
+            yield Token("ERROR", caracter, inicio_linea, inicio_columna, T_ERROR)
             self.indice += 1
             self.columna += 1
 
         # Fin de archivo
-        self.tokens.append(Token("EOF", "", self.linea, self.columna))
-        return self.tokens
+        yield Token("EOF", "", self.linea, self.columna, T_EOF)
 
     def mostrar_tokens(self):
         # Imprime o retorna la lista de tokens generados
         return [str(t) for t in self.tokens]
+
+    def exportar_columnas(self):
+        return tokens_a_columnas(self.tokens)
+
+
+def tokens_a_columnas(tokens):
+    # Exporta los tokens en formato columnar (dict de listas) para alimentar
+    # directamente un DataFrame sin construir un dict por token
+    return {
+        "Tipo": [t.tipo for t in tokens],
+        "Valor": [t.valor for t in tokens],
+        "Linea": [t.linea for t in tokens],
+        "Columna": [t.columna for t in tokens],
+    }
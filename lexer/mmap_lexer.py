@@ -0,0 +1,216 @@
+import mmap
+import re
+import sys
+
+from lexer.lexer import CODIGOS, PALABRAS_CLAVE, PATRONES, T_EOF, T_ERROR, T_IDENT, T_NUMBER, T_STRING, Lexer, Token
+
+# Los mismos patrones sobre bytes. \s en bytes solo cubre ASCII: se añaden los
+# separadores \x1c-\x1f, que str.isspace() tambien acepta; los espacios no ASCII se
+# tratan aparte al decodificar el caracter
+PATRONES_BYTES = {nombre: re.compile(patron.pattern.encode("ascii")) for nombre, patron in PATRONES.items()}
+PATRONES_BYTES["WHITESPACE"] = re.compile(rb"[ \t\n\r\f\v\x1c-\x1f]+")
+
+PALABRAS_CLAVE_BYTES = {palabra.encode("ascii"): palabra for palabra in PALABRAS_CLAVE}
+SIMBOLOS_BYTES = {lexema.encode("ascii"): lexema for lexema in CODIGOS if not lexema.isalpha()}
+
+COMILLAS = (ord("'"), ord('"'))
+SALTO = ord("\n")
+BARRA = ord("\\")
+
+
+def _ancho(fragmento):
+    # Cantidad de caracteres de un fragmento UTF-8 (las columnas cuentan caracteres)
+    return len(fragmento) if fragmento.isascii() else len(fragmento.decode("utf-8"))
+
+
+def _largo_utf8(byte):
+    if byte < 0x80:
+        return 1
+    if byte >= 0xF0:
+        return 4
+    if byte >= 0xE0:
+        return 3
+    return 2
+
+
+class MmapLexer(Lexer):
+    """Lexer que trabaja sobre los bytes del archivo (un mmap de solo lectura).
+
+    El subconjunto de JavaScript es casi todo ASCII: el escaneo se hace a nivel de
+    bytes y solo se decodifican los lexemas que lo necesitan (identificadores, que
+    ademas se internan, cadenas y caracteres no ASCII). Produce los mismos tokens,
+    lineas y columnas (en caracteres) que Lexer sobre el texto decodificado.
+    """
+
+    def __init__(self, datos):
+        self._mapa = None
+        super().__init__(datos)
+
+    @classmethod
+    def abrir(cls, ruta):
+        with open(ruta, "rb") as f:
+            try:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # mmap no admite archivos vacios
+                return cls(b"")
+        lexer = cls(mapa)
+        lexer._mapa = mapa
+        return lexer
+
+    def cerrar(self):
+        if self._mapa is not None:
+            self.codigo_fuente = b""
+            self.longitud = 0
+            self._mapa.close()
+            self._mapa = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def definir_patrones(self):
+        self.palabras_clave = PALABRAS_CLAVE
+        return PATRONES_BYTES
+
+    def iterar(self):
+        datos = self.codigo_fuente
+        patrones = self.patrones
+        nombres = {}
+        pasos = 0
+        while self.indice < self.longitud:
+            pasos += 1
+            if self.checkpoint is not None and not pasos & 0xFF:
+                self.checkpoint("lexer", len(self.tokens), self.tokens)
+            inicio_linea = self.linea
+            inicio_columna = self.columna
+
+            # Espacios en blanco (solo ASCII: un byte por columna)
+            m = patrones["WHITESPACE"].match(datos, self.indice)
+            if m:
+                texto = m.group(0)
+                saltos = texto.count(b"\n")
+                if saltos:
+                    self.linea += saltos
+                    self.columna = 1 + len(texto) - texto.rfind(b"\n") - 1
+                else:
+                    self.columna += len(texto)
+                self.indice = m.end()
+                continue
+
+            # Detección de string no cerrado, igual que Lexer pero sobre bytes: comillas,
+            # barras y saltos son ASCII y nunca aparecen dentro de una secuencia UTF-8
+            c_actual = datos[self.indice]
+            if c_actual in COMILLAS:
+                i = self.indice + 1
+                escapado = False
+                cerrado = False
+                while i < self.longitud:
+                    ch = datos[i]
+                    if ch == SALTO and not escapado:
+                        break
+                    if escapado:
+                        escapado = False
+                    elif ch == BARRA:
+                        escapado = True
+                    elif ch == c_actual:
+                        cerrado = True
+                        break
+                    i += 1
+                if not cerrado:
+                    yield Token("ERROR", "STRING_NO_CERRADA", inicio_linea, inicio_columna, T_ERROR)
+                    fin = datos.find(b"\n", self.indice)
+                    if fin == -1:
+                        fin = self.longitud
+                    self.columna += _ancho(datos[self.indice:fin])
+                    self.indice = fin
+                    continue
+
+            # Comentario de línea
+            m = patrones["LINE_COMMENT"].match(datos, self.indice)
+            if m:
+                self.indice = m.end()
+                self.columna += _ancho(m.group(0))
+                continue
+
+            # Comentario de bloque
+            m = patrones["BLOCK_COMMENT_START"].match(datos, self.indice)
+            if m:
+                self.indice = m.end()
+                self.columna += 2
+                fin = patrones["BLOCK_COMMENT_END"].search(datos, self.indice)
+                final = fin.end() if fin else self.longitud
+                bloque = datos[self.indice:final]
+                saltos = bloque.count(b"\n")
+                self.linea += saltos
+                if saltos:
+                    self.columna = 1 + _ancho(bloque[bloque.rfind(b"\n") + 1:])
+                else:
+                    self.columna += _ancho(bloque)
+                self.indice = final
+                continue
+
+            # Cadenas: el unico lexema que puede contener texto no ASCII
+            m = patrones["STRING"].match(datos, self.indice)
+            if m:
+                valor = m.group(0).decode("utf-8")
+                yield Token("STRING", valor, inicio_linea, inicio_columna, T_STRING)
+                self.indice = m.end()
+                self.columna += len(valor)
+                continue
+
+            # Números
+            m = patrones["NUMBER"].match(datos, self.indice)
+            if m:
+                valor = m.group(0).decode("ascii")
+                yield Token("NUMBER", valor, inicio_linea, inicio_columna, T_NUMBER)
+                self.indice = m.end()
+                self.columna += len(valor)
+                continue
+
+            # Identificadores y palabras clave (ASCII); cada nombre se decodifica una vez
+            m = patrones["IDENT"].match(datos, self.indice)
+            if m:
+                crudo = m.group(0)
+                palabra = PALABRAS_CLAVE_BYTES.get(crudo)
+                if palabra is not None:
+                    yield Token("KEYWORD", palabra, inicio_linea, inicio_columna, CODIGOS[palabra])
+                else:
+                    lexema = nombres.get(crudo)
+                    if lexema is None:
+                        lexema = nombres[crudo] = sys.intern(crudo.decode("ascii"))
+                    yield Token("IDENT", lexema, inicio_linea, inicio_columna, T_IDENT)
+                self.indice = m.end()
+                self.columna += len(crudo)
+                continue
+
+            # Operadores multi-caracter
+            m = patrones["OP"].match(datos, self.indice)
+            if m:
+                op = SIMBOLOS_BYTES[m.group(0)]
+                yield Token("OP", op, inicio_linea, inicio_columna, CODIGOS[op])
+                self.indice = m.end()
+                self.columna += len(op)
+                continue
+
+            # Puntuación y operadores de un solo caracter
+            m = patrones["PUNCT"].match(datos, self.indice)
+            if m:
+                simbolo = SIMBOLOS_BYTES[m.group(0)]
+                yield Token("PUNCT", simbolo, inicio_linea, inicio_columna, CODIGOS[simbolo])
+                self.indice = m.end()
+                self.columna += 1
+                continue
+
+            # Caracter inesperado: se decodifica la secuencia UTF-8 completa
+            largo = _largo_utf8(c_actual)
+            caracter = datos[self.indice:self.indice + largo].decode("utf-8")
+            self.indice += largo
+            self.columna += 1
+            if not caracter.isspace():
+                yield Token("ERROR", caracter, inicio_linea, inicio_columna, T_ERROR)
+
+        # Fin de archivo
+        yield Token("EOF", "", self.linea, self.columna, T_EOF)
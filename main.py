@@ -1,53 +1,170 @@
 class Compilador:
-    def __init__(self, ruta_archivo):
-        # Carga el archivo fuente y prepara los módulos léxico, sintáctico y semántico
-        from lexer.lexer import Lexer
+    def __init__(self, ruta_archivo, optimizar=False, mmap=False, procesos=None):
+        # Carga el archivo fuente y prepara los módulos léxico, sintáctico y semántico.
+        # Con mmap=True el lexer escanea los bytes del archivo mapeado en memoria y el
+        # texto completo nunca se decodifica (codigo_fuente queda en None). Con procesos,
+        # las sentencias de nivel superior se parsean por fragmentos en un pool de procesos
         from semantic.semantic import SemanticAnalyzer
         from codegen import BytecodeGenerator
 
         self.ruta_archivo = ruta_archivo
-        with open(ruta_archivo, "r", encoding="utf-8") as f:
-            self.codigo_fuente = f.read()
-        self.lexer = Lexer(self.codigo_fuente)
+        self.optimizar = optimizar
+        self.mmap = mmap
+        self.procesos = procesos
+        if mmap:
+            from lexer.mmap_lexer import MmapLexer
+
+            self.codigo_fuente = None
+            self.lexer = MmapLexer.abrir(ruta_archivo)
+        else:
+            from lexer.lexer import Lexer
+
+            with open(ruta_archivo, "r", encoding="utf-8") as f:
+                self.codigo_fuente = f.read()
+            self.lexer = Lexer(self.codigo_fuente)
         self.tokens = []
         self.parser = None
         self.semantic = SemanticAnalyzer()
         self.codegen = BytecodeGenerator()
 
-    def ejecutar(self):
-        # Ejecuta el análisis completo y muestra tokens, AST, tabla de símbolos y errores
+    def ejecutar(self, formato="text", secciones=None, silencioso=False, salida=None):
+        # Ejecuta el análisis completo y transmite las secciones pedidas (tokens, AST, tabla de
+        # símbolos, bytecode...) por un único escritor con buffer. Los errores siempre se emiten;
+        # en modo silencioso solo se escriben los errores y un resumen. Devuelve el resumen.
         from parser.parser import Parser
+        from pipeline.output import SECTIONS, OutputWriter
+
+        if silencioso:
+            secciones = set()
+        else:
+            secciones = set(SECTIONS if secciones is None else secciones)
+        writer = OutputWriter(salida, formato)
 
         self.tokens = self.lexer.analizar()
-        for linea in self.lexer.mostrar_tokens():
-            print(linea)
+        if self.mmap:
+            # Los tokens ya tienen sus lexemas decodificados: el mapa puede liberarse
+            self.lexer.cerrar()
+        if "tokens" in secciones:
+            writer.begin("tokens")
+            for t in self.tokens:
+                writer.item(str(t), {"tipo": t.tipo, "valor": t.valor, "linea": t.linea, "columna": t.columna})
+            writer.end()
 
-        self.parser = Parser(self.tokens)
+        if self.procesos:
+            from parser.parallel import ParallelParser
+
+            self.parser = ParallelParser(self.tokens, procesos=self.procesos)
+        else:
+            self.parser = Parser(self.tokens)
         arbol = self.parser.parsear()
 
-        print("\nAST:")
-        self.parser.mostrar_arbol()
+        if "ast" in secciones:
+            writer.begin("ast", "AST:")
+            for nivel, nodo in arbol.recorrer():
+                writer.item(
+                    "  " * nivel + f"{nodo.tipo}: {nodo.valor if nodo.valor else ''}",
+                    {"nivel": nivel, "tipo": nodo.tipo, "valor": nodo.valor, "linea": nodo.linea, "columna": nodo.columna},
+                )
+            writer.end()
 
         errores_sintacticos = self.parser.detectar_errores()
-        if errores_sintacticos:
-            print("\nErrores sintácticos:")
-            for e in errores_sintacticos:
-                print(e)
+        self._escribir_errores(writer, "syntax_errors", "Errores sintácticos:", errores_sintacticos)
 
         errores_semanticos = self.semantic.analyze(arbol)
-        print("\nTabla de símbolos:")
-        print(self.semantic.format_symbol_table())
+        if "symbols" in secciones:
+            if formato == "text":
+                writer.value("symbols", "Tabla de símbolos:", self.semantic.format_symbol_table(), None)
+            else:
+                writer.begin("symbols")
+                for fila in self.semantic.get_symbol_rows():
+                    writer.item(None, fila)
+                writer.end()
+        self._escribir_errores(writer, "semantic_errors", "Errores semánticos:", errores_semanticos)
+
+        if self.optimizar:
+            from codegen.optimizer import DeadCodeEliminator
+
+            _, bytecode, reporte = DeadCodeEliminator(self.semantic).optimize(arbol)
+            if "optimization" in secciones:
+                writer.value(
+                    "optimization", "Optimizacion (codigo muerto):", DeadCodeEliminator.format_report(reporte), reporte
+                )
+        else:
+            # Cada instruccion se escribe al generarse, sin retener el programa completo
+            bytecode = self.codegen.stream(arbol)
+        instrucciones = 0
+        if "bytecode" in secciones:
+            writer.begin("bytecode", "Bytecode generado:")
+            for instr in bytecode:
+                writer.item(instr, instr)
+                instrucciones += 1
+            writer.end()
+        else:
+            instrucciones = sum(1 for _ in bytecode)
+        if not self.optimizar and "positions" in secciones:
+            tabla = self.codegen.position_table()
+            writer.value(
+                "positions",
+                None,
+                f"\nTabla de posiciones ({len(tabla.data)} bytes): {tabla.data.hex()}",
+                {"bytes": len(tabla.data), "hex": tabla.data.hex()},
+            )
+
+        resumen = {
+            "archivo": self.ruta_archivo,
+            "tokens": len(self.tokens),
+            "nodos": sum(1 for _ in arbol.recorrer()),
+            "simbolos": sum(len(scope.symbols) for scope in self.semantic._all_scopes),
+            "instrucciones": instrucciones,
+            "errores_sintacticos": len(errores_sintacticos),
+            "errores_semanticos": len(errores_semanticos),
+        }
+        if silencioso:
+            writer.value(
+                "summary",
+                None,
+                f"{resumen['archivo']}: {resumen['tokens']} tokens, {resumen['nodos']} nodos, "
+                f"{resumen['simbolos']} simbolos, {resumen['instrucciones']} instrucciones, "
+                f"{resumen['errores_sintacticos']} errores sintacticos, "
+                f"{resumen['errores_semanticos']} errores semanticos",
+                resumen,
+            )
+        writer.close()
+        return resumen
+
+    @staticmethod
+    def _escribir_errores(writer, seccion, titulo, errores):
+        # En texto la seccion solo aparece si hay errores; en JSON siempre esta presente
+        if not errores and writer.fmt == "text":
+            return
+        writer.begin(seccion, titulo)
+        for e in errores:
+            writer.item(e, e)
+        writer.end()
+
+
+def main(argv=None):
+    import argparse
 
-        if errores_semanticos:
-            print("\nErrores semánticos:")
-            for e in errores_semanticos:
-                print(e)
+    from pipeline.output import FORMATS, SECTIONS
 
-        bytecode = self.codegen.generate(arbol)
-        print("\nBytecode generado:")
-        for instr in bytecode:
-            print(instr)
+    parser = argparse.ArgumentParser(description="Compila un archivo JavaScript (subconjunto) a bytecode.")
+    parser.add_argument("archivo", nargs="?", default="samples/ejemplo.js")
+    parser.add_argument("--optimizar", action="store_true", help="Elimina codigo muerto antes de generar")
+    parser.add_argument("--formato", choices=FORMATS, default="text")
+    parser.add_argument(
+        "--secciones", help=f"Secciones separadas por comas ({','.join(SECTIONS)}); por defecto todas"
+    )
+    parser.add_argument("-q", "--silencioso", action="store_true", help="Solo errores y un resumen")
+    parser.add_argument("--mmap", action="store_true", help="Lee el archivo mediante mmap (archivos muy grandes)")
+    parser.add_argument(
+        "--procesos", type=int, help="Parsea las sentencias de nivel superior en paralelo con N procesos"
+    )
+    args = parser.parse_args(argv)
+    secciones = args.secciones.split(",") if args.secciones else None
+    compilador = Compilador(args.archivo, optimizar=args.optimizar, mmap=args.mmap, procesos=args.procesos)
+    compilador.ejecutar(args.formato, secciones, args.silencioso)
 
 
 if __name__ == "__main__":
-    Compilador("samples/ejemplo.js").ejecutar()
+    main()
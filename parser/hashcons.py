@@ -0,0 +1,89 @@
+# Hash-consing de expresiones: subarboles estructuralmente identicos comparten
+# un mismo identificador entero, calculado a partir de (tipo, valor, ids de hijos).
+
+EXPRESSION_KINDS = {
+    "NumberLiteral",
+    "StringLiteral",
+    "Identifier",
+    "BinaryExpression",
+    "UnaryExpression",
+    "MemberExpression",
+    "CallExpression",
+    "Arguments",
+}
+
+# Expresiones sin efectos secundarios: su valor solo depende de las variables que leen
+PURE_KINDS = {"NumberLiteral", "StringLiteral", "Identifier", "BinaryExpression", "UnaryExpression"}
+
+
+class ExpressionInterner:
+    def __init__(self):
+        self.table = {}
+        self.nodes = []
+        self.pure = []
+        self.reads = []
+        self.counts = []
+        self.parents = []
+        self._ids = {}
+
+    def id_of(self, node):
+        return self._ids.get(id(node))
+
+    def intern_tree(self, root):
+        # Recorrido en postorden sin recursion; los nodos que no son expresiones no reciben id
+        if root is None:
+            return
+        pila = [(root, False)]
+        while pila:
+            node, hijos_listos = pila.pop()
+            if not hijos_listos:
+                pila.append((node, True))
+                pila.extend((hijo, False) for hijo in reversed(node.hijos))
+                continue
+            if node.tipo not in EXPRESSION_KINDS:
+                for hijo in node.hijos:
+                    self._record_parent(hijo, None)
+                continue
+            child_ids = tuple(self._ids.get(id(hijo)) for hijo in node.hijos)
+            if None in child_ids:
+                continue
+            hc = self._intern_key(node, child_ids)
+            self._ids[id(node)] = hc
+            self.counts[hc] += 1
+            for hijo in node.hijos:
+                self._record_parent(hijo, hc)
+        self._record_parent(root, None)
+
+    def _record_parent(self, node, parent_hc):
+        hc = self._ids.get(id(node))
+        if hc is not None:
+            self.parents.append((hc, parent_hc))
+
+    def _intern_key(self, node, child_ids):
+        key = (node.tipo, node.valor, child_ids)
+        hc = self.table.get(key)
+        if hc is not None:
+            return hc
+        hc = len(self.nodes)
+        self.table[key] = hc
+        self.nodes.append(node)
+        self.counts.append(0)
+        pure = node.tipo in PURE_KINDS and all(self.pure[c] for c in child_ids)
+        self.pure.append(pure)
+        reads = frozenset([node.valor]) if node.tipo == "Identifier" else frozenset()
+        for c in child_ids:
+            reads |= self.reads[c]
+        self.reads.append(reads)
+        return hc
+
+    def repeated(self, kinds=("BinaryExpression",)):
+        # Subexpresiones puras repetidas que no quedan cubiertas siempre por un padre repetido
+        covered = [0] * len(self.nodes)
+        for hc, parent in self.parents:
+            if parent is not None and self.counts[parent] >= 2 and self.pure[parent]:
+                covered[hc] += 1
+        return {
+            hc
+            for hc, node in enumerate(self.nodes)
+            if node.tipo in kinds and self.pure[hc] and self.counts[hc] >= 2 and covered[hc] < self.counts[hc]
+        }
@@ -0,0 +1,160 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from lexer.lexer import T_EOF, Token
+from parser.parser import K_LLAVE_DER, K_LLAVE_IZQ, K_PAREN_DER, K_PAREN_IZQ, K_PUNTO_Y_COMA, NodoAST, Parser
+
+
+def limites_sentencias(kinds, tamano):
+    # Pre-escaneo de profundidad de llaves y parentesis: posiciones tras un ';' o una '}'
+    # de nivel superior que parten los tokens en fragmentos de al menos `tamano` tokens.
+    # Los limites son una conjetura; ParallelParser.parsear comprueba cada fragmento
+    fin = len(kinds) - 1 if kinds and kinds[-1] == T_EOF else len(kinds)
+    limites = [0]
+    siguiente = tamano
+    llaves = parens = 0
+    for i in range(fin):
+        kind = kinds[i]
+        if kind == K_PUNTO_Y_COMA:
+            # ';' no puede aparecer dentro de parentesis: un '(' sin cerrar no arrastra
+            # la profundidad a las sentencias siguientes
+            parens = 0
+            if llaves:
+                continue
+        elif kind == K_LLAVE_DER:
+            parens = 0
+            if llaves:
+                llaves -= 1
+            if llaves:
+                continue
+        elif kind == K_LLAVE_IZQ:
+            llaves += 1
+            continue
+        elif kind == K_PAREN_IZQ:
+            parens += 1
+            continue
+        elif kind == K_PAREN_DER:
+            if parens:
+                parens -= 1
+            continue
+        else:
+            continue
+        if i >= siguiente and not parens and i + 1 < fin:
+            limites.append(i + 1)
+            siguiente = i + 1 + tamano
+    limites.append(fin)
+    return limites
+
+
+def _parsear_fragmento(tokens):
+    # Solo se devuelve el AST de los fragmentos sin errores: un error puede depender de
+    # tokens posteriores al fragmento
+    parser = Parser(tokens)
+    programa = parser.parsear()
+    if parser.errores:
+        return None, parser.sentencias
+    return programa.hijos, parser.sentencias
+
+
+def _parsear_fragmento_columnas(columnas):
+    # Se ejecuta en un proceso del pool: tokens y AST viajan como listas planas por
+    # columna, mucho mas baratas de serializar que los objetos
+    hijos, sentencias = _parsear_fragmento(list(map(Token, *columnas)))
+    return (_aplanar(hijos) if hijos is not None else None), sentencias
+
+
+def _columnas(tokens):
+    return (
+        [t.tipo for t in tokens],
+        [t.valor for t in tokens],
+        [t.linea for t in tokens],
+        [t.columna for t in tokens],
+        [t.kind for t in tokens],
+    )
+
+
+def _aplanar(nodos):
+    # Preorden de los subarboles como columnas; padres[i] es el indice del padre (-1 en la raiz)
+    tipos, valores, lineas, columnas, padres = [], [], [], [], []
+    pila = nodos[::-1]
+    pila_padres = [-1] * len(nodos)
+    while pila:
+        nodo = pila.pop()
+        indice = len(tipos)
+        tipos.append(nodo.tipo)
+        valores.append(nodo.valor)
+        lineas.append(nodo.linea)
+        columnas.append(nodo.columna)
+        padres.append(pila_padres.pop())
+        hijos = nodo.hijos
+        if hijos:
+            pila.extend(reversed(hijos))
+            pila_padres.extend([indice] * len(hijos))
+    return tipos, valores, lineas, columnas, padres
+
+
+def _reconstruir(tipos, valores, lineas, columnas, padres):
+    nodos = list(map(NodoAST, tipos, valores, lineas, columnas))
+    raices = []
+    for nodo, padre in zip(nodos, padres):
+        (raices if padre < 0 else nodos[padre].hijos).append(nodo)
+    return raices
+
+
+class ParallelParser(Parser):
+    """Parser que analiza en un pool de procesos fragmentos de sentencias de nivel superior.
+
+    Un pre-escaneo de profundidad de llaves y parentesis propone limites de sentencia
+    y cada fragmento se parsea por separado. Un fragmento se acepta solo si no tuvo
+    errores y empieza justo donde el cursor secuencial llega: en ese caso su resultado
+    es el mismo que con la lista completa de tokens. El resto se vuelve a parsear en
+    el proceso principal sentencia a sentencia, de modo que los errores y la
+    recuperacion son exactamente los de Parser.
+    """
+
+    def __init__(self, tokens, procesos=None, executor=None, tamano_fragmento=20000):
+        self.procesos = procesos
+        self.executor = executor
+        self.tamano_fragmento = tamano_fragmento
+        super().__init__(tokens)
+
+    def parsear(self):
+        limites = limites_sentencias(self._kinds, self.tamano_fragmento)
+        if len(limites) < 3:
+            return super().parsear()
+        fragmentos = list(zip(limites, limites[1:]))
+        resultados, construir = self._parsear_fragmentos(fragmentos)
+        inicios = {inicio: k for k, (inicio, _) in enumerate(fragmentos)}
+
+        kinds = self._kinds
+        tok_program = self._actual()
+        programa = NodoAST("Program", linea=tok_program.linea, columna=tok_program.columna)
+        self.arbol = programa
+        while kinds[self.pos] != T_EOF:
+            if self.checkpoint is not None:
+                self.checkpoint("parser", self.sentencias, programa)
+            k = inicios.get(self.pos)
+            if k is not None and resultados[k][0] is not None:
+                hijos, sentencias = resultados[k]
+                programa.hijos.extend(construir(hijos))
+                self.sentencias += sentencias
+                self.pos = fragmentos[k][1]
+                continue
+            self.sentencias += 1
+            nodo = self._parsear_sentencia_superior()
+            if nodo is not None:
+                programa.agregar_hijo(nodo)
+        self.arbol = programa
+        return programa
+
+    def _parsear_fragmentos(self, fragmentos):
+        # Devuelve los resultados por fragmento y la funcion que convierte el AST recibido
+        # en la lista de hijos del programa
+        if self.executor is None and self.procesos == 1:
+            return [_parsear_fragmento(self.tokens[inicio:fin]) for inicio, fin in fragmentos], list
+        trozos = [_columnas(self.tokens[inicio:fin]) for inicio, fin in fragmentos]
+        if self.executor is not None:
+            resultados = list(self.executor.map(_parsear_fragmento_columnas, trozos))
+        else:
+            with ProcessPoolExecutor(self.procesos) as executor:
+                resultados = list(executor.map(_parsear_fragmento_columnas, trozos))
+        return resultados, lambda arbol: _reconstruir(*arbol)
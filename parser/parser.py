@@ -1,3 +1,26 @@
+from operator import attrgetter
+
+from lexer.lexer import CATEGORIAS, CODIGOS, T_EOF, T_IDENT, T_NUMBER, T_STRING, Token
+
+# Conjuntos de codigos de token construidos una sola vez
+DECLARACIONES = frozenset(CODIGOS[p] for p in ("var", "let", "const"))
+UNARIOS = frozenset(CODIGOS[p] for p in ("+", "-", "!"))
+MUL_DIV = frozenset(CODIGOS[p] for p in ("*", "/", "%"))
+SUMA_RESTA = frozenset(CODIGOS[p] for p in ("+", "-"))
+SINCRONIZACION = frozenset(CODIGOS[p] for p in (";", "}"))
+PUNTUADORES = frozenset(codigo for codigo, categoria in enumerate(CATEGORIAS) if categoria == "PUNCT")
+K_FUNCTION = CODIGOS["function"]
+K_PUNTO_Y_COMA = CODIGOS[";"]
+K_ASIGNACION = CODIGOS["="]
+K_PUNTO = CODIGOS["."]
+K_COMA = CODIGOS[","]
+K_PAREN_IZQ = CODIGOS["("]
+K_PAREN_DER = CODIGOS[")"]
+K_LLAVE_IZQ = CODIGOS["{"]
+K_LLAVE_DER = CODIGOS["}"]
+_valor = attrgetter("valor")
+
+
 # Clase NodoAST
 class NodoAST:
     def __init__(self, tipo, valor=None, linea=None, columna=None):
@@ -11,132 +34,174 @@ class NodoAST:
         self.hijos.append(nodo)
 
     def mostrar(self, nivel=0):
-        print("  " * nivel + f"{self.tipo}: {self.valor if self.valor else ''}")
-        for hijo in self.hijos:
-            hijo.mostrar(nivel + 1)
+        for profundidad, nodo in self.recorrer(nivel):
+            print("  " * profundidad + f"{nodo.tipo}: {nodo.valor if nodo.valor else ''}")
+
+    def recorrer(self, nivel=0):
+        # Preorden sin recursion: produce (nivel, nodo) para arboles profundos
+        pila = [(nivel, self)]
+        while pila:
+            nivel, nodo = pila.pop()
+            yield nivel, nodo
+            pila.extend((nivel + 1, hijo) for hijo in reversed(nodo.hijos))
+
+    def copiar(self):
+        # Copia profunda sin recursion
+        copia = NodoAST(self.tipo, self.valor, self.linea, self.columna)
+        pila = [(self, copia)]
+        while pila:
+            original, nuevo = pila.pop()
+            for hijo in original.hijos:
+                copia_hijo = NodoAST(hijo.tipo, hijo.valor, hijo.linea, hijo.columna)
+                nuevo.hijos.append(copia_hijo)
+                if hijo.hijos:
+                    pila.append((hijo, copia_hijo))
+        return copia
 
 
 
 # Clase Parser
 class Parser:
     def __init__(self, tokens):
-        # Recibe la lista de tokens generada por el lexer
+        # Punto de control cooperativo opcional: checkpoint(fase, procesados, parcial)
+        self.checkpoint = None
+        self.reset(tokens)
+
+    def reset(self, tokens):
+        # Recibe la lista de tokens generada por el lexer. El cursor trabaja sobre los
+        # codigos enteros y la lista termina siempre en un EOF centinela
+        if not tokens or tokens[-1].kind != T_EOF:
+            ultimo = tokens[-1] if tokens else None
+            tokens = list(tokens) + [Token("EOF", "", ultimo.linea if ultimo else 1, ultimo.columna if ultimo else 1, T_EOF)]
         self.tokens = tokens
+        self._kinds = [t.kind for t in tokens]
+        self._fin = len(tokens) - 1
         self.pos = 0
         self.errores = []
         self.arbol = None
+        self.sentencias = 0
 
     # Utilidades internas del parser
     def _actual(self):
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return self.tokens[-1]
+        return self.tokens[self.pos]
 
     def _avanzar(self):
-        token = self._actual()
-        self.pos += 1
+        # El cursor no pasa del EOF centinela
+        token = self.tokens[self.pos]
+        if self.pos < self._fin:
+            self.pos += 1
         return token
 
     def _mirar(self, offset):
-        idx = self.pos + offset
-        if 0 <= idx < len(self.tokens):
-            return self.tokens[idx]
-        return self.tokens[-1]
-
-    def _coincide(self, tipo=None, valor=None):
-        token = self._actual()
-        if tipo is not None and token.tipo != tipo:
-            return False
-        if valor is not None and token.valor != valor:
+        return self._kinds[min(self.pos + offset, self._fin)]
+
+    def _coincide(self, kind):
+        if self._kinds[self.pos] != kind:
             return False
         self._avanzar()
         return True
 
-    def _esperar(self, tipo=None, valor=None, mensaje="Token inesperado"):
-        token = self._actual()
-        if (tipo is None or token.tipo == tipo) and (valor is None or token.valor == valor):
-            return self._avanzar()
-        self.errores.append(f"{mensaje} en linea {token.linea}, columna {token.columna}: se esperaba {tipo or valor} y se obtuvo {token.tipo}:{token.valor}")
+    def _esperar(self, kind, mensaje="Token inesperado"):
+        token = self.tokens[self.pos]
+        if token.kind != kind:
+            self.errores.append(f"{mensaje} en linea {token.linea}, columna {token.columna}: se esperaba {CATEGORIAS[kind]} y se obtuvo {token.tipo}:{token.valor}")
         return self._avanzar()
 
     def _sincronizar(self):
         # Avanza hasta un límite de sentencia para evitar errores en cascada
-        while self._actual().tipo != "EOF":
-            tok = self._actual()
-            if tok.tipo == "PUNCT" and tok.valor in {";", "}"}:
+        kinds = self._kinds
+        while kinds[self.pos] != T_EOF:
+            if kinds[self.pos] in SINCRONIZACION:
                 break
             self._avanzar()
 
     def _esperar_punto_y_coma(self):
         # Exige ';', reporta y sincroniza si falta
-        tok = self._actual()
-        if tok.tipo == "PUNCT":
-            if tok.valor == ";":
+        kind = self._kinds[self.pos]
+        if kind in PUNTUADORES:
+            # Se permite omitir ';' antes de cerrar el bloque ('}')
+            if kind == K_PUNTO_Y_COMA:
                 self._avanzar()
-                return
-            if tok.valor == "}":
-                # Permitimos omitir ';' antes de cerrar el bloque
-                return
         else:
+            tok = self.tokens[self.pos]
             self.errores.append(f"Se esperaba ';' en linea {tok.linea}, columna {tok.columna}: se obtuvo {tok.tipo}:{tok.valor}")
             self._sincronizar()
             # Si hemos sincronizado y estamos en ';', consumirlo para continuar limpio
-            if self._actual().tipo == "PUNCT" and self._actual().valor == ";":
+            if self._kinds[self.pos] == K_PUNTO_Y_COMA:
                 self._avanzar()
 
     def parsear(self):
         # Inicia el análisis sintáctico y construye el árbol sintáctico
+        kinds = self._kinds
         tok_program = self._actual()
         programa = NodoAST("Program", linea=tok_program.linea, columna=tok_program.columna)
-        while self._actual().tipo != "EOF":
-            nodo = None
-            tok = self._actual()
-            if tok.tipo == "PUNCT" and tok.valor == ";":
-                # Permite sentencias vacías (por ejemplo ';' después de una declaración)
-                self._avanzar()
-                continue
-            if tok.tipo == "KEYWORD" and tok.valor == "function":
-                nodo = self.parsear_funcion()
-            elif tok.tipo == "KEYWORD" and tok.valor in {"var", "let", "const"}:
-                nodo = self.parsear_declaracion()
-            else:
-                # Detección de patrón de función sin 'function': IDENT ( ) { ... }
-                if (
-                    tok.tipo == "IDENT"
-                    and self._mirar(1).tipo == "PUNCT" and self._mirar(1).valor == "("
-                    and self._mirar(2).tipo == "PUNCT" and self._mirar(2).valor == ")"
-                    and self._mirar(3).tipo == "PUNCT" and self._mirar(3).valor == "{"
-                ):
-                    self.errores.append(
-                        f"Se esperaba 'function' antes del nombre de funcion en linea {tok.linea}, columna {tok.columna}"
-                    )
-                    nodo = self._parsear_funcion_sin_keyword()
-                else:
-                    # Como fallback, intentamos parsear una expresión simple seguida de ";"
-                    expr = self.parsear_expresion()
-                    self._esperar_punto_y_coma()
-                    nodo = NodoAST(
-                        "ExpressionStatement",
-                        linea=expr.linea if hasattr(expr, "linea") else tok.linea,
-                        columna=expr.columna if hasattr(expr, "columna") else tok.columna,
-                    )
-                    nodo.agregar_hijo(expr)
-            programa.agregar_hijo(nodo)
+        # Se publica desde el inicio para poder recuperar un AST parcial si se cancela
+        self.arbol = programa
+        while kinds[self.pos] != T_EOF:
+            if self.checkpoint is not None:
+                self.checkpoint("parser", self.sentencias, programa)
+            self.sentencias += 1
+            inicio = self.pos
+            nodo = self._parsear_sentencia_superior()
+            if nodo is not None:
+                nodo.huella = self._huella(inicio)
+                programa.agregar_hijo(nodo)
         self.arbol = programa
         return programa
 
+    def _huella(self, inicio):
+        # Huella de una sentencia de nivel superior: codigos y lexemas de sus tokens (sin
+        # posiciones) mas el codigo del siguiente, que decidio donde termina. Dos sentencias
+        # con la misma huella producen el mismo subarbol
+        return tuple(self._kinds[inicio : self.pos + 1]), tuple(map(_valor, self.tokens[inicio : self.pos]))
+
+    def _parsear_sentencia_superior(self):
+        # Analiza una sentencia de nivel superior desde self.pos; None para ';' sueltos
+        tok = self._actual()
+        kind = tok.kind
+        if kind == K_PUNTO_Y_COMA:
+            # Permite sentencias vacías (por ejemplo ';' después de una declaración)
+            self._avanzar()
+            return None
+        if kind == K_FUNCTION:
+            return self.parsear_funcion()
+        if kind in DECLARACIONES:
+            return self.parsear_declaracion()
+        # Detección de patrón de función sin 'function': IDENT ( ) { ... }
+        if (
+            kind == T_IDENT
+            and self._mirar(1) == K_PAREN_IZQ
+            and self._mirar(2) == K_PAREN_DER
+            and self._mirar(3) == K_LLAVE_IZQ
+        ):
+            self.errores.append(
+                f"Se esperaba 'function' antes del nombre de funcion en linea {tok.linea}, columna {tok.columna}"
+            )
+            return self._parsear_funcion_sin_keyword()
+        # Como fallback, intentamos parsear una expresión simple seguida de ";"
+        expr = self.parsear_expresion()
+        self._esperar_punto_y_coma()
+        nodo = NodoAST(
+            "ExpressionStatement",
+            linea=expr.linea if hasattr(expr, "linea") else tok.linea,
+            columna=expr.columna if hasattr(expr, "columna") else tok.columna,
+        )
+        nodo.agregar_hijo(expr)
+        return nodo
+
     def parsear_declaracion(self):
-        # Analiza una declaración de variable (e.g., var x = 5;)
-        kw = self._esperar("KEYWORD", None, "Se esperaba palabra clave de declaracion")
-        ident = self._esperar("IDENT", None, "Se esperaba identificador de variable")
+        # Analiza una declaración de variable (e.g., var x = 5;). Quien llama ya comprobo
+        # que el token actual es var/let/const
+        kw = self._avanzar()
+        ident = self._esperar(T_IDENT, "Se esperaba identificador de variable")
         decl = NodoAST("VariableDeclaration", kw.valor, linea=kw.linea, columna=kw.columna)
         id_node = (
             NodoAST("Identifier", ident.valor, linea=ident.linea, columna=ident.columna)
-            if ident.tipo == "IDENT"
+            if ident.kind == T_IDENT
             else NodoAST("InvalidIdentifier", ident.valor, linea=ident.linea, columna=ident.columna)
         )
         decl.agregar_hijo(id_node)
-        if self._coincide("PUNCT", "="):
+        if self._coincide(K_ASIGNACION):
             expr = self.parsear_expresion()
             init_node = NodoAST("Initializer")
             init_node.agregar_hijo(expr)
@@ -148,17 +213,24 @@ class Parser:
         # Analiza expresiones aritméticas (e.g., 5 + 2 * 3)
         # Debe manejar precedencia y asociatividad
         # Implementamos precedencia: llamadas/miembros > multiplicacion/division > suma/resta
+        kinds = self._kinds
+
         def parsear_primaria():
             tok = self._actual()
-            if self._coincide("NUMBER"):
+            kind = tok.kind
+            if kind == T_NUMBER:
+                self._avanzar()
                 return NodoAST("NumberLiteral", tok.valor, linea=tok.linea, columna=tok.columna)
-            if self._coincide("STRING"):
+            if kind == T_STRING:
+                self._avanzar()
                 return NodoAST("StringLiteral", tok.valor, linea=tok.linea, columna=tok.columna)
-            if self._coincide("IDENT"):
+            if kind == T_IDENT:
+                self._avanzar()
                 return NodoAST("Identifier", tok.valor, linea=tok.linea, columna=tok.columna)
-            if self._coincide("PUNCT", "("):
+            if kind == K_PAREN_IZQ:
+                self._avanzar()
                 expr = parsear_suma_resta()
-                self._esperar("PUNCT", ")", "Se esperaba ')'")
+                self._esperar(K_PAREN_DER, "Se esperaba ')'")
                 return expr
             # Fallback para tokens inesperados
             self.errores.append(f"Expresion primaria invalida en linea {tok.linea}, columna {tok.columna}: {tok.tipo}:{tok.valor}")
@@ -166,8 +238,7 @@ class Parser:
             return NodoAST("Error")
 
         def parsear_unaria():
-            tok = self._actual()
-            if tok.tipo == "PUNCT" and tok.valor in {"+", "-", "!"}:
+            if kinds[self.pos] in UNARIOS:
                 op = self._avanzar()
                 expr = parsear_unaria()
                 nodo = NodoAST("UnaryExpression", op.valor)
@@ -178,31 +249,31 @@ class Parser:
         def parsear_postfijo():
             nodo = parsear_unaria()
             while True:
-                tok = self._actual()
+                kind = kinds[self.pos]
                 # Acceso a miembro: expr . IDENT
-                if tok.tipo == "PUNCT" and tok.valor == ".":
-                    self._avanzar()
-                    ident = self._esperar("IDENT", None, "Se esperaba identificador despues de '.'")
+                if kind == K_PUNTO:
+                    tok = self._avanzar()
+                    ident = self._esperar(T_IDENT, "Se esperaba identificador despues de '.'")
                     miembro = NodoAST("MemberExpression", linea=tok.linea, columna=tok.columna)
                     miembro.agregar_hijo(nodo)
                     miembro.agregar_hijo(NodoAST("Identifier", ident.valor, linea=ident.linea, columna=ident.columna))
                     nodo = miembro
                     continue
                 # Llamada: expr ( args )
-                if tok.tipo == "PUNCT" and tok.valor == "(":
-                    self._avanzar()
+                if kind == K_PAREN_IZQ:
+                    tok = self._avanzar()
                     call = NodoAST("CallExpression", linea=tok.linea, columna=tok.columna)
                     call.agregar_hijo(nodo)
                     args_parent = NodoAST("Arguments", linea=tok.linea, columna=tok.columna)
                     # Argumentos separados por comas
-                    if not (self._actual().tipo == "PUNCT" and self._actual().valor == ")"):
+                    if kinds[self.pos] != K_PAREN_DER:
                         arg = parsear_suma_resta()
                         args_parent.agregar_hijo(arg)
-                        while self._actual().tipo == "PUNCT" and self._actual().valor == ",":
+                        while kinds[self.pos] == K_COMA:
                             self._avanzar()
                             arg = parsear_suma_resta()
                             args_parent.agregar_hijo(arg)
-                    self._esperar("PUNCT", ")", "Se esperaba ')'")
+                    self._esperar(K_PAREN_DER, "Se esperaba ')'")
                     call.agregar_hijo(args_parent)
                     nodo = call
                     continue
@@ -211,44 +282,36 @@ class Parser:
 
         def parsear_mul_div():
             nodo = parsear_postfijo()
-            while True:
-                tok = self._actual()
-                if tok.tipo == "PUNCT" and tok.valor in {"*", "/", "%"}:
-                    op = self._avanzar()
-                    derecho = parsear_postfijo()
-                    nuevo = NodoAST("BinaryExpression", op.valor)
-                    nuevo.agregar_hijo(nodo)
-                    nuevo.agregar_hijo(derecho)
-                    nodo = nuevo
-                else:
-                    break
+            while kinds[self.pos] in MUL_DIV:
+                op = self._avanzar()
+                derecho = parsear_postfijo()
+                nuevo = NodoAST("BinaryExpression", op.valor)
+                nuevo.agregar_hijo(nodo)
+                nuevo.agregar_hijo(derecho)
+                nodo = nuevo
             return nodo
 
         def parsear_suma_resta():
             nodo = parsear_mul_div()
-            while True:
-                tok = self._actual()
-                if tok.tipo == "PUNCT" and tok.valor in {"+", "-"}:
-                    op = self._avanzar()
-                    derecho = parsear_mul_div()
-                    nuevo = NodoAST("BinaryExpression", op.valor)
-                    nuevo.agregar_hijo(nodo)
-                    nuevo.agregar_hijo(derecho)
-                    nodo = nuevo
-                else:
-                    break
+            while kinds[self.pos] in SUMA_RESTA:
+                op = self._avanzar()
+                derecho = parsear_mul_div()
+                nuevo = NodoAST("BinaryExpression", op.valor)
+                nuevo.agregar_hijo(nodo)
+                nuevo.agregar_hijo(derecho)
+                nodo = nuevo
             return nodo
 
         return parsear_suma_resta()
 
     def parsear_funcion(self):
         # Analiza una declaración de función (e.g., function foo() { ... })
-        token_func = self._esperar("KEYWORD", "function", "Se esperaba 'function'")
-        nombre = self._esperar("IDENT", None, "Se esperaba nombre de funcion")
-        self._esperar("PUNCT", "(", "Se esperaba '('")
+        token_func = self._esperar(K_FUNCTION, "Se esperaba 'function'")
+        nombre = self._esperar(T_IDENT, "Se esperaba nombre de funcion")
+        self._esperar(K_PAREN_IZQ, "Se esperaba '('")
         # Para simplificar, no parseamos parametros en este subconjunto
-        self._esperar("PUNCT", ")", "Se esperaba ')'")
-        self._esperar("PUNCT", "{", "Se esperaba '{'")
+        self._esperar(K_PAREN_DER, "Se esperaba ')'")
+        self._esperar(K_LLAVE_IZQ, "Se esperaba '{'")
         bloque = self._parsear_bloque()
         func = NodoAST("FunctionDeclaration", linea=token_func.linea, columna=token_func.columna)
         func.agregar_hijo(NodoAST("Identifier", nombre.valor, linea=nombre.linea, columna=nombre.columna))
@@ -258,10 +321,10 @@ class Parser:
     def _parsear_funcion_sin_keyword(self):
         # Variante: parsea IDENT () { ... } reportando previamente el error de falta de 'function'
         token_name = self._actual()
-        nombre = self._esperar("IDENT", None, "Se esperaba nombre de funcion")
-        self._esperar("PUNCT", "(", "Se esperaba '('")
-        self._esperar("PUNCT", ")", "Se esperaba ')'")
-        self._esperar("PUNCT", "{", "Se esperaba '{'")
+        nombre = self._esperar(T_IDENT, "Se esperaba nombre de funcion")
+        self._esperar(K_PAREN_IZQ, "Se esperaba '('")
+        self._esperar(K_PAREN_DER, "Se esperaba ')'")
+        self._esperar(K_LLAVE_IZQ, "Se esperaba '{'")
         bloque = self._parsear_bloque()
         func = NodoAST("FunctionDeclaration", linea=token_name.linea, columna=token_name.columna)
         func.agregar_hijo(NodoAST("Identifier", nombre.valor, linea=nombre.linea, columna=nombre.columna))
@@ -270,20 +333,25 @@ class Parser:
 
     def _parsear_bloque(self):
         # Parsea sentencias hasta la '}' correspondiente y devuelve un NodoAST("Block") poblado
+        kinds = self._kinds
         tok_block = self._actual()
         bloque = NodoAST("Block", linea=tok_block.linea, columna=tok_block.columna)
         cerro_bloque = False
-        while self._actual().tipo != "EOF":
+        while kinds[self.pos] != T_EOF:
+            if self.checkpoint is not None:
+                self.checkpoint("parser", self.sentencias, self.arbol)
+            self.sentencias += 1
             tok = self._actual()
-            if tok.tipo == "PUNCT" and tok.valor == "}":
+            kind = tok.kind
+            if kind == K_LLAVE_DER:
                 self._avanzar()
                 cerro_bloque = True
                 break
-            if tok.tipo == "KEYWORD" and tok.valor in {"var", "let", "const"}:
+            if kind in DECLARACIONES:
                 stmt = self.parsear_declaracion()
                 bloque.agregar_hijo(stmt)
                 continue
-            if tok.tipo == "KEYWORD" and tok.valor == "function":
+            if kind == K_FUNCTION:
                 stmt = self.parsear_funcion()
                 bloque.agregar_hijo(stmt)
                 continue
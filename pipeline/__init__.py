@@ -0,0 +1,46 @@
+from importlib import import_module
+
+# Carga diferida (PEP 562): asyncio y los hilos solo se importan si se usan
+_EXPORTS = {
+    "AsyncCompiler": ".aio",
+    "CompileBudget": ".worker",
+    "CompileCache": ".cache",
+    "CompileCancelled": ".worker",
+    "CompileJob": ".worker",
+    "LinkError": ".linker",
+    "Linker": ".linker",
+    "PhaseCache": ".cache",
+    "Pipeline": ".pool",
+    "PipelinePool": ".pool",
+    "compile_file": ".aio",
+    "compile_object": ".linker",
+    "compile_source": ".aio",
+}
+
+__all__ = [
+    "AsyncCompiler",
+    "CompileBudget",
+    "CompileCache",
+    "CompileCancelled",
+    "CompileJob",
+    "LinkError",
+    "Linker",
+    "PhaseCache",
+    "Pipeline",
+    "PipelinePool",
+    "compile_file",
+    "compile_object",
+    "compile_source",
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
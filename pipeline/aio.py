@@ -0,0 +1,98 @@
+import asyncio
+import functools
+
+
+def compile_text(source, optimize=False):
+    """Compila `source` con instancias nuevas de cada fase y devuelve el resultado como datos.
+
+    Es una funcion de modulo para que pueda ejecutarse tambien en un ProcessPoolExecutor.
+    """
+    from codegen import BytecodeGenerator
+    from lexer.lexer import Lexer, tokens_a_columnas
+    from parser.parser import Parser
+    from semantic.semantic import SemanticAnalyzer
+
+    tokens = Lexer(source).analizar()
+    parser = Parser(tokens)
+    arbol = parser.parsear()
+    semantic = SemanticAnalyzer()
+    semantic_errors = semantic.analyze(arbol)
+    result = {
+        "tokens": tokens,
+        "token_columns": tokens_a_columnas(tokens),
+        "ast": arbol,
+        "syntax_errors": parser.detectar_errores(),
+        "semantic_errors": semantic_errors,
+        "symbols": semantic.get_symbol_columns(),
+    }
+    if optimize:
+        from codegen.optimizer import DeadCodeEliminator
+
+        _, result["bytecode"], result["optimization"] = DeadCodeEliminator(semantic).optimize(arbol)
+    else:
+        generator = BytecodeGenerator()
+        result["bytecode"] = generator.generate(arbol)
+        result["positions"] = generator.position_table().data
+    return result
+
+
+def _compile_cached(cache, source):
+    # Misma forma que compile_text y datos propios de quien llama: las entradas de la
+    # cache son compartidas entre llamadas concurrentes
+    from lexer.lexer import Token
+
+    result = cache.compile(source, positions=True)
+    return {
+        "tokens": [Token(t.tipo, t.valor, t.linea, t.columna, t.kind) for t in result["tokens"]],
+        "token_columns": {name: list(values) for name, values in result["token_columns"].items()},
+        "ast": result["ast"].copiar() if result["ast"] is not None else None,
+        "syntax_errors": list(result["syntax_errors"]),
+        "semantic_errors": list(result["semantic_errors"]),
+        "symbols": {name: list(values) for name, values in result["symbols"].items()},
+        "bytecode": list(result["bytecode"]),
+        "positions": result["positions"],
+    }
+
+
+def _read_file(path, encoding):
+    with open(path, "r", encoding=encoding) as f:
+        return f.read()
+
+
+class AsyncCompiler:
+    """API asincrona para incrustar el compilador en servicios asyncio.
+
+    La lectura de archivos y las fases de compilacion se delegan a `executor` (None usa
+    el ThreadPoolExecutor por defecto del bucle), de modo que el bucle de eventos nunca
+    se bloquea. Cada llamada crea sus propias instancias de lexer, parser y analizador;
+    lo unico compartido es la CompileCache opcional, que es segura entre hilos y solo se
+    usa con ejecutores de hilos. Los resultados servidos desde la cache tienen la misma
+    forma que los de compile_text y son copias propias de cada llamada.
+    """
+
+    def __init__(self, executor=None, cache=None, optimize=False):
+        self.executor = executor
+        self.cache = cache
+        self.optimize = optimize
+
+    async def compile_source(self, source):
+        loop = asyncio.get_running_loop()
+        if self.cache is not None and not self.optimize:
+            return await loop.run_in_executor(self.executor, _compile_cached, self.cache, source)
+        return await loop.run_in_executor(self.executor, functools.partial(compile_text, source, self.optimize))
+
+    async def compile_file(self, path, encoding="utf-8"):
+        loop = asyncio.get_running_loop()
+        # La E/S de archivos va al ejecutor por defecto (hilos) aunque las fases usen procesos
+        source = await loop.run_in_executor(None, _read_file, path, encoding)
+        result = await self.compile_source(source)
+        result["path"] = path
+        return result
+
+
+async def compile_source(source, executor=None, optimize=False):
+    return await AsyncCompiler(executor, optimize=optimize).compile_source(source)
+
+
+async def compile_file(path, executor=None, optimize=False, encoding="utf-8"):
+    return await AsyncCompiler(executor, optimize=optimize).compile_file(path, encoding)
@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import os
+import sys
+
+from .linker import LinkError, Linker, compile_object, export_signature, load_object, save_object
+
+
+class Build:
+    """Compilacion separada estilo make: un objeto por archivo y un enlace final.
+
+    Los objetos se guardan en `build_dir`. Un archivo se recompila cuando cambia su
+    contenido o cuando cambio la firma (kind, data_type) de algun simbolo que importaba
+    de otro archivo; editar el cuerpo de una funcion solo recompila ese archivo.
+    """
+
+    MAX_PASSES = 8
+
+    def __init__(self, paths, build_dir="build", stream=None):
+        self.paths = list(paths)
+        self.build_dir = build_dir
+        self.stream = stream or sys.stdout
+        self.compiled = []
+
+    def object_path(self, path):
+        digest = hashlib.blake2b(os.path.abspath(path).encode("utf-8"), digest_size=8).hexdigest()
+        return os.path.join(self.build_dir, f"{os.path.splitext(os.path.basename(path))[0]}-{digest}.o.json")
+
+    def _load_cached(self, path):
+        try:
+            return load_object(self.object_path(path))
+        except (OSError, ValueError):
+            return None
+
+    def _imports_for(self, path, objects):
+        imports = {}
+        for other, obj in objects.items():
+            if other != path and obj is not None:
+                imports.update(obj["exports"])
+        return imports
+
+    def _stale(self, obj, source_hash, imports):
+        if obj is None or obj["source_hash"] != source_hash:
+            return True
+        # Un nombre pendiente que ahora exporta otro archivo cambia el analisis
+        if any(name in imports for name in obj["unresolved"] if name not in obj["imports"]):
+            return True
+        return any(
+            name not in imports or export_signature(imports[name]) != signature
+            for name, signature in obj["imports"].items()
+        )
+
+    def compile(self):
+        os.makedirs(self.build_dir, exist_ok=True)
+        sources = {}
+        for path in self.paths:
+            with open(path, "r", encoding="utf-8") as f:
+                sources[path] = f.read()
+        objects = {path: self._load_cached(path) for path in self.paths}
+        self.compiled = []
+        # Las exportaciones de un archivo pueden cambiar lo que otro ve; se repite hasta estabilizar
+        for _ in range(self.MAX_PASSES):
+            changed = False
+            for path in self.paths:
+                source_hash = hashlib.blake2b(sources[path].encode("utf-8"), digest_size=16).hexdigest()
+                imports = self._imports_for(path, objects)
+                if not self._stale(objects[path], source_hash, imports):
+                    continue
+                obj = compile_object(sources[path], path, imports)
+                save_object(obj, self.object_path(path))
+                if objects[path] is None or obj["exports"] != objects[path]["exports"]:
+                    changed = True
+                objects[path] = obj
+                self.compiled.append(path)
+            if not changed:
+                break
+        return [objects[path] for path in self.paths]
+
+    def link_order(self, objects):
+        # Un programa principal se ejecuta despues de los archivos cuyas variables globales
+        # lee en su nivel superior; las lecturas dentro de funciones no fijan orden porque
+        # se resuelven al llamar. Los ciclos se agrupan (componentes fuertemente conexas)
+        # y conservan el orden de la linea de comandos, que tambien desempata
+        position = {obj["path"]: i for i, obj in enumerate(objects)}
+        owners = {}
+        for obj in objects:
+            for name, export in obj["exports"].items():
+                if export["kind"] == "variable":
+                    owners.setdefault(name, obj["path"])
+        deps = {}
+        for obj in objects:
+            path = obj["path"]
+            deps[path] = {owners[name] for name in obj["top_level_reads"] if owners.get(name, path) != path}
+        component = _components(list(position), deps)
+        members = {}
+        for path in position:
+            members.setdefault(component[path], []).append(path)
+        pending = {c: {component[dep] for path in paths for dep in deps[path]} - {c} for c, paths in members.items()}
+        ordered = []
+        while pending:
+            ready = min((c for c, needed in pending.items() if not needed), key=lambda c: position[members[c][0]])
+            del pending[ready]
+            for needed in pending.values():
+                needed.discard(ready)
+            ordered.extend(objects[position[path]] for path in members[ready])
+        return ordered
+
+    def run(self):
+        objects = self.compile()
+        for path in self.compiled:
+            print(f"Compilado {path}", file=self.stream)
+        errors = [f"{obj['path']}: {error}" for obj in objects for error in obj["errors"]]
+        if errors:
+            for error in errors:
+                print(error, file=self.stream)
+            return None
+        try:
+            return Linker().link_binary(self.link_order(objects))
+        except LinkError as exc:
+            for error in exc.errors:
+                print(error, file=self.stream)
+            return None
+
+
+def _components(paths, deps):
+    # Tarjan: numero de componente fuertemente conexa de cada archivo
+    index, low, component = {}, {}, {}
+    stack, on_stack = [], set()
+    count = 0
+
+    def visit(path):
+        nonlocal count
+        index[path] = low[path] = len(index)
+        stack.append(path)
+        on_stack.add(path)
+        for dep in deps[path]:
+            if dep not in index:
+                visit(dep)
+                low[path] = min(low[path], low[dep])
+            elif dep in on_stack:
+                low[path] = min(low[path], index[dep])
+        if low[path] == index[path]:
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                component[member] = count
+                if member == path:
+                    break
+            count += 1
+
+    for path in paths:
+        if path not in index:
+            visit(path)
+    return component
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compila archivos .js por separado y los enlaza.")
+    parser.add_argument("paths", nargs="+", help="Archivos fuente")
+    parser.add_argument("--build-dir", default="build", help="Directorio de objetos")
+    parser.add_argument("-o", "--output", help="Archivo de bytecode enlazado")
+    parser.add_argument("--run", action="store_true", help="Ejecuta el programa enlazado en la VM")
+    args = parser.parse_args(argv)
+    program = Build(args.paths, build_dir=args.build_dir).run()
+    if program is None:
+        return 1
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write("\n".join(program["binary"]) + "\n")
+    else:
+        print("\n".join(program["binary"]))
+    if args.run:
+        from codegen import StackVM
+
+        StackVM().run(program["instructions"], program["function_table"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
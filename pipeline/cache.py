@@ -0,0 +1,200 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+
+def source_key(source):
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def tokens_key(tokens):
+    # Incluye posiciones: el AST y los mensajes de error dependen de ellas
+    digest = hashlib.blake2b(digest_size=16)
+    for tok in tokens:
+        digest.update(f"{tok.tipo}\x1f{tok.valor}\x1f{tok.linea}\x1f{tok.columna}\x1e".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def ast_key(root):
+    # Huella estructural (sin posiciones) en preorden con numero de hijos, sin recursion
+    digest = hashlib.blake2b(digest_size=16)
+    pendientes = [root] if root is not None else []
+    while pendientes:
+        node = pendientes.pop()
+        valor = "" if node.valor is None else str(node.valor)
+        digest.update(f"{node.tipo}\x1f{valor}\x1f{len(node.hijos)}\x1e".encode("utf-8"))
+        pendientes.extend(reversed(node.hijos))
+    return digest.hexdigest()
+
+
+def estimate_size(obj):
+    # Aproximacion del tamaño en memoria de un resultado (contenedores y objetos con __dict__)
+    total = 0
+    seen = set()
+    pendientes = [obj]
+    while pendientes:
+        current = pendientes.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            pendientes.extend(current.keys())
+            pendientes.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            pendientes.extend(current)
+        elif hasattr(current, "__dict__"):
+            pendientes.append(vars(current))
+    return total
+
+
+class PhaseCache:
+    """Cache LRU acotada por memoria estimada, con contadores por fase."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+        self.evictions = 0
+
+    def get_or_compute(self, phase, key, compute):
+        entry_key = (phase, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                self._entries.move_to_end(entry_key)
+                self.hits[phase] = self.hits.get(phase, 0) + 1
+                return entry[0]
+            self.misses[phase] = self.misses.get(phase, 0) + 1
+        value = compute()
+        size = estimate_size(value)
+        with self._lock:
+            if size > self.max_bytes:
+                # Un resultado mas grande que el presupuesto completo no se guarda
+                return value
+            previous = self._entries.pop(entry_key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[entry_key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            phases = sorted(set(self.hits) | set(self.misses))
+            return {
+                "phases": {
+                    phase: {"hits": self.hits.get(phase, 0), "misses": self.misses.get(phase, 0)}
+                    for phase in phases
+                },
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class CompileCache:
+    """Ejecuta las fases del compilador memoizando cada una con su propia clave.
+
+    - lexer: hash del codigo fuente
+    - parser y semantico: hash de los tokens (con posiciones)
+    - codegen: huella estructural del AST, reutilizable aunque cambien lineas/columnas
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.store = PhaseCache(max_bytes)
+
+    def lex(self, source, checkpoint=None):
+        def compute():
+            from lexer.lexer import Lexer
+
+            lexer = Lexer(source)
+            lexer.checkpoint = checkpoint
+            tokens = lexer.analizar()
+            return tokens, lexer.exportar_columnas()
+
+        return self.store.get_or_compute("lexer", source_key(source), compute)
+
+    def parse(self, tokens, key=None, checkpoint=None):
+        def compute():
+            from parser.parser import Parser
+
+            parser = Parser(tokens)
+            parser.checkpoint = checkpoint
+            arbol = parser.parsear()
+            return arbol, list(parser.detectar_errores())
+
+        return self.store.get_or_compute("parser", key or tokens_key(tokens), compute)
+
+    def analyze(self, arbol, key, checkpoint=None, analyzer=None):
+        # analyzer permite pasar un analizador propio (p. ej. IncrementalSemanticAnalyzer)
+        def compute():
+            from semantic.semantic import SemanticAnalyzer
+
+            semantic = analyzer or SemanticAnalyzer()
+            semantic.checkpoint = checkpoint
+            errors = list(semantic.analyze(arbol))
+            return errors, semantic.get_symbol_columns()
+
+        return self.store.get_or_compute("semantic", key, compute)
+
+    def generate(self, arbol, key=None, checkpoint=None):
+        def compute():
+            from codegen import BytecodeGenerator
+
+            codegen = BytecodeGenerator()
+            codegen.checkpoint = checkpoint
+            return codegen.generate(arbol)
+
+        return self.store.get_or_compute("codegen", key or ast_key(arbol), compute)
+
+    def position_table(self, arbol, key):
+        # La tabla de posiciones depende de lineas y columnas: se indexa por los tokens
+        def compute():
+            from codegen import BytecodeGenerator
+
+            codegen = BytecodeGenerator()
+            codegen.generate(arbol)
+            return codegen.position_table().data
+
+        return self.store.get_or_compute("positions", key, compute)
+
+    def compile(self, source, checkpoint=None, analyzer=None, positions=False):
+        # Si el checkpoint interrumpe una fase, su resultado parcial no se guarda en cache.
+        # positions=True agrega la tabla de posiciones codificada (clave "positions")
+        tokens, token_columns = self.lex(source, checkpoint)
+        tok_key = tokens_key(tokens)
+        arbol, syntax_errors = self.parse(tokens, tok_key, checkpoint)
+        semantic_errors, symbol_columns = self.analyze(arbol, tok_key, checkpoint, analyzer)
+        structure_key = ast_key(arbol)
+        bytecode = self.generate(arbol, structure_key, checkpoint)
+        result = {
+            "tokens": tokens,
+            "token_columns": token_columns,
+            "ast": arbol,
+            "ast_key": structure_key,
+            "syntax_errors": syntax_errors,
+            "semantic_errors": semantic_errors,
+            "symbols": symbol_columns,
+            "bytecode": bytecode,
+        }
+        if positions:
+            result["positions"] = self.position_table(arbol, tok_key)
+        return result
+
+    def stats(self):
+        return self.store.stats()
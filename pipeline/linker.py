@@ -0,0 +1,168 @@
+import hashlib
+import json
+
+OBJECT_VERSION = 3
+
+
+class LinkError(Exception):
+    """Referencias sin resolver o exportaciones duplicadas al enlazar."""
+
+    def __init__(self, errors):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def export_signature(export):
+    return [export["kind"], export["data_type"]]
+
+
+def compile_object(source, path="<fuente>", imports=None):
+    """Compila un archivo a un objeto independiente (dict serializable a JSON).
+
+    imports: exportaciones de otros archivos {nombre: {"kind", "data_type"}} visibles
+    durante el analisis semantico. El objeto guarda su bytecode (programa principal
+    sin HALT y unidades de funcion), los simbolos globales que exporta, las
+    referencias que quedan pendientes para el enlazador, las variables que lee su
+    programa principal (las que fijan el orden de enlace) y el indice en la tabla de
+    funciones de cada funcion de nivel superior (las anidadas no se exportan).
+    """
+    from codegen import BytecodeGenerator
+    from lexer.lexer import Lexer
+    from parser.parser import Parser
+    from semantic.semantic import SemanticAnalyzer, Symbol
+
+    imports = imports or {}
+    tokens = Lexer(source).analizar()
+    parser = Parser(tokens)
+    arbol = parser.parsear()
+    semantic = SemanticAnalyzer()
+    semantic.externals = [
+        Symbol(name=name, kind="import", data_type=info["data_type"]) for name, info in sorted(imports.items())
+    ]
+    semantic_errors = semantic.analyze(arbol)
+    generator = BytecodeGenerator()
+    instructions = generator.generate(arbol, binary=False)
+
+    exports = {}
+    for name, symbol in semantic.global_scope.symbols.items():
+        if symbol.kind in {"variable", "function"}:
+            exports[name] = {"kind": symbol.kind, "data_type": symbol.data_type}
+    used_imports = {
+        name: export_signature(imports[name])
+        for name, symbol in semantic.global_scope.symbols.items()
+        if symbol.kind == "import" and symbol.uses
+    }
+    unresolved = set(semantic.unresolved_names) | set(used_imports)
+    for opcode, operand in instructions:
+        if opcode == "CALL":
+            target = str(operand).rpartition(":")[0]
+            if "." not in target:
+                unresolved.add(target)
+
+    main_end = next(i for i, (opcode, _) in enumerate(instructions) if opcode == "HALT")
+    return {
+        "version": OBJECT_VERSION,
+        "path": path,
+        "source_hash": hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest(),
+        "main": [list(instr) for instr in instructions[:main_end]],
+        "functions": [
+            [name, [list(instr) for instr in instructions[offset:offset + length]]]
+            for name, offset, length in generator.function_table
+        ],
+        "exports": exports,
+        "top_level_functions": dict(generator.function_index.scopes[None]),
+        "imports": used_imports,
+        "unresolved": sorted(unresolved - set(exports)),
+        "top_level_reads": sorted({operand for opcode, operand in instructions[:main_end] if opcode == "LOAD_VAR"}),
+        "errors": parser.detectar_errores() + semantic_errors,
+    }
+
+
+def save_object(obj, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f)
+
+
+def load_object(path):
+    with open(path, "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    if obj.get("version") != OBJECT_VERSION:
+        raise ValueError(f"Version de objeto no soportada en {path}")
+    return obj
+
+
+def _operand(opcode, operand):
+    # JSON convierte las tuplas (indice, argc) en listas
+    if opcode in {"CALL_FUNC", "CALL_BUILTIN"}:
+        return tuple(operand)
+    return operand
+
+
+class Linker:
+    """Une objetos en un unico programa y resuelve las referencias entre archivos.
+
+    Los programas principales se concatenan en el orden recibido, seguidos de un HALT
+    y de todas las unidades de funcion. Los CALL_FUNC locales se desplazan al indice
+    global y los CALL por nombre hacia funciones exportadas por otro objeto se
+    reescriben como CALL_FUNC.
+    """
+
+    def link(self, objects):
+        errors = []
+        owners = {}
+        function_index = {}
+        bases = []
+        total_functions = 0
+        for obj in objects:
+            bases.append(total_functions)
+            top_level = obj["top_level_functions"]
+            for name, export in obj["exports"].items():
+                if name in owners:
+                    errors.append(f"'{name}' se exporta en {owners[name]} y en {obj['path']}")
+                    continue
+                owners[name] = obj["path"]
+                if export["kind"] == "function" and name in top_level:
+                    # Solo las funciones de nivel superior: una anidada con el mismo nombre
+                    # no es visible desde otros archivos
+                    function_index[name] = total_functions + top_level[name]
+            total_functions += len(obj["functions"])
+        for obj in objects:
+            for name in obj["unresolved"]:
+                if name not in owners:
+                    errors.append(f"Referencia no resuelta a '{name}' en {obj['path']}")
+        if errors:
+            raise LinkError(errors)
+
+        instructions = []
+        for obj, base in zip(objects, bases):
+            instructions.extend(self._relocate(obj["main"], base, function_index))
+        instructions.append(("HALT", None))
+        function_table = []
+        for obj, base in zip(objects, bases):
+            for name, body in obj["functions"]:
+                offset = len(instructions)
+                instructions.extend(self._relocate(body, base, function_index))
+                function_table.append((name, offset, len(instructions) - offset))
+        return {"instructions": instructions, "function_table": function_table}
+
+    def _relocate(self, code, base, function_index):
+        relocated = []
+        for opcode, operand in code:
+            operand = _operand(opcode, operand)
+            if opcode == "CALL_FUNC":
+                operand = (operand[0] + base, operand[1])
+            elif opcode == "CALL":
+                target, _, argc = str(operand).rpartition(":")
+                if target in function_index:
+                    opcode, operand = "CALL_FUNC", (function_index[target], int(argc))
+            relocated.append((opcode, operand))
+        return relocated
+
+    def link_binary(self, objects):
+        from codegen import BytecodeGenerator
+
+        program = self.link(objects)
+        generator = BytecodeGenerator()
+        program["binary"] = generator.encode(program["instructions"])
+        program["symbol_ids"] = generator.symbol_ids
+        return program
@@ -0,0 +1,83 @@
+import json
+import sys
+
+FORMATS = ("text", "json", "jsonl")
+SECTIONS = ("tokens", "ast", "symbols", "optimization", "bytecode", "positions")
+
+
+class OutputWriter:
+    """Escritor con buffer que transmite las secciones de salida a medida que se producen.
+
+    - text: el formato legible de siempre, una linea por elemento.
+    - jsonl: un objeto JSON por linea con la clave "section".
+    - json: un unico documento {"seccion": [...], ...} escrito de forma incremental.
+    Las escrituras se acumulan y se vuelcan al stream en bloques de `buffer_size` caracteres.
+    """
+
+    def __init__(self, stream=None, fmt="text", buffer_size=1 << 16):
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato de salida desconocido: {fmt}")
+        self.stream = stream or sys.stdout
+        self.fmt = fmt
+        self.buffer_size = buffer_size
+        self._chunks = []
+        self._pending = 0
+        self._section = None
+        self._first_item = True
+        self._first_section = True
+
+    def _write(self, text):
+        self._chunks.append(text)
+        self._pending += len(text)
+        if self._pending >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._chunks:
+            self.stream.write("".join(self._chunks))
+            self._chunks = []
+            self._pending = 0
+        self.stream.flush()
+
+    def _open_key(self, name):
+        self._write(("{" if self._first_section else ",") + f"\n{json.dumps(name)}: ")
+        self._first_section = False
+
+    def begin(self, name, title=None):
+        self._section = name
+        self._first_item = True
+        if self.fmt == "text":
+            if title is not None:
+                self._write(f"\n{title}\n")
+        elif self.fmt == "json":
+            self._open_key(name)
+            self._write("[")
+
+    def item(self, text, data):
+        if self.fmt == "text":
+            self._write(f"{text}\n")
+        elif self.fmt == "jsonl":
+            self._write(json.dumps({"section": self._section, "data": data}, ensure_ascii=False) + "\n")
+        else:
+            self._write(("" if self._first_item else ",") + "\n" + json.dumps(data, ensure_ascii=False))
+        self._first_item = False
+
+    def end(self):
+        if self.fmt == "json":
+            self._write("\n]")
+        self._section = None
+
+    def value(self, name, title, text, data):
+        # Seccion de un solo valor (resumen, tabla de posiciones, reporte de optimizacion)
+        if self.fmt == "text":
+            self._write(f"\n{title}\n{text}\n" if title else f"{text}\n")
+        elif self.fmt == "jsonl":
+            self._write(json.dumps({"section": name, "data": data}, ensure_ascii=False) + "\n")
+        else:
+            self._open_key(name)
+            self._write(json.dumps(data, ensure_ascii=False))
+
+    def close(self):
+        if self.fmt == "json":
+            self._write("{}\n" if self._first_section else "\n}\n")
+        self.flush()
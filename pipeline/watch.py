@@ -0,0 +1,147 @@
+import argparse
+import os
+import sys
+import time
+
+from .cache import CompileCache
+
+
+class Watcher:
+    """Recompila archivos .js cuando cambian, detectados por sondeo de mtime y tamaño.
+
+    Las rafagas de guardados se agrupan: tras detectar un cambio se espera a que los
+    archivos permanezcan estables durante `debounce` segundos. Cada archivo conserva
+    su propio IncrementalSemanticAnalyzer y todos comparten una CompileCache, de modo
+    que las fases cuyo resultado no cambio se reutilizan.
+    """
+
+    def __init__(self, paths, interval=0.5, debounce=0.3, cache=None, stream=None):
+        self.paths = list(paths)
+        self.interval = interval
+        self.debounce = debounce
+        self.cache = cache or CompileCache()
+        self.stream = stream or sys.stdout
+        self.snapshot = {}
+        self._analyzers = {}
+
+    def scan(self):
+        signatures = {}
+        for root in self.paths:
+            if os.path.isdir(root):
+                for dirpath, _, filenames in os.walk(root):
+                    for filename in filenames:
+                        if filename.endswith(".js"):
+                            self._stat(os.path.join(dirpath, filename), signatures)
+            else:
+                self._stat(root, signatures)
+        return signatures
+
+    def _stat(self, path, signatures):
+        try:
+            info = os.stat(path)
+        except OSError:
+            return
+        signatures[path] = (info.st_mtime_ns, info.st_size)
+
+    def poll(self):
+        # Devuelve los archivos nuevos o modificados y los eliminados desde el ultimo sondeo
+        current = self.scan()
+        changed = {path for path, signature in current.items() if self.snapshot.get(path) != signature}
+        removed = set(self.snapshot) - set(current)
+        self.snapshot = current
+        return changed, removed
+
+    def wait_for_quiet(self, changed):
+        # Debounce: sigue acumulando cambios hasta que no haya modificaciones nuevas
+        deadline = time.monotonic() + self.debounce
+        while time.monotonic() < deadline:
+            time.sleep(min(self.interval, self.debounce) / 2)
+            more, _ = self.poll()
+            if more:
+                changed |= more
+                deadline = time.monotonic() + self.debounce
+        return changed
+
+    def compile_file(self, path):
+        from semantic.incremental import IncrementalSemanticAnalyzer
+
+        started = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        analyzer = self._analyzers.setdefault(path, IncrementalSemanticAnalyzer())
+        before = self.cache.stats()["phases"]
+        result = self.cache.compile(source, analyzer=analyzer)
+        elapsed = time.perf_counter() - started
+        after = self.cache.stats()["phases"]
+        reused = sorted(
+            phase
+            for phase, counts in after.items()
+            if counts["hits"] > before.get(phase, {}).get("hits", 0)
+        )
+        if "semantic" not in reused and analyzer.reused:
+            total = analyzer.reused + analyzer.reanalyzed
+            reused.append(f"semantic {analyzer.reused}/{total} sentencias")
+        return result, elapsed, reused
+
+    def report(self, path, result, elapsed, reused):
+        write = self.stream.write
+        stamp = time.strftime("%H:%M:%S")
+        errors = result["syntax_errors"] + result["semantic_errors"]
+        write(
+            f"[{stamp}] {path}: {len(result['tokens'])} tokens, {len(result['bytecode'])} instrucciones, "
+            f"{len(errors)} errores en {elapsed * 1000:.1f} ms"
+            f" (reutilizado: {', '.join(reused) if reused else 'nada'})\n"
+        )
+        for error in errors:
+            write(f"    {error}\n")
+        self.stream.flush()
+
+    def recompile(self, paths):
+        for path in sorted(paths):
+            # Un archivo que no se puede leer o compilar se informa sin detener la vigilancia
+            try:
+                result, elapsed, reused = self.compile_file(path)
+            except OSError as exc:
+                self.stream.write(f"No se pudo leer {path}: {exc}\n")
+                continue
+            except UnicodeDecodeError as exc:
+                self.stream.write(f"No se pudo leer {path}: no es UTF-8 valido ({exc.reason})\n")
+                continue
+            except Exception as exc:  # noqa: BLE001
+                # El analizador incremental pudo quedar a medias: se descarta
+                self._analyzers.pop(path, None)
+                self.stream.write(f"No se pudo compilar {path}: {type(exc).__name__}: {exc}\n")
+                continue
+            self.report(path, result, elapsed, reused)
+
+    def run(self, iterations=None):
+        changed, _ = self.poll()
+        self.recompile(changed)
+        count = 0
+        while iterations is None or count < iterations:
+            count += 1
+            time.sleep(self.interval)
+            changed, removed = self.poll()
+            for path in removed:
+                self._analyzers.pop(path, None)
+                self.stream.write(f"Eliminado: {path}\n")
+            if changed:
+                self.recompile(self.wait_for_quiet(changed))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompila archivos .js al detectar cambios.")
+    parser.add_argument("paths", nargs="*", default=["samples"], help="Archivos o directorios a vigilar")
+    parser.add_argument("--interval", type=float, default=0.5, help="Segundos entre sondeos")
+    parser.add_argument("--debounce", type=float, default=0.3, help="Segundos de calma antes de recompilar")
+    args = parser.parse_args(argv)
+    watcher = Watcher(args.paths, interval=args.interval, debounce=args.debounce)
+    print(f"Vigilando {', '.join(args.paths)} (Ctrl+C para salir)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
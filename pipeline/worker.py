@@ -0,0 +1,126 @@
+import threading
+import time
+
+
+class CompileCancelled(Exception):
+    """Se lanza desde un punto de control cuando la compilacion debe detenerse."""
+
+
+def _current_rss():
+    # Memoria residente actual en bytes (Linux); None si no se puede medir
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    import os
+
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class CompileBudget:
+    """Punto de control cooperativo con limite de tiempo y de memoria.
+
+    Las fases lo invocan como checkpoint(fase, procesados, parcial); registra el
+    progreso y el ultimo resultado parcial de cada fase y lanza CompileCancelled
+    cuando se agota el presupuesto o se solicita la cancelacion.
+    """
+
+    MEMORY_CHECK_EVERY = 64
+
+    def __init__(self, time_limit=None, memory_limit_mb=None):
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.phase = None
+        self.progress = {}
+        self.partial = {}
+        self.reason = None
+        self._cancel = threading.Event()
+        self._deadline = None
+        self._base_rss = None
+        self._calls = 0
+
+    def start(self):
+        self._deadline = time.monotonic() + self.time_limit if self.time_limit else None
+        self._base_rss = _current_rss() if self.memory_limit else None
+
+    def cancel(self, reason="Cancelada por el usuario"):
+        self.reason = reason
+        self._cancel.set()
+
+    def __call__(self, phase, processed, partial=None):
+        self.phase = phase
+        self.progress[phase] = processed
+        if partial is not None:
+            self.partial[phase] = partial
+        if self._cancel.is_set():
+            raise CompileCancelled(self.reason)
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self.reason = f"Tiempo limite de {self.time_limit:g} s excedido en la fase '{phase}'"
+            raise CompileCancelled(self.reason)
+        self._calls += 1
+        if self._base_rss is not None and not self._calls % self.MEMORY_CHECK_EVERY:
+            rss = _current_rss()
+            if rss is not None and rss - self._base_rss > self.memory_limit:
+                self.reason = f"Limite de memoria de {self.memory_limit // (1024 * 1024)} MiB excedido en la fase '{phase}'"
+                raise CompileCancelled(self.reason)
+
+
+class CompileJob:
+    """Compilacion en un hilo de fondo con presupuesto y resultados parciales."""
+
+    def __init__(self, source, budget=None, cache=None):
+        from .cache import CompileCache
+
+        self.source = source
+        self.budget = budget or CompileBudget()
+        self.cache = cache or CompileCache()
+        self.status = "pending"
+        self.result = None
+        self.error = None
+        self.elapsed = None
+        self._thread = threading.Thread(target=self._run, name="compile-job", daemon=True)
+
+    def start(self):
+        self.status = "running"
+        self._thread.start()
+        return self
+
+    def _run(self):
+        started = time.perf_counter()
+        self.budget.start()
+        try:
+            self.result = self.cache.compile(self.source, checkpoint=self.budget)
+            self.status = "done"
+        except CompileCancelled:
+            self.result = self.partial_result()
+            self.status = "cancelled"
+        except Exception as exc:  # noqa: BLE001
+            self.error = exc
+            self.status = "error"
+        finally:
+            self.elapsed = time.perf_counter() - started
+
+    def cancel(self, reason="Cancelada por el usuario"):
+        self.budget.cancel(reason)
+
+    def done(self):
+        return self.status in {"done", "cancelled", "error"}
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done()
+
+    def progress(self):
+        return {"phase": self.budget.phase, **self.budget.progress}
+
+    def partial_result(self):
+        partial = self.budget.partial
+        tokens = list(partial.get("lexer", []))
+        return {
+            "tokens": tokens,
+            "ast": partial.get("parser"),
+            "semantic_errors": list(partial.get("semantic", [])),
+            "instructions": list(partial.get("codegen", [])),
+            "reason": self.budget.reason,
+        }
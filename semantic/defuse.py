@@ -0,0 +1,131 @@
+class DefUseIndex:
+    """Indice definicion-uso que el analizador semantico llena durante su recorrido.
+
+    - Ambitos como arreglos planos: scope_names[i] y scope_parents[i] (-1 en la raiz);
+      scope_ids traduce cada SymbolTable a su indice.
+    - definitions: nombre -> simbolos con ese nombre en todos los ambitos.
+    - references: simbolo -> posiciones (linea, columna) de cada uso.
+    - Cada sitio de definicion o uso se indexa por posicion para ir a la definicion.
+
+    Durante el recorrido solo se anotan pares (simbolo, nodo); los diccionarios se
+    construyen una vez en la primera consulta. A partir de ahi las consultas son O(1)
+    salvo las que recorren la cadena de ambitos.
+    """
+
+    def __init__(self):
+        self.scope_names = []
+        self.scope_parents = []
+        self.scope_ids = {}
+        self._definitions = {}
+        self._references = {}
+        self._sites = {}
+        self._unused = []
+        self._pending_definitions = []
+        self._pending_references = []
+
+    def add_scope(self, scope):
+        self.scope_ids[scope] = len(self.scope_names)
+        self.scope_names.append(scope.scope_name)
+        self.scope_parents.append(self.scope_ids.get(scope.parent, -1))
+
+    def add_definition(self, symbol):
+        self._pending_definitions.append(symbol)
+
+    def add_reference(self, symbol, node):
+        self._pending_references.append((symbol, node))
+
+    def mark(self):
+        # Posicion actual de las referencias anotadas: references_since(marca) devuelve
+        # las anotadas despues, p. ej. las de una sola sentencia
+        return len(self._pending_references)
+
+    def references_since(self, mark):
+        return self._pending_references[mark:]
+
+    def _build(self):
+        if not (self._pending_definitions or self._pending_references):
+            return
+        definitions, references, sites = self._definitions, self._references, self._sites
+        for symbol in self._pending_definitions:
+            definitions.setdefault(symbol.name, []).append(symbol)
+            references.setdefault(symbol, [])
+            site = self.definition_site(symbol)
+            if site is not None:
+                sites[site] = symbol
+        for symbol, node in self._pending_references:
+            site = (node.linea, node.columna)
+            references[symbol].append(site)
+            sites[site] = symbol
+        self._pending_definitions = []
+        self._pending_references = []
+        self._unused = [
+            symbol
+            for symbols in definitions.values()
+            for symbol in symbols
+            if not references[symbol] and symbol.kind not in {"builtin", "import"}
+        ]
+
+    @property
+    def definitions(self):
+        self._build()
+        return self._definitions
+
+    @property
+    def references(self):
+        self._build()
+        return self._references
+
+    @staticmethod
+    def definition_site(symbol):
+        # Posicion del identificador declarado (hijo 0 de la declaracion)
+        node = symbol.node
+        if node is None:
+            return None
+        if node.hijos and node.hijos[0].linea is not None:
+            node = node.hijos[0]
+        if node.linea is None:
+            return None
+        return (node.linea, node.columna)
+
+    def symbol_at(self, linea, columna):
+        # Simbolo cuyo uso o definicion empieza en (linea, columna)
+        self._build()
+        return self._sites.get((linea, columna))
+
+    def definition_at(self, linea, columna):
+        symbol = self.symbol_at(linea, columna)
+        return self.definition_site(symbol) if symbol is not None else None
+
+    def references_at(self, linea, columna):
+        symbol = self.symbol_at(linea, columna)
+        return list(self._references[symbol]) if symbol is not None else []
+
+    def definitions_of(self, name):
+        return list(self.definitions.get(name, ()))
+
+    def unused(self):
+        # Simbolos declarados en el programa que nunca se leen
+        self._build()
+        return list(self._unused)
+
+    def scope_chain(self, scope):
+        chain = []
+        index = scope if isinstance(scope, int) else self.scope_ids[scope]
+        while index != -1:
+            chain.append(index)
+            index = self.scope_parents[index]
+        return chain
+
+    def shadowing(self, name):
+        # Pares (simbolo, simbolo_ocultado) donde una declaracion oculta otra del mismo
+        # nombre en un ambito exterior
+        by_scope = {self.scope_ids[symbol.scope]: symbol for symbol in self.definitions.get(name, ())}
+        pairs = []
+        for index, symbol in by_scope.items():
+            parent = self.scope_parents[index]
+            while parent != -1:
+                if parent in by_scope:
+                    pairs.append((symbol, by_scope[parent]))
+                    break
+                parent = self.scope_parents[parent]
+        return pairs
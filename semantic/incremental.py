@@ -0,0 +1,218 @@
+from collections import Counter, deque
+from itertools import islice
+
+from semantic.semantic import SemanticAnalyzer
+
+
+class _StatementEntry:
+    # Resultado reutilizable del analisis de una sentencia de nivel superior. Las
+    # referencias a nodos se guardan como indices en preorden para poder aplicarlas
+    # a un AST nuevo con la misma estructura aunque cambien lineas y columnas.
+    __slots__ = (
+        "deps",
+        "defined",
+        "scopes",
+        "top_scopes",
+        "symbol_nodes",
+        "errors",
+        "reads",
+        "references",
+        "declared",
+        "owner_reads",
+        "unresolved_owners",
+        "unresolved_names",
+    )
+
+
+class IncrementalSemanticAnalyzer(SemanticAnalyzer):
+    """Analizador semantico que reutiliza resultados entre llamadas a analyze().
+
+    Mantiene un grafo de dependencias de cada sentencia de nivel superior hacia los
+    nombres globales que define o lee. Una sentencia se vuelve a analizar solo si su
+    estructura cambio o si cambio la definicion visible (tipo, categoria,
+    mutabilidad) de alguno de esos nombres; el resto reutiliza ambitos, simbolos y
+    diagnosticos de la ejecucion anterior.
+
+    Reproducir una sentencia cuesta casi lo mismo que analizar una corta: las
+    sentencias con menos de `min_tokens` tokens (segun la huella del parser) se
+    analizan siempre sin guardar resultados. Con min_tokens=0 se reutiliza todo.
+    Guardar los resultados de una sentencia cuesta mas que solo analizarla, asi que
+    el analisis inicial, o un cambio que invalida casi todo el archivo, es mas lento
+    que con SemanticAnalyzer.
+    """
+
+    def __init__(self, hash_consing=False, min_tokens=16):
+        self.min_tokens = min_tokens
+        super().__init__(hash_consing)
+
+    def reset(self):
+        # Ademas del estado de la ejecucion, olvida las sentencias de la anterior
+        super().reset()
+        self._entries = {}
+        self._capture = None
+        self.reanalyzed = 0
+        self.reused = 0
+
+    def _visit_Program(self, node, scope):
+        previous = self._entries
+        self._entries = {}
+        self.reanalyzed = 0
+        self.reused = 0
+        for stmt in node.hijos:
+            self._checkpoint()
+            # La huella del parser evita recorrer la estructura; un AST construido o
+            # copiado sin ella usa la huella estructural
+            key = getattr(stmt, "huella", None)
+            if key is not None and len(key[1]) < self.min_tokens:
+                self._visit(stmt, scope)
+                self.reanalyzed += 1
+                continue
+            nodes = self._nodes(stmt)
+            if key is None:
+                key = self._fingerprint(nodes)
+            candidates = previous.get(key)
+            entry = candidates.popleft() if candidates else None
+            if entry is not None and self._deps_match(entry):
+                self._replay(entry, nodes)
+                self.reused += 1
+            else:
+                entry = self._analyze_statement(stmt, scope, nodes)
+                self.reanalyzed += 1
+            self._entries.setdefault(key, deque()).append(entry)
+
+    @staticmethod
+    def _nodes(stmt):
+        # Nodos de la sentencia en anchura: el orden (y con el los indices guardados en
+        # las entradas) solo depende de la estructura
+        nodes = [stmt]
+        for node in nodes:
+            nodes.extend(node.hijos)
+        return nodes
+
+    @staticmethod
+    def _fingerprint(nodes):
+        # Huella estructural sin posiciones: con el numero de hijos de cada nodo el
+        # recorrido en anchura determina el arbol
+        return tuple([(node.tipo, node.valor, len(node.hijos)) for node in nodes])
+
+    def _binding(self, name):
+        symbol = self.global_scope.symbols.get(name)
+        if symbol is None:
+            return None
+        return (symbol.kind, symbol.data_type, symbol.mutable)
+
+    def _deps_match(self, entry):
+        symbols = self.global_scope.symbols
+        for name, binding in entry.deps.items():
+            symbol = symbols.get(name)
+            if binding != (None if symbol is None else (symbol.kind, symbol.data_type, symbol.mutable)):
+                return False
+        return True
+
+    def _analyze_statement(self, stmt, scope, nodes):
+        entry = _StatementEntry()
+        # Sobreaproximacion segura: todo identificador de la sentencia es una dependencia
+        names = {node.valor for node in nodes if node.tipo == "Identifier"}
+        entry.deps = {name: self._binding(name) for name in names}
+        index_of = {node: i for i, node in enumerate(nodes)}
+        defined_before = len(scope.symbols)
+        scopes_before = len(self._all_scopes)
+        owners_before = len(self.declared_symbols)
+        references_mark = self.index.mark()
+        # Los nombres sin resolver de la sentencia se juntan en un conjunto propio
+        unresolved = self.unresolved_names
+        self.unresolved_names = set()
+        self._capture = []
+        try:
+            self._visit(stmt, scope)
+            errors = self._capture
+        finally:
+            self._capture = None
+            entry.unresolved_names = self.unresolved_names
+            self.unresolved_names = unresolved
+            unresolved.update(entry.unresolved_names)
+        # Los simbolos nuevos son los ultimos insertados en el diccionario del ambito
+        new_count = len(scope.symbols) - defined_before
+        entry.defined = list(islice(reversed(scope.symbols.values()), new_count))[::-1]
+        entry.scopes = self._all_scopes[scopes_before:]
+        entry.top_scopes = [child for child in entry.scopes if child.parent is scope]
+        local_symbols = [symbol for table in entry.scopes for symbol in table.symbols.values()]
+        entry.symbol_nodes = [
+            (symbol, index_of[symbol.node]) for symbol in entry.defined + local_symbols if symbol.node in index_of
+        ]
+        entry.errors = [(message, index_of.get(node)) for message, node in errors]
+        global_scope = self.global_scope
+        entry.references = [
+            (symbol.name if symbol.scope is global_scope else symbol, index_of[node])
+            for symbol, node in self.index.references_since(references_mark)
+        ]
+        # Cada lectura se registra junto con su referencia y los usos solo se suman:
+        # basta con cuantas referencias hubo de cada simbolo
+        entry.reads = list(Counter(token for token, _ in entry.references).items())
+        # Los nodos declarados en la sentencia son los ultimos insertados en
+        # declared_symbols: el costo no depende del tamaño del archivo
+        new_owners = len(self.declared_symbols) - owners_before
+        owners = list(islice(reversed(self.declared_symbols), new_owners))[::-1]
+        entry.declared = []
+        entry.owner_reads = []
+        for node in owners:
+            index = index_of[node]
+            symbol = self.declared_symbols[node]
+            entry.declared.append((index, symbol if symbol is None else self._read_token(symbol)))
+            reads = self.owner_reads[node]
+            entry.owner_reads.append(
+                (index, [symbol.name if symbol.scope is global_scope else symbol for symbol in reads])
+            )
+        entry.unresolved_owners = [index_of[node] for node in owners if node in self.unresolved_owners]
+        return entry
+
+    def _read_token(self, symbol):
+        # Los simbolos globales se guardan por nombre (str) y se vuelven a resolver; los
+        # locales se conservan
+        if symbol.scope is self.global_scope:
+            return symbol.name
+        return symbol
+
+    def _replay(self, entry, nodes):
+        # Se recorre en cada reutilizacion: resolucion de simbolos en linea y listas vacias
+        # (la mayoria de sentencias no declaran funciones) sin llamadas
+        scope = self.global_scope
+        symbols = scope.symbols
+        index = self.index
+        for symbol in entry.defined:
+            symbol.uses = 0
+            scope.define(symbol)
+            index.add_definition(symbol)
+        if entry.scopes:
+            for child in entry.top_scopes:
+                child.parent = scope
+                scope.children.append(child)
+            for table in entry.scopes:
+                self._add_scope(table)
+                for symbol in table.symbols.values():
+                    # Los usos se vuelven a contar con entry.reads, tambien los de los locales
+                    symbol.uses = 0
+                    index.add_definition(symbol)
+        for symbol, position in entry.symbol_nodes:
+            symbol.node = nodes[position]
+        for token, position in entry.references:
+            index.add_reference(symbols[token] if type(token) is str else token, nodes[position])
+        for token, count in entry.reads:
+            (symbols[token] if type(token) is str else token).uses += count
+        for message, position in entry.errors:
+            self._error(message, nodes[position] if position is not None else None)
+        declared = self.declared_symbols
+        for position, token in entry.declared:
+            declared[nodes[position]] = None if token is None else symbols[token] if type(token) is str else token
+        owner_reads = self.owner_reads
+        for position, tokens in entry.owner_reads:
+            owner_reads[nodes[position]] = [symbols[token] if type(token) is str else token for token in tokens]
+        if entry.unresolved_owners:
+            self.unresolved_owners.update(nodes[position] for position in entry.unresolved_owners)
+        if entry.unresolved_names:
+            self.unresolved_names.update(entry.unresolved_names)
+
+    def _error(self, message, node=None):
+        if self._capture is not None:
+            self._capture.append((message, node))
+        super()._error(message, node)
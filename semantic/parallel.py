@@ -0,0 +1,186 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from semantic.defuse import DefUseIndex
+from semantic.semantic import SemanticAnalyzer, SymbolTable
+
+
+class _VisibleGlobals:
+    # Vista de solo lectura de los simbolos globales definidos antes de una posicion:
+    # lo mismo que resolveria el recorrido secuencial al llegar a esa funcion
+    __slots__ = ("symbols", "order", "limit")
+
+    def __init__(self, symbols, order, limit):
+        self.symbols = symbols
+        self.order = order
+        self.limit = limit
+
+    def __contains__(self, name):
+        return self.order.get(name, self.limit) < self.limit
+
+    def __getitem__(self, name):
+        if self.order.get(name, self.limit) >= self.limit:
+            raise KeyError(name)
+        return self.symbols[name]
+
+
+class _FunctionJob:
+    __slots__ = ("node", "scope", "limit", "marks", "body")
+
+    def __init__(self, node, scope, limit, marks):
+        self.node = node
+        self.scope = scope
+        self.limit = limit
+        self.marks = marks
+        self.body = None
+
+
+class _FunctionBodyAnalyzer(SemanticAnalyzer):
+    # Analiza el cuerpo de una funcion de nivel superior sin escribir estado compartido:
+    # los usos de simbolos se cuentan aparte y se suman al fusionar en el hilo principal
+
+    def __init__(self, parent, job):
+        super().__init__()
+        self.checkpoint = parent.checkpoint
+        self.interner = parent.interner
+        self.job = job
+        self.uses = Counter()
+        self._all_scopes = []
+        self._owners = [job.node]
+        self.owner_reads = {job.node: []}
+
+    def run(self):
+        node = self.job.node
+        if len(node.hijos) > 1:
+            self._visit_block(node.hijos[1], self.job.scope, create_new_scope=False)
+        return self
+
+    def _count_use(self, symbol):
+        self.uses[symbol] += 1
+
+
+class ParallelSemanticAnalyzer(SemanticAnalyzer):
+    """Analizador semantico que procesa en paralelo los cuerpos de las funciones.
+
+    Primero recorre las sentencias de nivel superior en orden, definiendo globales y
+    cabeceras de funcion; despues analiza cada cuerpo de funcion de nivel superior en
+    un pool de hilos, viendo solo los globales declarados antes de la funcion. Al
+    fusionar, diagnosticos, ambitos, indice y usos se intercalan en el orden del
+    fuente, de modo que el resultado es identico al de SemanticAnalyzer.
+
+    `executor` debe ser de hilos: los resultados se fusionan por identidad de nodos y
+    simbolos. Sin executor se crea uno de `workers` hilos por ejecucion; con
+    workers=1 los cuerpos se analizan en el hilo actual.
+
+    Es una via experimental e interna: con el GIL los hilos no ejecutan el analisis en
+    paralelo y el reparto y la fusion lo hacen mas lento que SemanticAnalyzer (ver
+    benchmarks/parallel.py), por eso Compilador no lo usa.
+    """
+
+    def __init__(self, workers=None, executor=None, hash_consing=False):
+        self.workers = workers
+        self.executor = executor
+        super().__init__(hash_consing)
+
+    def _visit_Program(self, node, scope):
+        jobs = []
+        for child in node.hijos:
+            self._checkpoint()
+            if child.tipo == "FunctionDeclaration" and child.hijos:
+                func_scope = self._declare_function(child, scope)
+                self._owners.pop()
+                jobs.append(_FunctionJob(child, func_scope, len(scope.symbols), self._marks()))
+            else:
+                self._visit(child, scope)
+        if jobs:
+            self._analyze_bodies(jobs, scope)
+            self._merge(jobs)
+
+    def _marks(self):
+        # Posiciones donde el recorrido secuencial habria insertado lo producido por el cuerpo
+        return (
+            len(self.errors),
+            len(self._all_scopes),
+            len(self.index._pending_definitions),
+            len(self.index._pending_references),
+            len(self.declared_symbols),
+            len(self.owner_reads),
+        )
+
+    def _analyze_bodies(self, jobs, scope):
+        order = {name: position for position, name in enumerate(scope.symbols)}
+        for job in jobs:
+            visible = SymbolTable(scope.scope_name)
+            visible.symbols = _VisibleGlobals(scope.symbols, order, job.limit)
+            job.scope.parent = visible
+        try:
+            bodies = [_FunctionBodyAnalyzer(self, job) for job in jobs]
+            if self.executor is not None:
+                results = list(self.executor.map(_FunctionBodyAnalyzer.run, bodies))
+            elif self.workers == 1 or len(bodies) < 2:
+                results = [body.run() for body in bodies]
+            else:
+                with ThreadPoolExecutor(self.workers) as executor:
+                    results = list(executor.map(_FunctionBodyAnalyzer.run, bodies))
+        finally:
+            for job in jobs:
+                job.scope.parent = scope
+        for job, body in zip(jobs, results):
+            job.body = body
+
+    def _merge(self, jobs):
+        bodies = [job.body for job in jobs]
+        for job, body in zip(jobs, bodies):
+            for symbol, count in body.uses.items():
+                symbol.uses += count
+            self.owner_reads[job.node].extend(body.owner_reads.pop(job.node))
+            self.unresolved_owners.update(body.unresolved_owners)
+            self.unresolved_names.update(body.unresolved_names)
+            self.statements += body.statements
+        marks = [job.marks for job in jobs]
+        self.errors[:] = _splice(self.errors, [(m[0], body.errors) for m, body in zip(marks, bodies)])
+        self._all_scopes[:] = _splice(self._all_scopes, [(m[1], body._all_scopes) for m, body in zip(marks, bodies)])
+        definitions = _splice(
+            self.index._pending_definitions, [(m[2], body.index._pending_definitions) for m, body in zip(marks, bodies)]
+        )
+        references = _splice(
+            self.index._pending_references, [(m[3], body.index._pending_references) for m, body in zip(marks, bodies)]
+        )
+        self.declared_symbols = _splice_mapping(
+            self.declared_symbols, [(m[4], body.declared_symbols) for m, body in zip(marks, bodies)]
+        )
+        self.owner_reads = _splice_mapping(self.owner_reads, [(m[5], body.owner_reads) for m, body in zip(marks, bodies)])
+        # El indice se reconstruye con los ambitos ya ordenados para que los ids coincidan
+        self.index = DefUseIndex()
+        for table in self._all_scopes:
+            self.index.add_scope(table)
+        self.index._pending_definitions = definitions
+        self.index._pending_references = references
+
+
+def _splice(items, inserts):
+    # Intercala cada lista de `inserts` en su posicion del original (posiciones crecientes)
+    result = []
+    start = 0
+    for position, extra in inserts:
+        result.extend(items[start:position])
+        result.extend(extra)
+        start = position
+    result.extend(items[start:])
+    return result
+
+
+def _splice_mapping(mapping, inserts):
+    # Igual que _splice para diccionarios con claves disjuntas, conservando el orden de insercion
+    result = {}
+    inserts = iter(inserts)
+    position, extra = next(inserts, (None, None))
+    for index, key in enumerate(mapping):
+        while position == index:
+            result.update(extra)
+            position, extra = next(inserts, (None, None))
+        result[key] = mapping[key]
+    while position is not None:
+        result.update(extra)
+        position, extra = next(inserts, (None, None))
+    return result
@@ -1,4 +1,7 @@
 
+from semantic.defuse import DefUseIndex
+
+
 class Symbol:
     def __init__(self, name, kind, data_type="unknown", mutable=True, node=None, scope=None, members=None):
         self.name = name
@@ -8,6 +11,7 @@ class Symbol:
         self.node = node
         self.scope = scope
         self.members = members or {}
+        self.uses = 0
 
     @property
     def scope_name(self):
@@ -44,41 +48,86 @@ class SymbolTable:
         return child
 
 
+BUILTIN_MEMBERS = {
+    "console": {
+        "log": "function",
+        "warn": "function",
+        "error": "function",
+    }
+}
+
+BUILTIN_SYMBOLS = (
+    Symbol(
+        name="console",
+        kind="builtin",
+        data_type="object",
+        mutable=False,
+        members=BUILTIN_MEMBERS["console"],
+    ),
+)
+
+
 class SemanticAnalyzer:
     NUMERIC_OPS = {"-", "*", "/", "%"}
-
-    def __init__(self):
+    SYMBOL_HEADERS = ["Nombre", "Tipo", "Rol/Categoria", "Ambito", "Otros Atributos"]
+
+    # Expresiones cuyo tipo se comparte entre subarboles identicos del mismo ambito
+    SHARED_KINDS = {"BinaryExpression", "UnaryExpression"}
+
+    def __init__(self, hash_consing=False):
+        self.hash_consing = hash_consing
+        # Punto de control cooperativo opcional: checkpoint(fase, procesados, parcial)
+        self.checkpoint = None
+        # Simbolos definidos en otros archivos (compilacion separada), kind "import"
+        self.externals = []
+        # Los builtins se construyen una vez por proceso; _register_builtins los copia
+        self._builtins = BUILTIN_SYMBOLS
+        self.reset()
+
+    def reset(self):
+        # Descarta todo el estado de la ultima ejecucion; la configuracion (hash_consing,
+        # checkpoint, externals) se conserva
+        self._reset_run()
+
+    def _reset_run(self):
+        # Estado de una ejecucion de analyze; las subclases con cache entre ejecuciones
+        # la limpian en reset()
         self.errors = []
+        self.interner = None
+        self._shared_types = {}
+        self._use_log = []
+        self._shared_depth = 0
+        # Uso de simbolos por declaracion, para el eliminador de codigo muerto
+        self._owners = []
+        self.declared_symbols = {}
+        self.owner_reads = {}
+        self.unresolved_owners = set()
+        self.unresolved_names = set()
+        self.statements = 0
         self.global_scope = SymbolTable("global")
-        self._all_scopes = [self.global_scope]
-        self._builtin_members = {
-            "console": {
-                "log": "function",
-                "warn": "function",
-                "error": "function",
-            }
-        }
-        self._builtins = [
-            Symbol(
-                name="console",
-                kind="builtin",
-                data_type="object",
-                mutable=False,
-                members=self._builtin_members["console"],
-            ),
-        ]
+        self._all_scopes = []
+        # Indice definicion-uso llenado durante el recorrido (ver semantic.defuse)
+        self.index = DefUseIndex()
+        self._add_scope(self.global_scope)
 
     def analyze(self, ast_root):
-        self.errors = []
-        self.global_scope = SymbolTable("global")
-        self._all_scopes = [self.global_scope]
+        self._reset_run()
         self._register_builtins()
         if ast_root is None:
             self._error("No se proporciono un AST para analizar")
             return self.errors
+        if self.hash_consing:
+            from parser.hashcons import ExpressionInterner
+
+            self.interner = ExpressionInterner()
+            self.interner.intern_tree(ast_root)
         self._visit(ast_root, self.global_scope)
         return self.errors
 
+    def _add_scope(self, scope):
+        self._all_scopes.append(scope)
+        self.index.add_scope(scope)
+
     def get_scopes(self):
         return self._all_scopes
 
@@ -89,9 +138,17 @@ class SemanticAnalyzer:
                 rows.append(self._symbol_to_row(symbol))
         return rows
 
+    def get_symbol_columns(self):
+        columns = {header: [] for header in self.SYMBOL_HEADERS}
+        for scope in self._all_scopes:
+            for symbol in scope.symbols.values():
+                for header, value in zip(self.SYMBOL_HEADERS, self._symbol_to_values(symbol)):
+                    columns[header].append(value)
+        return columns
+
     def format_symbol_table(self):
         rows = self.get_symbol_rows()
-        headers = ["Nombre", "Tipo", "Rol/Categoria", "Ambito", "Otros Atributos"]
+        headers = self.SYMBOL_HEADERS
         if not rows:
             return "Tabla de simbolos vacia."
         widths = {header: len(header) for header in headers}
@@ -111,8 +168,70 @@ class SemanticAnalyzer:
         if node is None:
             return None
         method = getattr(self, f"_visit_{node.tipo}", self._visit_generic)
+        if self.interner is not None and node.tipo in self.SHARED_KINDS:
+            return self._visit_shared(node, scope, method)
         return method(node, scope)
 
+    def _visit_shared(self, node, scope, method):
+        # Reutiliza el tipo de un subarbol identico ya analizado en el mismo ambito cuyos
+        # identificadores resuelven a los mismos simbolos (un local declarado despues
+        # puede ocultar a un global). Solo se guardan resultados sin errores: asi cada
+        # aparicion erronea sigue reportando su propio diagnostico con su posicion.
+        hc = self.interner.id_of(node)
+        if hc is None or not self.interner.pure[hc]:
+            return method(node, scope)
+        identifiers = list(self._identifiers(node))
+        key = (scope, hc, tuple(scope.resolve(identifier.valor) for identifier in identifiers))
+        shared = self._shared_types.get(key)
+        if shared is not None:
+            result, reads = shared
+            for symbol in reads:
+                self._record_use(symbol)
+            # Las expresiones puras se visitan en preorden y cada identificador aporta
+            # exactamente una lectura: el i-esimo identificador corresponde a reads[i]
+            for symbol, identifier in zip(reads, identifiers):
+                self._record_reference(symbol, identifier)
+            return result
+        errors_before = len(self.errors)
+        self._shared_depth += 1
+        mark = len(self._use_log)
+        try:
+            result = method(node, scope)
+        finally:
+            self._shared_depth -= 1
+        if len(self.errors) == errors_before:
+            self._shared_types[key] = (result, tuple(self._use_log[mark:]))
+        if not self._shared_depth:
+            self._use_log.clear()
+        return result
+
+    @staticmethod
+    def _identifiers(node):
+        pending = [node]
+        while pending:
+            current = pending.pop()
+            if current.tipo == "Identifier":
+                yield current
+            pending.extend(reversed(current.hijos))
+
+    def _record_use(self, symbol):
+        self._count_use(symbol)
+        for owner in self._owners:
+            self.owner_reads[owner].append(symbol)
+        if self._shared_depth:
+            self._use_log.append(symbol)
+
+    def _count_use(self, symbol):
+        symbol.uses += 1
+
+    def _record_reference(self, symbol, node):
+        self.index.add_reference(symbol, node)
+
+    def _enter_owner(self, node, symbol):
+        self.declared_symbols[node] = symbol
+        self.owner_reads.setdefault(node, [])
+        self._owners.append(node)
+
     def _visit_generic(self, node, scope):
         last_type = None
         for child in node.hijos:
@@ -121,21 +240,33 @@ class SemanticAnalyzer:
 
     def _visit_Program(self, node, scope):
         for child in node.hijos:
+            self._checkpoint()
             self._visit(child, scope)
 
     def _visit_FunctionDeclaration(self, node, scope):
         if not node.hijos:
             return None
-        name_node = node.hijos[0]
+        func_scope = self._declare_function(node, scope)
         block_node = node.hijos[1] if len(node.hijos) > 1 else None
-        name = name_node.valor
+        try:
+            if block_node:
+                self._visit_block(block_node, func_scope, create_new_scope=False)
+        finally:
+            self._owners.pop()
+
+    def _declare_function(self, node, scope):
+        # Define el simbolo y el ambito de la funcion y la deja como dueña de las lecturas
+        # de su cuerpo; quien llama debe sacarla de self._owners
+        name = node.hijos[0].valor
         symbol = Symbol(name=name, kind="function", data_type="function", mutable=False, node=node)
-        if not scope.define(symbol):
+        if scope.define(symbol):
+            self.index.add_definition(symbol)
+        else:
             self._error(f"La funcion '{name}' ya fue declarada en el ambito '{scope.scope_name}'", node)
         func_scope = scope.create_child(f"func:{name}")
-        self._all_scopes.append(func_scope)
-        if block_node:
-            self._visit_block(block_node, func_scope, create_new_scope=False)
+        self._add_scope(func_scope)
+        self._enter_owner(node, scope.symbols[name])
+        return func_scope
 
     def _visit_Block(self, node, scope):
         self._visit_block(node, scope, create_new_scope=True)
@@ -143,8 +274,9 @@ class SemanticAnalyzer:
     def _visit_block(self, node, scope, create_new_scope=True):
         current_scope = scope.create_child("block") if create_new_scope else scope
         if create_new_scope:
-            self._all_scopes.append(current_scope)
+            self._add_scope(current_scope)
         for stmt in node.hijos:
+            self._checkpoint()
             self._visit(stmt, current_scope)
 
     def _visit_VariableDeclaration(self, node, scope):
@@ -157,11 +289,20 @@ class SemanticAnalyzer:
         keyword = node.valor or "var"
         init_node = node.hijos[1] if len(node.hijos) > 1 else None
         init_type = None
-        if init_node and init_node.hijos:
-            init_type = self._visit(init_node.hijos[0], scope)
+        # El dueño se registra antes del inicializador para atribuirle sus lecturas
+        self._enter_owner(node, None)
+        try:
+            if init_node and init_node.hijos:
+                init_type = self._visit(init_node.hijos[0], scope)
+        finally:
+            self._owners.pop()
         mutable = keyword != "const"
         symbol = Symbol(name=var_name, kind="variable", data_type=init_type or "unknown", mutable=mutable, node=node)
-        if not scope.define(symbol):
+        defined = scope.define(symbol)
+        self.declared_symbols[node] = scope.symbols[var_name]
+        if defined:
+            self.index.add_definition(symbol)
+        else:
             prev = scope.symbols[var_name]
             if prev.data_type != symbol.data_type and prev.data_type != "unknown":
                 self._error(
@@ -224,8 +365,12 @@ class SemanticAnalyzer:
     def _visit_Identifier(self, node, scope):
         symbol = scope.resolve(node.valor)
         if symbol is None:
+            self.unresolved_owners.update(self._owners)
+            self.unresolved_names.add(node.valor)
             self._error(f"El identificador '{node.valor}' no ha sido declarado", node)
             return "error"
+        self._record_use(symbol)
+        self._record_reference(symbol, node)
         return symbol.data_type
 
     def _visit_CallExpression(self, node, scope):
@@ -266,27 +411,38 @@ class SemanticAnalyzer:
         return "unknown"
 
     def _symbol_to_row(self, symbol):
+        return dict(zip(self.SYMBOL_HEADERS, self._symbol_to_values(symbol)))
+
+    def _symbol_to_values(self, symbol):
         kind_display = {
             "variable": "Variable",
             "function": "Funcion",
             "parameter": "Parametro",
             "builtin": "Builtin",
+            "import": "Importado",
         }.get(symbol.kind, symbol.kind.capitalize())
         others = []
         if symbol.kind == "variable":
             others.append("Mutable" if symbol.mutable else "Constante")
         if symbol.kind == "function":
             others.append("Params: 0")
+        if symbol.kind in {"variable", "function"}:
+            others.append(f"Usos: {symbol.uses}")
         if symbol.kind == "builtin" and symbol.members:
             members = ", ".join(sorted(symbol.members.keys()))
             others.append(f"Miembros: {members}")
-        return {
-            "Nombre": symbol.name,
-            "Tipo": symbol.data_type,
-            "Rol/Categoria": kind_display,
-            "Ambito": symbol.scope_name,
-            "Otros Atributos": ", ".join(others) if others else "-",
-        }
+        return (
+            symbol.name,
+            symbol.data_type,
+            kind_display,
+            symbol.scope_name,
+            ", ".join(others) if others else "-",
+        )
+
+    def _checkpoint(self):
+        if self.checkpoint is not None:
+            self.checkpoint("semantic", self.statements, self.errors)
+        self.statements += 1
 
     def _error(self, message, node=None):
         if node and getattr(node, "linea", None) is not None:
@@ -346,3 +502,8 @@ class SemanticAnalyzer:
                 members=dict(symbol.members),
             )
             self.global_scope.define(builtin)
+            self.index.add_definition(builtin)
+        for symbol in self.externals:
+            external = Symbol(name=symbol.name, kind="import", data_type=symbol.data_type, mutable=symbol.mutable)
+            if self.global_scope.define(external):
+                self.index.add_definition(external)
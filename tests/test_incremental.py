@@ -0,0 +1,101 @@
+import unittest
+
+from lexer.lexer import Lexer
+from parser.parser import Parser
+from semantic.incremental import IncrementalSemanticAnalyzer
+from semantic.semantic import SemanticAnalyzer
+
+PROGRAM = """var base = 10;
+var texto = "total: " + base;
+function mostrar() {
+    var doble = base * 2;
+    console.log(texto, doble, doble);
+}
+function vacia() {
+    var sinUso = 1;
+}
+var suma = base + 1;
+mostrar();
+console.log(suma, faltante);
+"""
+
+
+def parse(source):
+    return Parser(Lexer(source).analizar()).parsear()
+
+
+def state(analyzer):
+    return analyzer.errors, analyzer.get_symbol_rows(), [scope.scope_name for scope in analyzer.get_scopes()]
+
+
+def full_analysis(source):
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(parse(source))
+    return state(analyzer)
+
+
+class IncrementalReplayTest(unittest.TestCase):
+    def test_repeated_analysis_matches_full_analysis(self):
+        analyzer = IncrementalSemanticAnalyzer(min_tokens=0)
+        expected = full_analysis(PROGRAM)
+        for _ in range(3):
+            analyzer.analyze(parse(PROGRAM))
+            self.assertEqual(state(analyzer), expected)
+        self.assertEqual(analyzer.reanalyzed, 0)
+
+    def test_edits_match_full_analysis(self):
+        analyzer = IncrementalSemanticAnalyzer(min_tokens=0)
+        analyzer.analyze(parse(PROGRAM))
+        edits = [
+            PROGRAM.replace("var base = 10;", 'var base = "diez";'),
+            "\n" + PROGRAM,
+            PROGRAM.replace("doble, doble", "doble"),
+            PROGRAM.replace("var suma = base + 1;\n", ""),
+            PROGRAM,
+        ]
+        for source in edits:
+            analyzer.analyze(parse(source))
+            self.assertEqual(state(analyzer), full_analysis(source))
+
+
+class IncrementalCostTest(unittest.TestCase):
+    def program(self, declarations):
+        lines = ["var v0 = 1;"]
+        lines.extend(f"var v{i} = v{i - 1} + {i};" for i in range(1, declarations))
+        return lines
+
+    def test_reanalyzed_statements_do_not_grow_with_file_size(self):
+        for declarations in (50, 500):
+            lines = self.program(declarations)
+            analyzer = IncrementalSemanticAnalyzer(min_tokens=0)
+            analyzer.analyze(parse("\n".join(lines)))
+            self.assertEqual(analyzer.reanalyzed, declarations)
+            # Un literal distinto en la ultima sentencia: solo ella se vuelve a analizar
+            lines[-1] = lines[-1].replace(";", " * 2;")
+            analyzer.analyze(parse("\n".join(lines)))
+            self.assertEqual(analyzer.reanalyzed, 1)
+            self.assertEqual(analyzer.reused, declarations - 1)
+
+    def test_definition_change_reanalyzes_only_dependents(self):
+        lines = [f"var v{i} = {i};" for i in range(200)]
+        lines.append("console.log(v100, v150);")
+        analyzer = IncrementalSemanticAnalyzer(min_tokens=0)
+        analyzer.analyze(parse("\n".join(lines)))
+        # v100 pasa a ser string: cambian su sentencia y la unica que la lee
+        lines[100] = 'var v100 = "cien";'
+        analyzer.analyze(parse("\n".join(lines)))
+        self.assertEqual(analyzer.reanalyzed, 2)
+        self.assertEqual(state(analyzer), full_analysis("\n".join(lines)))
+
+    def test_short_statements_are_analyzed_without_replay(self):
+        analyzer = IncrementalSemanticAnalyzer()
+        analyzer.analyze(parse(PROGRAM))
+        source = "\n" + PROGRAM
+        analyzer.analyze(parse(source))
+        # Solo el cuerpo de mostrar() llega a min_tokens; el resto se analiza de nuevo
+        self.assertEqual(analyzer.reused, 1)
+        self.assertEqual(state(analyzer), full_analysis(source))
+
+
+if __name__ == "__main__":
+    unittest.main()
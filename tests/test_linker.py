@@ -0,0 +1,28 @@
+import io
+import unittest
+
+from codegen import StackVM
+from pipeline.linker import Linker, compile_object
+
+
+def link_and_run(*sources):
+    objects = [compile_object(source, f"{i}.js") for i, source in enumerate(sources)]
+    program = Linker().link(objects)
+    output = io.StringIO()
+    StackVM(output).run(program["instructions"], program["function_table"])
+    return output.getvalue()
+
+
+class LinkerTest(unittest.TestCase):
+    def test_cross_file_call_reaches_top_level_function(self):
+        a = 'function f(){console.log("top f")} function g(){ function f(){console.log("nested f")} f(); }'
+        self.assertEqual(link_and_run(a, "f();"), "top f\n")
+        self.assertEqual(link_and_run(a, "g();"), "nested f\n")
+
+    def test_top_level_function_declared_after_nested_namesake(self):
+        a = 'function g(){ function f(){console.log("nested f")} f(); } function f(){console.log("top f")}'
+        self.assertEqual(link_and_run("f(); g();", a), "top f\nnested f\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
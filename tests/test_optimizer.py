@@ -0,0 +1,41 @@
+import io
+import unittest
+
+from codegen import BytecodeGenerator, StackVM
+from codegen.optimizer import DeadCodeEliminator
+from lexer.lexer import Lexer
+from parser.parser import Parser
+from semantic.semantic import SemanticAnalyzer
+
+
+def prune(source):
+    arbol = Parser(Lexer(source).analizar()).parsear()
+    semantic = SemanticAnalyzer()
+    semantic.analyze(arbol)
+    eliminator = DeadCodeEliminator(semantic)
+    return eliminator.prune(arbol), eliminator.removed
+
+
+def run(arbol):
+    generator = BytecodeGenerator()
+    instructions = generator.generate(arbol, binary=False)
+    output = io.StringIO()
+    StackVM(output).run(instructions, generator.function_table)
+    return output.getvalue()
+
+
+class DeadCodeEliminatorTest(unittest.TestCase):
+    def test_read_inside_nested_dead_owners_is_discounted_once(self):
+        # La lectura de `a` pertenece a `t` y a `f`, ambas muertas: `a` sigue en uso
+        pruned, removed = prune("var a = 1; function f(){ var t = a; } console.log(a);")
+        self.assertEqual(removed, [("funcion", "f", 1)])
+        self.assertEqual(run(pruned), "1\n")
+
+    def test_dead_chains_are_removed_in_one_pass(self):
+        pruned, removed = prune("var a = 1; var b = a; function f(){ var t = b; var u = t; } console.log(2);")
+        self.assertEqual([name for _, name, _ in removed], ["a", "b", "f"])
+        self.assertEqual(run(pruned), "2\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
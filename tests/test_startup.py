@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from benchmarks import startup
+from lexer.lexer import PATRONES, Lexer
+from semantic.semantic import BUILTIN_SYMBOLS, SemanticAnalyzer
+
+# Presupuesto de arranque en frio (ver benchmarks/startup.py). STARTUP_BUDGET_SCALE
+# lo relaja en maquinas lentas sin tocar la prueba
+SCALE = float(os.environ.get("STARTUP_BUDGET_SCALE", "1"))
+IMPORT_MS = 60.0 * SCALE
+COMPILE_MS = 50.0 * SCALE
+
+
+class SharedTablesTest(unittest.TestCase):
+    def test_lexer_instances_share_compiled_patterns(self):
+        self.assertIs(Lexer("var a = 1;").patrones, PATRONES)
+        self.assertIs(Lexer("").patrones, Lexer("x").patrones)
+
+    def test_analyzers_share_builtin_table(self):
+        first, second = SemanticAnalyzer(), SemanticAnalyzer()
+        self.assertIs(first._builtins, BUILTIN_SYMBOLS)
+        self.assertIs(second._builtins, BUILTIN_SYMBOLS)
+        # Cada analisis registra copias: los usos no se acumulan en la tabla compartida
+        first.analyze(None)
+        self.assertIsNot(first.global_scope.resolve("console"), BUILTIN_SYMBOLS[0])
+
+
+class ColdStartTest(unittest.TestCase):
+    def test_cli_import_and_first_compile_within_budget(self):
+        result = startup.measure(os.path.join("samples", "ejemplo.js"), runs=5)
+        self.assertEqual(result["loaded"], [])
+        self.assertLessEqual(result["import_ms"], IMPORT_MS)
+        self.assertLessEqual(result["compile_ms"], COMPILE_MS)
+
+    def test_ui_module_defers_optional_dependencies(self):
+        probe = "import sys, UI_Compile; print(sorted(m for m in ('streamlit', 'pandas') if m in sys.modules))"
+        output = subprocess.run(
+            [sys.executable, "-c", probe], cwd=startup.ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()